@@ -16,6 +16,41 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL_NAME: str = Field("sentence-transformers/all-mpnet-base-v2", description="768차원 임베딩 모델 이름")
     EMBEDDING_DIMENSION: int = Field(768, description="벡터 차원 (768D)")
     EMBEDDING_DEVICE: str = Field(os.getenv("EMBEDDING_DEVICE", "cpu"), description="임베딩 모델 실행 장치 (cpu/cuda)")
+
+    # CLIP 이미지 인코딩 마이크로 배칭 (동시 요청을 모아 한 번의 forward pass로 처리)
+    CLIP_BATCH_WINDOW_MS: float = Field(float(os.getenv("CLIP_BATCH_WINDOW_MS", 10)), description="배치 수집 대기 시간(ms), 0이면 배칭 비활성화")
+    CLIP_BATCH_MAX_SIZE: int = Field(int(os.getenv("CLIP_BATCH_MAX_SIZE", 32)), description="한 번에 인코딩할 최대 이미지 수")
+    CLIP_BATCH_RESULT_TIMEOUT: float = Field(float(os.getenv("CLIP_BATCH_RESULT_TIMEOUT", 30)), description="배치 인코딩 결과 대기 최대 시간(초)")
+
+    # YOLO 추론 / 감지 결과 캐시 (이미지 해시 기준, in-process LRU + Redis)
+    YOLO_MODEL_NAME: str = Field(os.getenv("YOLO_MODEL_NAME", "yolov8n.pt"), description="사람 감지 YOLO 가중치 (감지 캐시 키에 포함)")
+    YOLO_POSE_MODEL_NAME: str = Field(os.getenv("YOLO_POSE_MODEL_NAME", "yolov8n-pose.pt"), description="포즈 추정 YOLO 가중치 (감지 캐시 키에 포함)")
+    YOLO_IMGSZ: int = Field(int(os.getenv("YOLO_IMGSZ", 640)), description="YOLO 입력 letterbox 크기")
+    YOLO_BATCH_SIZE: int = Field(int(os.getenv("YOLO_BATCH_SIZE", 16)), description="YOLO 배치 추론 최대 이미지 수")
+    YOLO_DETECTION_CACHE_SIZE: int = Field(int(os.getenv("YOLO_DETECTION_CACHE_SIZE", 1024)), description="프로세스 내부 감지 결과 캐시 최대 항목 수 (0이면 비활성화)")
+    YOLO_DETECTION_CACHE_TTL: int = Field(int(os.getenv("YOLO_DETECTION_CACHE_TTL", 30 * 24 * 3600)), description="Redis 감지 결과 캐시 TTL (초)")
+    YOLO_DETECTION_CACHE_REDIS_ENABLED: bool = Field(os.getenv("YOLO_DETECTION_CACHE_REDIS_ENABLED", "true").lower() == "true", description="감지 결과 Redis 2차 캐시 사용 여부")
+
+    # 블로킹 작업 실행 풀 (이벤트 루프 보호)
+    INFERENCE_POOL_SIZE: int = Field(int(os.getenv("INFERENCE_POOL_SIZE", 4)), description="CPU 추론(BERT/CLIP/YOLO) 동시 실행 수")
+    LLM_POOL_SIZE: int = Field(int(os.getenv("LLM_POOL_SIZE", 8)), description="Watsonx LLM 호출 동시 실행 수")
+
+    # 텍스트 배치 임베딩
+    TEXT_EMBED_BATCH_SIZE: int = Field(int(os.getenv("TEXT_EMBED_BATCH_SIZE", 64)), description="BERT/CLIP-text 인코딩 미니배치 크기")
+    EMBED_BATCH_MAX_TEXTS: int = Field(int(os.getenv("EMBED_BATCH_MAX_TEXTS", 1024)), description="/embed-text-batch 요청당 최대 텍스트 수")
+
+    # 임베딩 캐시 (in-process LRU + Redis)
+    EMBEDDING_CACHE_ENABLED: bool = Field(os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true", description="임베딩 캐시 사용 여부")
+    EMBEDDING_CACHE_REDIS_ENABLED: bool = Field(os.getenv("EMBEDDING_CACHE_REDIS_ENABLED", "true").lower() == "true", description="Redis 2차 캐시 사용 여부")
+    EMBEDDING_CACHE_VERSION: str = Field(os.getenv("EMBEDDING_CACHE_VERSION", "v1"), description="캐시 키 버전 (모델 교체 시 변경하여 무효화)")
+    EMBEDDING_CACHE_MAX_BYTES: int = Field(int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", 64 * 1024 * 1024)), description="프로세스 내부 LRU 최대 크기 (bytes)")
+    EMBEDDING_CACHE_TTL: int = Field(int(os.getenv("EMBEDDING_CACHE_TTL", 7 * 24 * 3600)), description="Redis 캐시 TTL (초)")
+    
+    # 추론 백엔드 (torch | onnx | onnx-int8)
+    INFERENCE_BACKEND: str = Field(os.getenv("INFERENCE_BACKEND", "torch"), description="임베딩 추론 백엔드 (torch/onnx/onnx-int8)")
+    ONNX_MODEL_DIR: str = Field(os.getenv("ONNX_MODEL_DIR", "/app/models_cache/onnx"), description="ONNX 변환 모델 저장 경로")
+    ONNX_PARITY_THRESHOLD: float = Field(float(os.getenv("ONNX_PARITY_THRESHOLD", 0.99)), description="torch 대비 최소 코사인 유사도 (미달 시 torch 사용)")
+    ONNX_INTRA_OP_THREADS: int = Field(int(os.getenv("ONNX_INTRA_OP_THREADS", 0)), description="onnxruntime 연산 스레드 수 (0이면 기본값)")
     
     # LLM Settings (Groq, WatsonX 등 LLM 연동 설정)
     GROQ_API_KEY: str = Field(os.getenv("GROQ_API_KEY", ""), description="Groq API 키 (LLM 추론용)")
@@ -25,6 +60,18 @@ class Settings(BaseSettings):
     GOOGLE_API_KEY: str = Field(os.getenv("GOOGLE_API_KEY", ""), description="Google Custom Search API 키")
     GOOGLE_SEARCH_ENGINE_ID: str = Field(os.getenv("GOOGLE_SEARCH_ENGINE_ID", ""), description="Google Custom Search Engine ID (CX)")
     GOOGLE_API_DAILY_QUOTA: int = Field(int(os.getenv("GOOGLE_API_DAILY_QUOTA", 100)), description="Google Search API 일일 허용 쿼터")
+
+    # Idempotency-Key 처리 (/search-plan)
+    IDEMPOTENCY_TTL: int = Field(int(os.getenv("IDEMPOTENCY_TTL", 600)), description="완료된 요청 결과 보관 시간 (초)")
+    IDEMPOTENCY_LOCK_TTL: int = Field(int(os.getenv("IDEMPOTENCY_LOCK_TTL", 180)), description="처리 중 상태 유지 시간 (초)")
+    IDEMPOTENCY_WAIT_TIMEOUT: float = Field(float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", 120)), description="같은 키 재요청 시 이전 요청 완료 대기 시간 (초)")
+
+    # 외부 RAG 캐시 (Google 검색 결과 / VLM 요약 / 후보 이미지)
+    RAG_CACHE_TTL: int = Field(int(os.getenv("RAG_CACHE_TTL", 24 * 3600)), description="검색 결과/VLM 요약 캐시 TTL (초), 0이면 비활성화")
+    RAG_CACHE_REDIS_ENABLED: bool = Field(os.getenv("RAG_CACHE_REDIS_ENABLED", "true").lower() == "true", description="검색 결과/VLM 요약 Redis 2차 캐시 사용 여부")
+    RAG_IMAGE_STORE_DIR: str = Field(os.getenv("RAG_IMAGE_STORE_DIR", "/app/models_cache/rag_images"), description="후보 이미지 디스크 저장 경로")
+    RAG_IMAGE_STORE_MAX_BYTES: int = Field(int(os.getenv("RAG_IMAGE_STORE_MAX_BYTES", 512 * 1024 * 1024)), description="후보 이미지 저장소 최대 크기 (bytes), 0이면 비활성화")
+    RAG_IMAGE_NEGATIVE_TTL: int = Field(int(os.getenv("RAG_IMAGE_NEGATIVE_TTL", 3600)), description="디코딩 불가/부적합 후보 이미지 URL 재시도 제외 시간 (초)")
     
     # Vision API Settings (Llama Vision, YOLO/DINOv2 분석 결과 전송용)
     # Vision 모델이 별도 마이크로서비스로 분리되어 있다고 가정합니다.
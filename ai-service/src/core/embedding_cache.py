@@ -0,0 +1,95 @@
+import hashlib
+import logging
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from PIL import Image
+
+from src.core.config import settings
+from src.core.two_tier_cache import TwoTierCache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화 (유니코드 NFC + 공백 정리, 임베딩 결과가 바뀌지 않는 범위만)"""
+    text = unicodedata.normalize("NFC", text or "")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def image_digest(image: Image.Image) -> str:
+    """PIL 이미지의 픽셀 내용 기반 SHA-256"""
+    h = hashlib.sha256()
+    h.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+    h.update(image.tobytes())
+    return h.hexdigest()
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def _unpack(data: bytes) -> List[float]:
+    return np.frombuffer(data, dtype="<f4").tolist()
+
+
+class EmbeddingCache:
+    """
+    콘텐츠 주소 기반 2단계 임베딩 캐시 (L1 LRU 바이트 예산 + L2 Redis, TwoTierCache)
+    - 키: emb:{모델명}:{버전}:{sha256}, 값: packed float32 (little-endian)
+    - 모델 교체 시 EMBEDDING_CACHE_VERSION만 올리면 기존 키는 자연스럽게 무효화됨
+    """
+
+    def __init__(self):
+        self.enabled = settings.EMBEDDING_CACHE_ENABLED
+        # ONNX/int8 백엔드 벡터는 torch 결과와 미세하게 다르므로 키 공간을 분리
+        backend = settings.INFERENCE_BACKEND.lower()
+        self.version = settings.EMBEDDING_CACHE_VERSION if backend == "torch" else f"{settings.EMBEDDING_CACHE_VERSION}-{backend}"
+        self._cache = TwoTierCache(
+            "Embedding",
+            ttl=settings.EMBEDDING_CACHE_TTL,
+            enabled=self.enabled,
+            redis_enabled=settings.EMBEDDING_CACHE_REDIS_ENABLED,
+            max_bytes=settings.EMBEDDING_CACHE_MAX_BYTES,
+        )
+
+    # -----------------------------------------------------------
+    # Key 생성
+    # -----------------------------------------------------------
+    def digest_key(self, model_name: str, digest: str) -> str:
+        return f"emb:{model_name}:{self.version}:{digest}"
+
+    def text_key(self, model_name: str, text: str) -> str:
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return self.digest_key(model_name, digest)
+
+    def bytes_key(self, model_name: str, data: bytes) -> str:
+        return self.digest_key(model_name, hashlib.sha256(data).hexdigest())
+
+    def image_key(self, model_name: str, image: Image.Image) -> str:
+        return self.digest_key(model_name, image_digest(image))
+
+    # -----------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------
+    def get_many(self, keys: List[str]) -> List[Optional[List[float]]]:
+        return [_unpack(data) if data is not None else None for data in self._cache.get_many(keys)]
+
+    def get(self, key: str) -> Optional[List[float]]:
+        return self.get_many([key])[0]
+
+    def set_many(self, items: Dict[str, Sequence[float]]):
+        if not self.enabled or not items:
+            return
+        self._cache.set_many({key: _pack(vec) for key, vec in items.items()})
+
+    def set(self, key: str, vector: Sequence[float]):
+        self.set_many({key: vector})
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+
+embedding_cache = EmbeddingCache()
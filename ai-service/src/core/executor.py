@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedExecutor:
+    """
+    이벤트 루프 밖에서 블로킹 작업(torch 추론, Watsonx 호출)을 실행하는 전용 풀
+    - max_workers: 동시에 실행되는 작업 수 상한 (풀 크기)
+    - 대기 중인 작업 수(queued)와 실행 중인 작업 수(active)를 메트릭으로 노출
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._peak_queued = 0
+
+    def _call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            result = fn(*args, **kwargs)
+            with self._lock: self._completed += 1
+            return result
+        except Exception:
+            with self._lock: self._failed += 1
+            raise
+        finally:
+            with self._lock: self._active -= 1
+
+    def _on_done(self, future: Future):
+        # 시작 전에 취소된 작업은 _call이 실행되지 않으므로 대기열 카운트를 여기서 보정
+        if future.cancelled():
+            with self._lock: self._queued -= 1
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """블로킹 함수를 풀에서 실행하고 결과를 await"""
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+        future = self._executor.submit(self._call, fn, *args, **kwargs)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queued": max(self._queued, 0),
+                "peak_queued": self._peak_queued,
+                "completed": self._completed,
+                "failed": self._failed,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# CPU 추론 (BERT / CLIP / YOLO) - torch 내부 스레드와 경합하지 않도록 작게 유지
+inference_pool = BoundedExecutor("inference", settings.INFERENCE_POOL_SIZE)
+
+# 원격 LLM I/O (Watsonx) - 네트워크 대기 위주이므로 넉넉하게
+llm_pool = BoundedExecutor("llm", settings.LLM_POOL_SIZE)
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {pool.name: pool.stats() for pool in (inference_pool, llm_pool)}
+
+
+def shutdown_executors():
+    for pool in (inference_pool, llm_pool):
+        pool.shutdown()
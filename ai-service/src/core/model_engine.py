@@ -1,21 +1,29 @@
 import os
 import logging
 import base64
+import hashlib
 import io
 import threading
 import json
 import re
 import random
 import ast
-from typing import List, Optional, Dict, Union
+import time
+import queue
+from concurrent.futures import Future, InvalidStateError, TimeoutError as FutureTimeoutError
+from typing import List, Optional, Dict, Union, Tuple, Callable, Any
 from PIL import Image
 
+import numpy as np
 import torch
 from sentence_transformers import SentenceTransformer, util 
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_ibm import ChatWatsonx
 from langchain_core.messages import HumanMessage
 
+from src.core.config import settings
+from src.core.embedding_cache import embedding_cache, image_digest
+from src.core import onnx_backend
 from src.core.prompts import VISION_ANALYSIS_PROMPT
 
 logger = logging.getLogger(__name__)
@@ -26,6 +34,94 @@ CLIP_MODEL_NAME = "sentence-transformers/clip-ViT-B-32-multilingual-v1"
 CLIP_VISION_MODEL_NAME = "sentence-transformers/clip-ViT-B-32"
 VISION_MODEL_ID = "meta-llama/llama-3-2-11b-vision-instruct" 
 
+class ClipImageBatcher:
+    """
+    CLIP 이미지 인코딩 마이크로 배처
+    - 동시에 들어온 요청들의 이미지를 짧은 시간(window) 동안 모아서
+      clip_vision_model.encode 한 번으로 처리합니다.
+    - 각 호출자는 Future를 통해 자신의 벡터만 돌려받습니다.
+    - 결과를 result_timeout 초 안에 받지 못하면 TimeoutError (추론 풀 스레드를 무한정 붙잡지 않도록)
+    """
+
+    def __init__(self, encode_fn: Callable[[List[Image.Image]], Any], max_batch_size: int = 32, window_ms: float = 10.0,
+                 result_timeout: float = 30.0):
+        self._encode_fn = encode_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.window = max(0.0, window_ms) / 1000.0
+        self.result_timeout = result_timeout
+        self._queue: "queue.Queue[Tuple[Image.Image, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive(): return
+        with self._start_lock:
+            if self._worker is not None and self._worker.is_alive(): return
+            self._worker = threading.Thread(target=self._run, name="clip-image-batcher", daemon=True)
+            self._worker.start()
+
+    def submit(self, image: Image.Image) -> Future:
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((image, future))
+        return future
+
+    def encode(self, images: List[Image.Image]) -> List[List[float]]:
+        """이미지 목록을 큐에 넣고, 배치 처리된 결과를 입력 순서대로 반환"""
+        futures = [self.submit(img) for img in images]
+        deadline = time.monotonic() + self.result_timeout
+        try:
+            return [f.result(timeout=max(0.0, deadline - time.monotonic())) for f in futures]
+        except FutureTimeoutError:
+            # 아직 배치에 들어가지 않은 이미지는 인코딩하지 않도록 취소
+            for f in futures: f.cancel()
+            raise
+
+    def _collect_batch(self) -> List[Tuple[Image.Image, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    # 대기 시간이 끝나도 이미 쌓여있는 요청은 함께 처리
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    @staticmethod
+    def _resolve(future: Future, result: Any = None, error: Optional[BaseException] = None):
+        # 호출자가 타임아웃으로 취소한 Future 는 건너뜀
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
+
+    def _run(self):
+        while True:
+            batch = [(img, future) for img, future in self._collect_batch() if not future.cancelled()]
+            if not batch: continue
+            images = [img for img, _ in batch]
+            try:
+                vectors = list(self._encode_fn(images))
+                if len(vectors) != len(batch):
+                    # 어느 벡터가 어느 이미지 것인지 알 수 없으므로 배치 전체를 실패 처리
+                    raise RuntimeError(f"CLIP batch returned {len(vectors)} vectors for {len(batch)} images")
+                for (_, future), vec in zip(batch, vectors):
+                    self._resolve(future, vec.tolist() if hasattr(vec, "tolist") else list(vec))
+                if len(batch) > 1:
+                    logger.debug(f"🧺 CLIP batch encoded: {len(batch)} images")
+            except Exception as e:
+                for _, future in batch:
+                    self._resolve(future, error=e)
+
+
 class ModelEngine:
     _instance: Optional['ModelEngine'] = None
     _lock = threading.Lock() 
@@ -46,6 +142,8 @@ class ModelEngine:
         self.bert_model: Optional[HuggingFaceEmbeddings] = None
         self.clip_text_model: Optional[SentenceTransformer] = None
         self.clip_vision_model: Optional[SentenceTransformer] = None
+        self.clip_batcher: Optional[ClipImageBatcher] = None
+        self.cache = embedding_cache
         
         self.project_id = os.getenv("WATSONX_PROJECT_ID")
         self.device = os.getenv("EMBEDDING_DEVICE", "cpu")
@@ -58,9 +156,10 @@ class ModelEngine:
             if self.is_initialized: return
             logger.info(f"🚀 Initializing Hybrid Model Engine on [{self.device}]...")
             self._init_watsonx()
+            onnx_encoders = self._init_onnx_encoders()
             
             try:
-                self.bert_model = HuggingFaceEmbeddings(
+                self.bert_model = onnx_encoders.get("bert") or HuggingFaceEmbeddings(
                     model_name=BERT_MODEL_NAME,
                     model_kwargs={'device': self.device},
                     encode_kwargs={'normalize_embeddings': True}
@@ -68,16 +167,43 @@ class ModelEngine:
             except Exception: pass
 
             try:
-                self.clip_text_model = SentenceTransformer(CLIP_MODEL_NAME, device=self.device)
+                self.clip_text_model = onnx_encoders.get("clip_text") or SentenceTransformer(CLIP_MODEL_NAME, device=self.device)
             except Exception: pass
 
             try:
-                self.clip_vision_model = SentenceTransformer(CLIP_VISION_MODEL_NAME, device=self.device)
+                self.clip_vision_model = onnx_encoders.get("clip_vision") or SentenceTransformer(CLIP_VISION_MODEL_NAME, device=self.device)
+                if settings.CLIP_BATCH_WINDOW_MS > 0:
+                    self.clip_batcher = ClipImageBatcher(
+                        self._encode_image_batch,
+                        max_batch_size=settings.CLIP_BATCH_MAX_SIZE,
+                        window_ms=settings.CLIP_BATCH_WINDOW_MS,
+                        result_timeout=settings.CLIP_BATCH_RESULT_TIMEOUT
+                    )
             except Exception: pass
 
             self.is_initialized = True
             logger.info("✅ All Models Initialized.")
 
+    def _init_onnx_encoders(self) -> Dict[str, Any]:
+        """
+        INFERENCE_BACKEND=onnx | onnx-int8 일 때 ONNX Runtime 인코더 로드
+        - parity 검증에 실패했거나 로드할 수 없는 모델은 비워두고 torch 모델을 사용
+        """
+        backend = settings.INFERENCE_BACKEND.lower()
+        if backend == "torch":
+            return {}
+        if backend not in ("onnx", "onnx-int8"):
+            logger.warning(f"⚠️ Unknown INFERENCE_BACKEND '{backend}'. Using torch.")
+            return {}
+
+        quantized = backend == "onnx-int8"
+        encoders = {
+            "bert": onnx_backend.load_encoder(BERT_MODEL_NAME, "text", normalize=True, quantized=quantized),
+            "clip_text": onnx_backend.load_encoder(CLIP_MODEL_NAME, "text", normalize=False, quantized=quantized),
+            "clip_vision": onnx_backend.load_encoder(CLIP_VISION_MODEL_NAME, "image", quantized=quantized),
+        }
+        return {name: encoder for name, encoder in encoders.items() if encoder is not None}
+
     def _init_watsonx(self):
         """
         [수정됨] 이전에 성공했던 '정확도 중심' 설정으로 복구
@@ -311,38 +437,161 @@ class ModelEngine:
     # -----------------------------------------------------------
     # [Essential] Embedding Functions (YOLO 포함 완전 복구)
     # -----------------------------------------------------------
+    def _encode_image_batch(self, images: List[Image.Image]):
+        return self.clip_vision_model.encode(images, batch_size=len(images), convert_to_numpy=True)
+
+    def encode_images(self, images: List[Image.Image]) -> List[List[float]]:
+        """CLIP 이미지 인코딩 (배처가 있으면 동시 요청과 묶어서 처리)"""
+        if not images: return []
+        if self.clip_batcher:
+            return self.clip_batcher.encode(images)
+        vectors = self._encode_image_batch(images)
+        return [v.tolist() if hasattr(v, "tolist") else list(v) for v in vectors]
+
     def generate_embedding(self, text: str) -> List[float]:
         if not self.bert_model: self.initialize()
-        try: return self.bert_model.embed_query(text)
+        key = self.cache.text_key(BERT_MODEL_NAME, text)
+        cached = self.cache.get(key)
+        if cached is not None: return cached
+        try:
+            vector = self.bert_model.embed_query(text)
+            self.cache.set(key, vector)
+            return vector
         except: return [0.0] * 768
 
     def generate_dual_embedding(self, text: str) -> Dict[str, List[float]]:
         if not self.bert_model or not self.clip_text_model: self.initialize()
         result = {"bert": [0.0] * 768, "clip": [0.0] * 512}
+        bert_key = self.cache.text_key(BERT_MODEL_NAME, text)
+        clip_key = self.cache.text_key(CLIP_MODEL_NAME, text)
+        cached_bert, cached_clip = self.cache.get_many([bert_key, clip_key])
         try:
-            if self.bert_model: result["bert"] = self.bert_model.embed_query(text)
-            if self.clip_text_model:
+            if cached_bert is not None:
+                result["bert"] = cached_bert
+            elif self.bert_model:
+                result["bert"] = self.bert_model.embed_query(text)
+                self.cache.set(bert_key, result["bert"])
+
+            if cached_clip is not None:
+                result["clip"] = cached_clip
+            elif self.clip_text_model:
                 clip_vec = self.clip_text_model.encode(text)
                 result["clip"] = clip_vec.tolist() if hasattr(clip_vec, "tolist") else list(clip_vec)
+                self.cache.set(clip_key, result["clip"])
         except: pass
         return result
 
+    def _encode_bucketed(self, texts: List[str], encode_fn: Callable[[List[str]], Any], batch_size: int) -> List[List[float]]:
+        """길이순으로 정렬한 뒤 미니배치로 인코딩 (패딩 최소화), 결과는 입력 순서로 복원"""
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            vectors = encode_fn([texts[i] for i in bucket])
+            for i, vec in zip(bucket, vectors):
+                results[i] = vec.tolist() if hasattr(vec, "tolist") else list(vec)
+        return results
+
+    def _encode_texts_cached(self, texts: List[str], model_name: str, encode_fn: Callable[[List[str]], Any], batch_size: int) -> List[List[float]]:
+        """캐시에 없는 텍스트만 배치 인코딩하고 결과를 캐시에 저장"""
+        keys = [self.cache.text_key(model_name, t) for t in texts]
+        vectors = self.cache.get_many(keys)
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            encoded = self._encode_bucketed([texts[i] for i in missing], encode_fn, batch_size)
+            self.cache.set_many({keys[i]: vec for i, vec in zip(missing, encoded)})
+            for i, vec in zip(missing, encoded):
+                vectors[i] = vec
+        return vectors
+
+    def generate_embeddings_batch(self, texts: List[str], include_clip: bool = True, batch_size: Optional[int] = None) -> Dict[str, Optional[List[List[float]]]]:
+        """
+        여러 텍스트를 한 번에 BERT(768) / CLIP-text(512) 벡터로 변환
+        - 대량 상품 등록(CSV) 시 HTTP 왕복을 줄이기 위한 배치 경로
+        """
+        if not self.bert_model or (include_clip and not self.clip_text_model): self.initialize()
+        batch_size = batch_size or settings.TEXT_EMBED_BATCH_SIZE
+        result: Dict[str, Optional[List[List[float]]]] = {
+            "bert": [[0.0] * 768 for _ in texts],
+            "clip": [[0.0] * 512 for _ in texts] if include_clip else None
+        }
+        if not texts: return result
+
+        try:
+            if self.bert_model:
+                result["bert"] = self._encode_texts_cached(texts, BERT_MODEL_NAME, self.bert_model.embed_documents, batch_size)
+        except Exception as e:
+            logger.error(f"BERT Batch Embedding Failed: {e}")
+
+        try:
+            if include_clip and self.clip_text_model:
+                result["clip"] = self._encode_texts_cached(
+                    texts,
+                    CLIP_MODEL_NAME,
+                    lambda chunk: self.clip_text_model.encode(chunk, batch_size=len(chunk), convert_to_numpy=True),
+                    batch_size
+                )
+        except Exception as e:
+            logger.error(f"CLIP Text Batch Embedding Failed: {e}")
+
+        return result
+
     def calculate_similarity(self, text: str, image: Image.Image) -> float:
         if not self.clip_text_model or not self.clip_vision_model: self.initialize()
         try:
             text_emb = self.clip_text_model.encode(text, convert_to_tensor=True)
-            img_emb = self.clip_vision_model.encode(image, convert_to_tensor=True)
+            img_emb = torch.tensor(self.encode_images([image])[0], device=text_emb.device)
             return util.cos_sim(text_emb, img_emb).item()
         except: return 0.0
 
+    def score_images_against_text(self, text: str, images: List[Image.Image]) -> List[float]:
+        """
+        텍스트 1개 vs 이미지 N개 CLIP 코사인 유사도 (입력 순서대로 반환)
+        - 텍스트는 1회만 인코딩 (캐시 사용), 이미지는 캐시에 없는 것만 한 배치로 인코딩
+        - 유사도는 정규화된 행렬곱 한 번으로 계산
+        """
+        if not images: return []
+        if not self.clip_text_model or not self.clip_vision_model: self.initialize()
+        try:
+            text_vec = np.asarray(self._encode_texts_cached(
+                [text], CLIP_MODEL_NAME,
+                lambda chunk: self.clip_text_model.encode(chunk, convert_to_numpy=True), 1
+            )[0], dtype=np.float32)
+
+            raw_model = f"{CLIP_VISION_MODEL_NAME}:raw"
+            keys = [self.cache.image_key(raw_model, img) for img in images]
+            image_vecs = self.cache.get_many(keys)
+            missing = [i for i, v in enumerate(image_vecs) if v is None]
+            if missing:
+                encoded = self.encode_images([images[i] for i in missing])
+                self.cache.set_many({keys[i]: vec for i, vec in zip(missing, encoded)})
+                for i, vec in zip(missing, encoded):
+                    image_vecs[i] = vec
+
+            image_matrix = np.asarray(image_vecs, dtype=np.float32)
+            image_matrix /= np.clip(np.linalg.norm(image_matrix, axis=1, keepdims=True), 1e-12, None)
+            text_vec /= max(float(np.linalg.norm(text_vec)), 1e-12)
+            return (image_matrix @ text_vec).tolist()
+        except Exception as e:
+            logger.error(f"CLIP Batch Scoring Failed: {e}")
+            return [0.0] * len(images)
+
     def generate_image_embedding(self, image_data: Union[str, Image.Image], use_yolo: bool = True) -> Dict[str, List[float]]:
         if not self.clip_vision_model: self.initialize()
         default_vector = [0.0] * 512
+        cache_model = f"{CLIP_VISION_MODEL_NAME}:{'yolo-full' if use_yolo else 'raw'}"
         try:
             pil_image = image_data
             if isinstance(image_data, str):
                 if "base64," in image_data: image_data = image_data.split("base64,")[1]
-                pil_image = Image.open(io.BytesIO(base64.b64decode(image_data)))
+                raw_bytes = base64.b64decode(image_data)
+                cache_key = self.cache.bytes_key(cache_model, raw_bytes)
+                pil_image = Image.open(io.BytesIO(raw_bytes))
+            else:
+                cache_key = self.cache.image_key(cache_model, pil_image)
+
+            cached = self.cache.get(cache_key)
+            if cached is not None: return {"clip": cached}
             
             if use_yolo:
                 try:
@@ -352,33 +601,59 @@ class ModelEngine:
                 except: pass
 
             if self.clip_vision_model:
-                vector = self.clip_vision_model.encode(pil_image)
-                return {"clip": vector.tolist() if hasattr(vector, "tolist") else list(vector)}
+                vector = self.encode_images([pil_image])[0]
+                self.cache.set(cache_key, vector)
+                return {"clip": vector}
             return {"clip": default_vector}
         except: return {"clip": default_vector}
 
-    def generate_fashion_embeddings(self, image_data: Union[str, Image.Image]) -> Dict[str, List[float]]:
+    def generate_fashion_embeddings(self, image_data: Union[str, Image.Image], fill_missing: bool = False) -> Dict[str, List[float]]:
+        """
+        전신/상의/하의 CLIP 벡터를 한 번에 생성
+        - YOLO 감지 1회 + CLIP forward 1회 (영역별 캐시에 있는 벡터는 재계산하지 않음)
+        - fill_missing: 사람이 감지되지 않아 상의/하의가 없을 때 전신 벡터로 채움
+        """
         if not self.clip_vision_model: self.initialize()
         zero_vector = [0.0] * 512
         result = {"full": zero_vector.copy(), "upper": zero_vector.copy(), "lower": zero_vector.copy()}
+        regions = list(result.keys())
         try:
             pil_image = image_data
             if isinstance(image_data, str):
                 if "base64," in image_data: image_data = image_data.split("base64,")[1]
-                pil_image = Image.open(io.BytesIO(base64.b64decode(image_data)))
-            
+                raw_bytes = base64.b64decode(image_data)
+                digest = hashlib.sha256(raw_bytes).hexdigest()
+                pil_image = Image.open(io.BytesIO(raw_bytes))
+            else:
+                digest = image_digest(pil_image)
+            cache_keys = {k: self.cache.digest_key(f"{CLIP_VISION_MODEL_NAME}:yolo-{k}", digest) for k in regions}
+
+            cached = dict(zip(regions, self.cache.get_many([cache_keys[k] for k in regions])))
+            for k, vec in cached.items():
+                if vec is not None: result[k] = vec
+            if all(vec is not None for vec in cached.values()):
+                return result
+
             try:
                 from src.core.yolo_detector import yolo_detector
                 features = yolo_detector.extract_fashion_features(pil_image)
-                for k, img_crop in features.items():
-                    if img_crop and self.clip_vision_model:
-                        vec = self.clip_vision_model.encode(img_crop)
-                        result[k] = vec.tolist() if hasattr(vec, "tolist") else list(vec)
+                # 캐시에 없는 영역의 크롭만 한 번에 배처로 전달 (단일 forward pass)
+                pending = [(k, img_crop) for k, img_crop in features.items() if img_crop and cached[k] is None]
+                if pending and self.clip_vision_model:
+                    vectors = self.encode_images([img_crop for _, img_crop in pending])
+                    for (k, _), vec in zip(pending, vectors):
+                        result[k] = vec
+                    self.cache.set_many({cache_keys[k]: result[k] for k, _ in pending})
+                if fill_missing and features.get("upper") is None:
+                    result["upper"] = list(result["full"])
+                    result["lower"] = list(result["full"])
             except Exception as e:
                 logger.error(f"Fashion Feature Extraction Failed: {e}")
                 if self.clip_vision_model:
-                    vec = self.clip_vision_model.encode(pil_image)
-                    result["full"] = vec.tolist() if hasattr(vec, "tolist") else list(vec)
+                    result["full"] = self.encode_images([pil_image])[0]
+                    if fill_missing:
+                        result["upper"] = list(result["full"])
+                        result["lower"] = list(result["full"])
 
         except Exception as e: 
             logger.error(f"Embedding Gen Error: {e}")
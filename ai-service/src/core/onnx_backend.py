@@ -0,0 +1,297 @@
+"""
+ONNX Runtime 추론 백엔드 (CPU 최적화)
+
+- BERT / CLIP-text / CLIP-vision SentenceTransformer 모델을 ONNX로 내보내고
+  onnxruntime으로 실행합니다. (선택적으로 동적 int8 양자화)
+- 내보낸 모델은 torch 결과와의 코사인 유사도(parity)를 검증한 뒤에만 사용합니다.
+- 인코더는 기존 코드가 호출하는 인터페이스(SentenceTransformer.encode,
+  HuggingFaceEmbeddings.embed_query/embed_documents)를 그대로 따릅니다.
+
+사전 변환 (선택, 미리 해두면 기동 시 torch 모델 로딩을 건너뜀):
+    python -m src.core.onnx_backend --quantize
+"""
+
+import argparse
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+from PIL import Image
+
+from src.core.config import settings
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+
+PARITY_TEXTS = [
+    "겨울 남자옷 추천",
+    "격식있는 식사자리에 입을 원피스",
+    "장원영 공항패션",
+    "black oversized leather jacket",
+    "편하게 입기 좋은 와이드 데님 팬츠와 니트 코디",
+]
+
+
+def _model_dir(model_name: str) -> str:
+    return os.path.join(settings.ONNX_MODEL_DIR, model_name.replace("/", "__"))
+
+
+def _l2_normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.clip(norms, 1e-12, None)
+
+
+def _min_cosine(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.min(np.sum(_l2_normalize(a) * _l2_normalize(b), axis=-1)))
+
+
+def _parity_images() -> List[Image.Image]:
+    rng = np.random.default_rng(0)
+    images = [Image.fromarray(rng.integers(0, 256, (256, 192, 3), dtype=np.uint8)) for _ in range(3)]
+    images.append(Image.new("RGB", (224, 224), (20, 20, 20)))
+    images.append(Image.new("RGB", (300, 400), (200, 40, 60)))
+    return images
+
+
+def _create_session(path: str) -> "ort.InferenceSession":
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if settings.ONNX_INTRA_OP_THREADS > 0:
+        options.intra_op_num_threads = settings.ONNX_INTRA_OP_THREADS
+    providers = ["CPUExecutionProvider"]
+    if settings.EMBEDDING_DEVICE.startswith("cuda") and "CUDAExecutionProvider" in ort.get_available_providers():
+        providers.insert(0, "CUDAExecutionProvider")
+    return ort.InferenceSession(path, sess_options=options, providers=providers)
+
+
+def _finalize(embeddings: np.ndarray, single: bool, convert_to_tensor: bool) -> Any:
+    if single:
+        embeddings = embeddings[0]
+    if convert_to_tensor:
+        import torch
+        return torch.from_numpy(embeddings)
+    return embeddings
+
+
+# -----------------------------------------------------------
+# Runtime Encoders
+# -----------------------------------------------------------
+class OnnxTextEncoder:
+    """SentenceTransformer / HuggingFaceEmbeddings 호환 ONNX 텍스트 인코더"""
+
+    def __init__(self, model_dir: str, model_file: str, meta: Dict[str, Any]):
+        from transformers import AutoTokenizer
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.session = _create_session(os.path.join(model_dir, model_file))
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.max_seq_length = meta["max_seq_length"]
+        self.normalize = meta["normalize"]
+        self.dimension = meta["dimension"]
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, convert_to_numpy: bool = True,
+               convert_to_tensor: bool = False, normalize_embeddings: Optional[bool] = None, **kwargs) -> Any:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        outputs = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size], padding=True, truncation=True,
+                max_length=self.max_seq_length, return_tensors="np"
+            )
+            feeds = {k: v.astype(np.int64) for k, v in encoded.items() if k in self.input_names}
+            outputs.append(self.session.run(None, feeds)[0])
+        embeddings = np.concatenate(outputs) if outputs else np.zeros((0, self.dimension), dtype=np.float32)
+        if self.normalize if normalize_embeddings is None else normalize_embeddings:
+            embeddings = _l2_normalize(embeddings)
+        return _finalize(embeddings.astype(np.float32), single, convert_to_tensor)
+
+    # HuggingFaceEmbeddings 호환 메서드
+    def embed_query(self, text: str) -> List[float]:
+        return self.encode(text).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.encode(texts).tolist()
+
+
+class OnnxImageEncoder:
+    """SentenceTransformer(CLIP) 호환 ONNX 이미지 인코더"""
+
+    def __init__(self, model_dir: str, model_file: str, meta: Dict[str, Any]):
+        from transformers import CLIPImageProcessor
+        self.processor = CLIPImageProcessor.from_pretrained(model_dir)
+        self.session = _create_session(os.path.join(model_dir, model_file))
+        self.dimension = meta["dimension"]
+
+    def encode(self, images: Union[Image.Image, List[Image.Image]], batch_size: int = 32, convert_to_numpy: bool = True,
+               convert_to_tensor: bool = False, **kwargs) -> Any:
+        single = isinstance(images, Image.Image)
+        items = [images] if single else list(images)
+        outputs = []
+        for start in range(0, len(items), batch_size):
+            chunk = [img.convert("RGB") if img.mode != "RGB" else img for img in items[start:start + batch_size]]
+            pixel_values = self.processor(images=chunk, return_tensors="np")["pixel_values"].astype(np.float32)
+            outputs.append(self.session.run(None, {"pixel_values": pixel_values})[0])
+        embeddings = np.concatenate(outputs) if outputs else np.zeros((0, self.dimension), dtype=np.float32)
+        return _finalize(embeddings.astype(np.float32), single, convert_to_tensor)
+
+
+# -----------------------------------------------------------
+# Export (torch -> ONNX) + Parity Check
+# -----------------------------------------------------------
+def _export_text(st_model: Any, model_dir: str, normalize: bool) -> Dict[str, Any]:
+    import torch
+
+    class _SentenceEmbedding(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask):
+            features = self.model({"input_ids": input_ids, "attention_mask": attention_mask})
+            return features["sentence_embedding"]
+
+    tokenizer = st_model.tokenizer
+    dummy = tokenizer(["dummy input"], padding=True, return_tensors="pt")
+    torch.onnx.export(
+        _SentenceEmbedding(st_model).eval(),
+        (dummy["input_ids"], dummy["attention_mask"]),
+        os.path.join(model_dir, FP32_FILE),
+        input_names=["input_ids", "attention_mask"],
+        output_names=["embedding"],
+        dynamic_axes={"input_ids": {0: "batch", 1: "seq"}, "attention_mask": {0: "batch", 1: "seq"}, "embedding": {0: "batch"}},
+        opset_version=14,
+    )
+    tokenizer.save_pretrained(model_dir)
+    return {
+        "kind": "text",
+        "max_seq_length": st_model.max_seq_length,
+        "normalize": normalize,
+        "dimension": st_model.get_sentence_embedding_dimension(),
+    }
+
+
+def _export_image(st_model: Any, model_dir: str) -> Dict[str, Any]:
+    import torch
+
+    clip_module = st_model[0]
+
+    class _ClipVision(torch.nn.Module):
+        def __init__(self, clip_model):
+            super().__init__()
+            self.vision_model = clip_model.vision_model
+            self.visual_projection = clip_model.visual_projection
+
+        def forward(self, pixel_values):
+            pooled = self.vision_model(pixel_values=pixel_values)[1]
+            return self.visual_projection(pooled)
+
+    image_processor = clip_module.processor.image_processor
+    dummy = image_processor(images=[Image.new("RGB", (224, 224))], return_tensors="pt")["pixel_values"]
+    torch.onnx.export(
+        _ClipVision(clip_module.model).eval(),
+        (dummy,),
+        os.path.join(model_dir, FP32_FILE),
+        input_names=["pixel_values"],
+        output_names=["embedding"],
+        dynamic_axes={"pixel_values": {0: "batch"}, "embedding": {0: "batch"}},
+        opset_version=14,
+    )
+    image_processor.save_pretrained(model_dir)
+    return {"kind": "image", "dimension": clip_module.model.config.projection_dim}
+
+
+def export_model(model_name: str, kind: str, normalize: bool = False, quantize: bool = False) -> Dict[str, Any]:
+    """torch 모델을 ONNX로 내보내고 (선택) int8 양자화 후, parity 결과를 meta.json에 기록"""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model_dir = _model_dir(model_name)
+    os.makedirs(model_dir, exist_ok=True)
+    logger.info(f"📦 Exporting {model_name} to ONNX ({model_dir})...")
+
+    st_model = SentenceTransformer(model_name, device="cpu")
+    with torch.no_grad():
+        meta = _export_text(st_model, model_dir, normalize) if kind == "text" else _export_image(st_model, model_dir)
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(
+            os.path.join(model_dir, FP32_FILE),
+            os.path.join(model_dir, INT8_FILE),
+            weight_type=QuantType.QInt8,
+        )
+
+    # Parity Check: torch 결과 대비 코사인 유사도
+    samples = PARITY_TEXTS if kind == "text" else _parity_images()
+    reference = st_model.encode(samples, convert_to_numpy=True, normalize_embeddings=normalize)
+    encoder_cls = OnnxTextEncoder if kind == "text" else OnnxImageEncoder
+    meta["parity"] = {}
+    for variant, filename in (("fp32", FP32_FILE), ("int8", INT8_FILE)):
+        if not os.path.exists(os.path.join(model_dir, filename)):
+            continue
+        onnx_vectors = encoder_cls(model_dir, filename, meta).encode(samples)
+        meta["parity"][variant] = _min_cosine(reference, onnx_vectors)
+        logger.info(f"🔬 Parity [{model_name} / {variant}] min cosine = {meta['parity'][variant]:.5f}")
+
+    meta["model_name"] = model_name
+    with open(os.path.join(model_dir, META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def load_encoder(model_name: str, kind: str, normalize: bool = False, quantized: bool = False) -> Optional[Any]:
+    """
+    ONNX 인코더 로드 (없으면 내보내기 수행)
+    - onnxruntime 미설치, 변환 실패, parity 미달 시 None 반환 -> 호출 측에서 torch 모델 사용
+    """
+    if ort is None:
+        logger.error("❌ onnxruntime not installed. Falling back to torch backend.")
+        return None
+
+    variant, filename = ("int8", INT8_FILE) if quantized else ("fp32", FP32_FILE)
+    model_dir = _model_dir(model_name)
+    meta_path = os.path.join(model_dir, META_FILE)
+
+    try:
+        meta = None
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+        if meta is None or variant not in meta.get("parity", {}):
+            meta = export_model(model_name, kind, normalize=normalize, quantize=quantized)
+
+        score = meta["parity"].get(variant, 0.0)
+        if score < settings.ONNX_PARITY_THRESHOLD:
+            logger.error(f"❌ ONNX parity check failed for {model_name} ({variant}: {score:.4f} < {settings.ONNX_PARITY_THRESHOLD}). Using torch.")
+            return None
+
+        encoder_cls = OnnxTextEncoder if kind == "text" else OnnxImageEncoder
+        encoder = encoder_cls(model_dir, filename, meta)
+        logger.info(f"⚡ ONNX encoder ready: {model_name} ({variant}, parity {score:.4f})")
+        return encoder
+    except Exception as e:
+        logger.error(f"❌ ONNX backend init failed for {model_name}: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    from src.core.model_engine import BERT_MODEL_NAME, CLIP_MODEL_NAME, CLIP_VISION_MODEL_NAME
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Export embedding models to ONNX and verify parity")
+    parser.add_argument("--quantize", action="store_true", help="동적 int8 양자화 모델도 함께 생성")
+    args = parser.parse_args()
+
+    export_model(BERT_MODEL_NAME, "text", normalize=True, quantize=args.quantize)
+    export_model(CLIP_MODEL_NAME, "text", normalize=False, quantize=args.quantize)
+    export_model(CLIP_VISION_MODEL_NAME, "image", quantize=args.quantize)
@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import redis
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TwoTierCache:
+    """
+    2단계 바이트 캐시 (임베딩 / YOLO 감지 / RAG 결과 캐시가 공유)
+    - L1: 프로세스 내부 LRU (항목 수 / 바이트 예산 제한, 항목별 만료)
+    - L2: Redis (레플리카/재기동 간 공유), 장애 시 REDIS_RETRY_SECONDS 동안 건너뛰고 L1만 사용
+    - 값 직렬화와 키 구성은 사용하는 쪽에서 담당
+    """
+
+    REDIS_RETRY_SECONDS = 30
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        ttl: int,
+        enabled: bool = True,
+        redis_enabled: bool = True,
+        max_entries: int = 0,
+        max_bytes: int = 0,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lru: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._redis: Optional[redis.Redis] = None
+        self._redis_retry_at = 0.0
+        if self.enabled and redis_enabled:
+            self._redis = redis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=0,
+                socket_timeout=0.2,
+                socket_connect_timeout=0.2,
+            )
+
+    # -----------------------------------------------------------
+    # L1 (LRU)
+    # -----------------------------------------------------------
+    def _lru_get(self, key: str, now: float) -> Optional[bytes]:
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                self._lru.pop(key)
+                self._bytes -= len(entry[1])
+                return None
+            self._lru.move_to_end(key)
+            return entry[1]
+
+    def _lru_put(self, key: str, data: bytes, now: float):
+        with self._lock:
+            old = self._lru.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._lru[key] = (now + self.ttl, data)
+            self._bytes += len(data)
+            while self._lru and (
+                (self.max_entries and len(self._lru) > self.max_entries) or
+                (self.max_bytes and self._bytes > self.max_bytes)
+            ):
+                _, (_, evicted) = self._lru.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    # -----------------------------------------------------------
+    # L2 (Redis)
+    # -----------------------------------------------------------
+    def _redis_available(self) -> bool:
+        return self._redis is not None and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, e: Exception):
+        logger.warning(f"⚠️ {self.name} cache Redis unavailable, using in-process cache only: {e}")
+        self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_SECONDS
+
+    # -----------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+
+        now = time.time()
+        found: Dict[int, bytes] = {}
+        for i, key in enumerate(keys):
+            data = self._lru_get(key, now)
+            if data is not None:
+                found[i] = data
+
+        missing = [i for i in range(len(keys)) if i not in found]
+        if missing and self._redis_available():
+            try:
+                for i, data in zip(missing, self._redis.mget([keys[i] for i in missing])):
+                    if data is not None:
+                        found[i] = data
+                        self._lru_put(keys[i], data, now)
+            except redis.RedisError as e:
+                self._redis_failed(e)
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return [found.get(i) for i in range(len(keys))]
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.get_many([key])[0]
+
+    def set_many(self, items: Dict[str, bytes]):
+        if not self.enabled or not items:
+            return
+        now = time.time()
+        for key, data in items.items():
+            self._lru_put(key, data, now)
+        if self._redis_available():
+            try:
+                with self._redis.pipeline(transaction=False) as pipe:
+                    for key, data in items.items():
+                        pipe.set(key, data, ex=self.ttl)
+                    pipe.execute()
+            except redis.RedisError as e:
+                self._redis_failed(e)
+
+    def set(self, key: str, data: bytes):
+        self.set_many({key: data})
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._lru), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,84 @@
+import base64
+import json
+from contextvars import ContextVar
+from typing import Any, Optional
+
+import numpy as np
+from fastapi import Header
+from fastapi.responses import JSONResponse
+
+# 벡터 압축 전송 (Backend 가 Accept 헤더로 요청할 때만 사용, 기본은 일반 JSON)
+# 예) Accept: application/x-modify-vectors+json; encoding=f32
+# 응답 본문에서 float 리스트(벡터)는 {"$f32": "<base64 little-endian float32>"} 로 치환됨
+VECTOR_MEDIA_TYPE = "application/x-modify-vectors+json"
+VECTOR_DTYPES = {"f32": "<f4", "f16": "<f2"}
+# 이보다 짧은 float 리스트(점수, 가격 등)는 그대로 JSON 으로 둠
+VECTOR_MIN_DIM = 64
+
+_vector_encoding: ContextVar[Optional[str]] = ContextVar("vector_encoding", default=None)
+
+
+def parse_accept(accept: Optional[str]) -> Optional[str]:
+    """Accept 헤더에서 벡터 인코딩(f32 | f16) 추출, 요청하지 않았거나 q=0 이거나 모르는 인코딩이면 None"""
+    if not accept:
+        return None
+    for part in accept.split(","):
+        media, *params = [p.strip() for p in part.split(";")]
+        if media.lower() != VECTOR_MEDIA_TYPE:
+            continue
+        encoding = "f32"
+        for param in params:
+            key, _, value = param.partition("=")
+            key, value = key.strip().lower(), value.strip().strip('"').lower()
+            if key == "encoding":
+                encoding = value
+            elif key == "q":
+                # q=0 은 "받지 않음" 의미
+                try:
+                    if float(value) <= 0:
+                        return None
+                except ValueError:
+                    return None
+        return encoding if encoding in VECTOR_DTYPES else None
+    return None
+
+
+async def negotiate_vector_encoding(accept: Optional[str] = Header(None)):
+    """
+    라우터 의존성: 요청별 벡터 인코딩을 ContextVar 에 기록 (VectorJSONResponse 가 참조)
+    - async 의존성이어야 엔드포인트/응답 직렬화와 같은 컨텍스트에서 실행됨
+    """
+    _vector_encoding.set(parse_accept(accept))
+
+
+def _is_vector(value: Any) -> bool:
+    return len(value) >= VECTOR_MIN_DIM and all(isinstance(x, float) for x in value)
+
+
+def encode_vectors(value: Any, encoding: str) -> Any:
+    """JSON 값에서 벡터(float 리스트)를 {"$<encoding>": base64} 로 치환"""
+    if isinstance(value, dict):
+        return {k: encode_vectors(v, encoding) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        if _is_vector(value):
+            raw = np.asarray(value, dtype=VECTOR_DTYPES[encoding]).tobytes()
+            return {f"${encoding}": base64.b64encode(raw).decode("ascii")}
+        return [encode_vectors(v, encoding) for v in value]
+    return value
+
+
+class VectorJSONResponse(JSONResponse):
+    """요청이 압축 인코딩을 협상했으면 벡터를 base64 로 보내는 JSONResponse"""
+
+    def render(self, content: Any) -> bytes:
+        encoding = _vector_encoding.get()
+        if encoding is None:
+            return super().render(content)
+        # Response.__init__ 에서 render 후 헤더를 만들므로 여기서 media_type 을 바꿔도 반영됨
+        self.media_type = f"{VECTOR_MEDIA_TYPE}; encoding={encoding}"
+        return json.dumps(
+            encode_vectors(content, encoding),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
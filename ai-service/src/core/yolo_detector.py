@@ -1,3 +1,4 @@
+import json
 import logging
 from typing import List, Dict, Any, Optional, Tuple
 from PIL import Image
@@ -5,8 +6,44 @@ import numpy as np
 import torch
 import torch.nn as nn
 
+from src.core.config import settings
+from src.core.embedding_cache import image_digest
+from src.core.two_tier_cache import TwoTierCache
+
 logger = logging.getLogger(__name__)
 
+def _to_rgb(image: Image.Image) -> Image.Image:
+    # 🚨 [FIX] 4채널(RGBA) 이미지가 들어오면 3채널(RGB)로 변환
+    return image.convert('RGB') if image.mode != 'RGB' else image
+
+
+class DetectionCache:
+    """
+    YOLO 감지 결과 캐시 (bbox / keypoints, TwoTierCache 항목 수 제한 L1 + Redis)
+    - 힐링, 재업로드, 백필 시 같은 이미지 재감지 방지
+    - 키: yolo:{모델 가중치}:{종류}:{imgsz}:{이미지 sha256}, 값: JSON
+      (가중치 파일을 바꾸면 이전 모델의 감지 결과를 재사용하지 않음)
+    """
+
+    def __init__(self):
+        self._cache = TwoTierCache(
+            "Detection",
+            ttl=settings.YOLO_DETECTION_CACHE_TTL,
+            enabled=settings.YOLO_DETECTION_CACHE_SIZE > 0,
+            redis_enabled=settings.YOLO_DETECTION_CACHE_REDIS_ENABLED,
+            max_entries=settings.YOLO_DETECTION_CACHE_SIZE,
+        )
+
+    def key(self, model_name: str, kind: str, digest: str) -> str:
+        return f"yolo:{model_name}:{kind}:{settings.YOLO_IMGSZ}:{digest}"
+
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        return [json.loads(data) if data is not None else None for data in self._cache.get_many(keys)]
+
+    def set_many(self, items: Dict[str, Any]):
+        self._cache.set_many({key: json.dumps(value).encode() for key, value in items.items()})
+
+
 class YOLOFashionDetector:
     """
     YOLO 기반 패션 아이템 감지기
@@ -26,6 +63,9 @@ class YOLOFashionDetector:
         self.UPPER_RATIO = 0.55  # 상위 55%가 상의
         self.LOWER_RATIO = 0.45  # 하위 45%가 하의
         
+        # 감지 결과 캐시 (이미지 해시 기준 bbox / keypoints)
+        self.cache = DetectionCache()
+        
     def initialize(self):
         """YOLO 모델 로드"""
         if self.initialized: return True
@@ -50,9 +90,9 @@ class YOLOFashionDetector:
                 return _original_load(*args, **kwargs)
             torch.load = _unsafe_load
 
-            self.model = YOLO('yolov8n.pt')
+            self.model = YOLO(settings.YOLO_MODEL_NAME)
             try:
-                self.pose_model = YOLO('yolov8n-pose.pt')
+                self.pose_model = YOLO(settings.YOLO_POSE_MODEL_NAME)
                 logger.info("✅ YOLO Pose model loaded")
             except: self.pose_model = None
             
@@ -74,62 +114,86 @@ class YOLOFashionDetector:
         """
         이미지에서 사람 감지
         """
+        return self.detect_person_batch([image])[0]
+
+    def detect_person_batch(self, images: List[Image.Image]) -> List[List[Dict[str, Any]]]:
+        """
+        여러 이미지에서 사람 감지 (입력 순서대로 결과 반환)
+        - 캐시에 없는 이미지만 YOLO_BATCH_SIZE 단위로 묶어 한 번에 추론
+        - 입력은 YOLO_IMGSZ 크기로 letterbox 됨
+        """
+        if not images: return []
         if not self.initialized:
-            if not self.initialize(): return []
-        
-        try:
-            # 🚨 [FIX] 4채널(RGBA) 이미지가 들어오면 3채널(RGB)로 변환
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            if not self.initialize(): return [[] for _ in images]
 
-            # PIL -> numpy
-            img_array = np.array(image)
-            
-            # YOLO 추론
-            results = self.model(img_array, classes=[self.PERSON_CLASS_ID], verbose=False)
-            
-            persons = []
-            for result in results:
-                if result.boxes is None: continue
-                for box in result.boxes:
-                    x1, y1, x2, y2 = box.xyxy[0].tolist()
-                    conf = float(box.conf[0])
-                    area = (x2 - x1) * (y2 - y1)
-                    
-                    persons.append({
-                        "bbox": (int(x1), int(y1), int(x2), int(y2)),
-                        "confidence": conf,
-                        "area": area
-                    })
-            
-            persons.sort(key=lambda x: x["area"], reverse=True)
-            return persons
+        keys = [self.cache.key(settings.YOLO_MODEL_NAME, "person", image_digest(img)) for img in images]
+        results: List[Optional[List[Dict[str, Any]]]] = self.cache.get_many(keys)
+
+        # 같은 배치 안의 중복 이미지는 한 번만 추론
+        pending: Dict[str, int] = {}
+        for i, persons in enumerate(results):
+            if persons is None and keys[i] not in pending:
+                pending[keys[i]] = i
+
+        batch_size = max(1, settings.YOLO_BATCH_SIZE)
+        indices = list(pending.values())
+        detected: Dict[str, List[Dict[str, Any]]] = {}
+        for start in range(0, len(indices), batch_size):
+            chunk = indices[start:start + batch_size]
+            try:
+                # PIL -> numpy 후 YOLO 배치 추론
+                frames = [np.array(_to_rgb(images[i])) for i in chunk]
+                outputs = self.model(frames, classes=[self.PERSON_CLASS_ID], imgsz=settings.YOLO_IMGSZ, verbose=False)
+                new_entries = {}
+                for i, output in zip(chunk, outputs):
+                    detected[keys[i]] = new_entries[keys[i]] = self._parse_persons(output)
+                self.cache.set_many(new_entries)
+            except Exception as e:
+                logger.error(f"❌ Person detection failed: {e}")
+                for i in chunk: detected[keys[i]] = []
+
+        return [persons if persons is not None else [dict(p) for p in detected[keys[i]]] for i, persons in enumerate(results)]
+
+    def _parse_persons(self, result: Any) -> List[Dict[str, Any]]:
+        persons = []
+        if result.boxes is None: return persons
+        for box in result.boxes:
+            x1, y1, x2, y2 = box.xyxy[0].tolist()
+            conf = float(box.conf[0])
+            area = (x2 - x1) * (y2 - y1)
             
-        except Exception as e:
-            logger.error(f"❌ Person detection failed: {e}")
-            return []
+            persons.append({
+                "bbox": (int(x1), int(y1), int(x2), int(y2)),
+                "confidence": conf,
+                "area": area
+            })
+        
+        persons.sort(key=lambda x: x["area"], reverse=True)
+        return persons
     
     def get_keypoints(self, image: Image.Image) -> Optional[Dict[str, Tuple[int, int]]]:
         if self.pose_model is None: return None
+        key = self.cache.key(settings.YOLO_POSE_MODEL_NAME, "pose", image_digest(image))
+        cached = self.cache.get_many([key])[0]
+        if cached is not None:
+            return {name: tuple(xy) for name, xy in cached.items()} or None
         try:
-            # 🚨 [FIX] 포즈 추정 시에도 RGB 변환 확인
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-                
-            img_array = np.array(image)
-            results = self.pose_model(img_array, verbose=False)
+            img_array = np.array(_to_rgb(image))
+            results = self.pose_model(img_array, imgsz=settings.YOLO_IMGSZ, verbose=False)
             
             KEYPOINT_NAMES = {5: "left_shoulder", 6: "right_shoulder", 11: "left_hip", 12: "right_hip"}
+            kp_dict = {}
             for result in results:
                 if result.keypoints is None: continue
                 keypoints = result.keypoints.xy[0].tolist()
-                kp_dict = {}
                 for idx, name in KEYPOINT_NAMES.items():
                     if idx < len(keypoints):
                         x, y = keypoints[idx]
                         if x > 0 and y > 0: kp_dict[name] = (int(x), int(y))
-                if kp_dict: return kp_dict
-            return None
+                if kp_dict: break
+            # 감지 실패(빈 dict)도 캐시하여 같은 이미지 재추론 방지
+            self.cache.set_many({key: kp_dict})
+            return kp_dict or None
         except: return None
     
     def _crop_from_bbox(self, image: Image.Image, bbox: Tuple[int,int,int,int], target: str) -> Image.Image:
@@ -158,10 +222,11 @@ class YOLOFashionDetector:
         if not persons: return image
         return self._crop_from_bbox(image, persons[0]["bbox"], target)
     
-    def extract_fashion_features(self, image: Image.Image) -> Dict[str, Optional[Image.Image]]:
+    def extract_fashion_features(self, image: Image.Image, persons: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Optional[Image.Image]]:
         result = {"full": None, "upper": None, "lower": None}
         
-        persons = self.detect_person(image)
+        if persons is None:
+            persons = self.detect_person(image)
         if not persons:
             result["full"] = image 
             return result
@@ -179,4 +244,9 @@ class YOLOFashionDetector:
         
         return result
 
+    def extract_fashion_features_batch(self, images: List[Image.Image]) -> List[Dict[str, Optional[Image.Image]]]:
+        """여러 이미지의 전신/상의/하의 크롭 (YOLO 배치 추론 1회)"""
+        detections = self.detect_person_batch(images)
+        return [self.extract_fashion_features(img, persons) for img, persons in zip(images, detections)]
+
 yolo_detector = YOLOFashionDetector()
\ No newline at end of file
@@ -2,17 +2,21 @@ import logging
 import json
 import re
 import base64
-import os
-import uuid
 import traceback
-from fastapi import FastAPI, HTTPException, APIRouter, UploadFile, File
-from pydantic import BaseModel
+import asyncio
+from fastapi import FastAPI, HTTPException, APIRouter, UploadFile, File, Header, Depends
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from contextlib import asynccontextmanager
 
+from src.core.config import settings
 from src.core.model_engine import model_engine
+from src.core.embedding_cache import embedding_cache
+from src.core.executor import inference_pool, llm_pool, executor_stats, shutdown_executors
 from src.core.prompts import VISION_ANALYSIS_PROMPT
+from src.core.vector_codec import VectorJSONResponse, negotiate_vector_encoding
 from src.services.rag_orchestrator import rag_orchestrator
+from src.services.idempotency import idempotency_store, IdempotencyConflict
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("ai-service")
@@ -25,10 +29,16 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"⚠️ Model init warning: {e}")
     yield
+    shutdown_executors()
     logger.info("💤 AI Service Shutting down...")
 
 app = FastAPI(title="Modify AI Service", version="1.0.0", lifespan=lifespan)
-api_router = APIRouter(prefix="/api/v1")
+# Accept 헤더로 벡터 압축 전송(base64 float32/float16)을 요청하면 응답의 벡터를 압축
+api_router = APIRouter(
+    prefix="/api/v1",
+    default_response_class=VectorJSONResponse,
+    dependencies=[Depends(negotiate_vector_encoding)],
+)
 
 # --- DTO ---
 class EmbedRequest(BaseModel):
@@ -41,6 +51,15 @@ class AnalyzeRequest(BaseModel):
 class EmbedResponse(BaseModel):
     vector: List[float]
 
+class EmbedBatchRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1, max_length=settings.EMBED_BATCH_MAX_TEXTS)
+    include_clip: bool = True
+
+class EmbedBatchResponse(BaseModel):
+    bert: List[List[float]]                  # BERT (768) x N
+    clip: Optional[List[List[float]]] = None  # CLIP-text (512) x N
+    count: int
+
 class ImageAnalysisResponse(BaseModel):
     name: str
     category: str
@@ -139,11 +158,23 @@ CATEGORY_MAP = {
 @api_router.post("/embed-text", response_model=EmbedResponse)
 async def embed_text(request: EmbedRequest):
     try:
-        vector = model_engine.generate_embedding(request.text)
+        vector = await inference_pool.run(model_engine.generate_embedding, request.text)
         return {"vector": vector}
     except:
         return {"vector": [0.0] * 768} 
 
+@api_router.post("/embed-text-batch", response_model=EmbedBatchResponse)
+async def embed_text_batch(request: EmbedBatchRequest):
+    """
+    여러 텍스트를 한 번의 요청으로 임베딩 (BERT + CLIP-text)
+    - 대량 상품 등록 시 텍스트마다 /embed-text를 호출하는 대신 사용
+    """
+    result = await inference_pool.run(
+        model_engine.generate_embeddings_batch, request.texts, request.include_clip
+    )
+    logger.info(f"📦 Batch embedded {len(request.texts)} texts (clip: {request.include_clip})")
+    return {"bert": result["bert"], "clip": result["clip"], "count": len(request.texts)}
+
 @api_router.post("/analyze-image", response_model=ImageAnalysisResponse)
 async def analyze_image(file: UploadFile = File(...)):
     filename = file.filename
@@ -154,7 +185,7 @@ async def analyze_image(file: UploadFile = File(...)):
         logger.info(f"👁️ Analyzing image: {filename}...")
         
         # 1. Text Generation (Llama)
-        generated_text = model_engine.generate_with_image(VISION_ANALYSIS_PROMPT, image_b64)
+        generated_text = await llm_pool.run(model_engine.generate_with_image, VISION_ANALYSIS_PROMPT, image_b64)
         
         # JSON Parsing (이미 model_engine 내부에서 인코딩/파싱 처리됨)
         try:
@@ -195,10 +226,13 @@ async def analyze_image(file: UploadFile = File(...)):
         # 2. Vector Generation (BERT + CLIP Full/Upper/Lower)
         # BERT (768)
         meta_text = f"[{product_data.get('gender')}] {product_data.get('name')} {product_data.get('category')}"
-        vector_bert = model_engine.generate_embedding(meta_text)
         
         # CLIP (512 x 3) - Optimized & Zero-padded safe
-        fashion_vectors = model_engine.generate_fashion_embeddings(image_b64)
+        # BERT와 CLIP은 서로 독립적이므로 추론 풀에서 동시에 실행
+        vector_bert, fashion_vectors = await asyncio.gather(
+            inference_pool.run(model_engine.generate_embedding, meta_text),
+            inference_pool.run(model_engine.generate_fashion_embeddings, image_b64)
+        )
         
         logger.info(f"✅ Analysis Success: {product_data.get('name')}")
         
@@ -236,7 +270,7 @@ async def llm_generate(body: Dict[str, str]):
     logger.info(f"📝 LLM Prompt received: {prompt[:100]}...")
     try:
         korean_prompt = f"질문: {prompt}\n답변 (한국어):"
-        answer = model_engine.generate_text(korean_prompt)
+        answer = await llm_pool.run(model_engine.generate_text, korean_prompt)
         return {"answer": answer}
     except Exception as e:
         logger.error(f"❌ LLM Generation Failed: {e}")
@@ -269,7 +303,7 @@ async def generate_clip_vector(request: ClipVectorRequest):
             image_b64 = image_b64.split("base64,")[1]
         
         # CLIP Vision 모델로 벡터 생성 (YOLO 적용)
-        result = model_engine.generate_image_embedding(image_b64, use_yolo=True)
+        result = await inference_pool.run(model_engine.generate_image_embedding, image_b64, use_yolo=True)
         clip_vector = result.get("clip", [])
         
         if not clip_vector or len(clip_vector) == 0:
@@ -293,6 +327,39 @@ class FashionClipRequest(BaseModel):
     target: str = "full"  # "full", "upper", "lower"
 
 
+def _embed_fashion_target(image_b64: str, target: str) -> Dict[str, List[float]]:
+    """YOLO로 target 영역을 크롭한 뒤 CLIP 벡터 생성 (추론 풀 전용 동기 함수)"""
+    # PIL Image로 변환
+    import io
+    from PIL import Image
+    pil_image = Image.open(io.BytesIO(base64.b64decode(image_b64)))
+
+    # YOLO로 영역 크롭 후 CLIP 벡터 생성
+    try:
+        from src.core.yolo_detector import yolo_detector
+
+        # YOLO 초기화
+        if not yolo_detector.initialized:
+            yolo_detector.initialize()
+
+        # 지정된 영역 크롭
+        cropped = yolo_detector.crop_fashion_regions(pil_image, target=target)
+
+        if cropped is not None:
+            logger.info(f"✂️ YOLO cropped '{target}' region: {cropped.size}")
+            pil_image = cropped
+        else:
+            logger.warning(f"⚠️ YOLO crop failed for '{target}', using original")
+
+    except ImportError as e:
+        logger.warning(f"⚠️ YOLO not available: {e}")
+    except Exception as e:
+        logger.warning(f"⚠️ YOLO failed: {e}")
+
+    # CLIP 벡터 생성 (YOLO 중복 적용 방지)
+    return model_engine.generate_image_embedding(pil_image, use_yolo=False)
+
+
 @api_router.post("/generate-fashion-clip-vector")
 async def generate_fashion_clip_vector(request: FashionClipRequest):
     """
@@ -308,44 +375,8 @@ async def generate_fashion_clip_vector(request: FashionClipRequest):
         if "base64," in image_b64:
             image_b64 = image_b64.split("base64,")[1]
         
-        # PIL Image로 변환
-        import io
-        from PIL import Image
-        pil_image = Image.open(io.BytesIO(base64.b64decode(image_b64)))
-        
-        # YOLO로 영역 크롭 후 CLIP 벡터 생성
-        try:
-            from src.core.yolo_detector import yolo_detector
-            
-            # YOLO 초기화
-            if not yolo_detector.initialized:
-                yolo_detector.initialize()
-            
-            # 지정된 영역 크롭
-            cropped = yolo_detector.crop_fashion_regions(pil_image, target=target)
-            
-            if cropped is not None:
-                logger.info(f"✂️ YOLO cropped '{target}' region: {cropped.size}")
-                pil_image = cropped
-
-                # ✅ [DEBUG] 크롭된 이미지가 맞는지 눈으로 확인하기 위해 저장!
-                debug_dir = "/app/static/debug" # 도커 볼륨 경로 확인 필요 (혹은 "./debug_images")
-                os.makedirs(debug_dir, exist_ok=True)
-                debug_filename = f"{debug_dir}/{uuid.uuid4()}_{target}.jpg"
-                pil_image.save(debug_filename)
-                logger.info(f"📸 Debug Image Saved: {debug_filename}")
-
-
-            else:
-                logger.warning(f"⚠️ YOLO crop failed for '{target}', using original")
-                
-        except ImportError as e:
-            logger.warning(f"⚠️ YOLO not available: {e}")
-        except Exception as e:
-            logger.warning(f"⚠️ YOLO failed: {e}")
-        
-        # CLIP 벡터 생성 (YOLO 중복 적용 방지)
-        result = model_engine.generate_image_embedding(pil_image, use_yolo=False)
+        # YOLO 크롭 + CLIP 인코딩은 블로킹 작업이므로 추론 풀에서 실행
+        result = await inference_pool.run(_embed_fashion_target, image_b64, target)
         clip_vector = result.get("clip", [])
         
         if not clip_vector or len(clip_vector) == 0:
@@ -364,6 +395,39 @@ async def generate_fashion_clip_vector(request: FashionClipRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class FashionClipVectorsResponse(BaseModel):
+    full: List[float]
+    upper: List[float]
+    lower: List[float]
+    dimension: int
+
+
+@api_router.post("/generate-fashion-clip-vectors", response_model=FashionClipVectorsResponse)
+async def generate_fashion_clip_vectors(request: FashionClipRequest):
+    """
+    ✅ 전신/상의/하의 CLIP 벡터 일괄 생성
+    - YOLO 감지 1회 + 3개 크롭을 한 번의 CLIP forward pass로 처리
+    - 감지/벡터 결과는 이미지 해시로 캐시되어 UI에서 target 전환 시 재계산 없음
+    - 사람이 감지되지 않으면 상의/하의는 전신 벡터로 채움 (단일 target 엔드포인트와 동일 동작)
+    """
+    try:
+        image_b64 = request.image_b64
+        if "base64," in image_b64:
+            image_b64 = image_b64.split("base64,")[1]
+
+        vectors = await inference_pool.run(model_engine.generate_fashion_embeddings, image_b64, fill_missing=True)
+        if not any(vectors["full"]):
+            raise HTTPException(status_code=500, detail="CLIP 벡터 생성 실패")
+
+        logger.info(f"✅ Fashion CLIP vectors generated (full/upper/lower): {len(vectors['full'])} dimensions")
+        return {**vectors, "dimension": len(vectors["full"])}
+
+    except HTTPException: raise
+    except Exception as e:
+        logger.error(f"❌ Fashion CLIP vectors generation failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @api_router.post("/search-by-image")
 async def search_by_image(request: ImageSearchRequest):
     """
@@ -378,7 +442,7 @@ async def search_by_image(request: ImageSearchRequest):
             image_b64 = image_b64.split("base64,")[1]
         
         # CLIP 벡터 생성
-        result = model_engine.generate_image_embedding(image_b64)
+        result = await inference_pool.run(model_engine.generate_image_embedding, image_b64)
         clip_vector = result.get("clip", [])
         
         if not clip_vector:
@@ -438,8 +502,36 @@ async def process_external(request: InternalSearchRequest):
         logger.error(f"External processing failed: {e}")
         return await rag_orchestrator.process_internal_search(request.query)
 
+@api_router.post("/search-plan")
+async def search_plan(
+    request: InternalSearchRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    """
+    경로 결정 + INTERNAL/EXTERNAL 처리를 한 번의 호출로 수행
+    - 응답: process-* 응답 + "path"
+    - Idempotency-Key가 같으면 이전 결과를 그대로 반환 (외부 RAG/쿼터 중복 소모 방지)
+    """
+    logger.info(f"🧭 Search plan: {request.query}")
+    try:
+        return await idempotency_store.run(
+            "search-plan", idempotency_key, lambda: rag_orchestrator.plan_search(request.query)
+        )
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
 app.include_router(api_router)
 
 @app.get("/")
 def read_root():
-    return {"message": "Modify AI Service is Running"}
\ No newline at end of file
+    return {"message": "Modify AI Service is Running"}
+
+@app.get("/health")
+async def health_check():
+    """헬스 체크 + 실행 풀 상태 (추론 작업과 무관하게 즉시 응답)"""
+    return {
+        "status": "ok",
+        "models_initialized": model_engine.is_initialized,
+        "executors": executor_stats(),
+        "embedding_cache": embedding_cache.stats()
+    }
\ No newline at end of file
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyConflict(Exception):
+    """같은 키의 요청이 아직 처리 중이고 대기 시간 안에 끝나지 않음"""
+
+
+class IdempotencyStore:
+    """
+    Idempotency-Key 기반 요청 중복 실행 방지 (Redis)
+    - 첫 요청: SET NX 로 pending 상태 선점 후 실행, 완료 시 결과 저장
+    - 재시도(같은 키): 저장된 결과 반환, 처리 중이면 완료될 때까지 대기
+    - 외부 RAG처럼 쿼터를 소모하는 작업이 재시도로 다시 실행되지 않도록 보장
+    - Redis 장애 시에는 키 없이 그대로 실행 (검색 자체는 막지 않음)
+    - 전용 redis.asyncio 클라이언트 + 짧은 타임아웃 (Redis 지연이 이벤트 루프를 막지 않도록)
+    """
+
+    PREFIX = "idempotency"
+    POLL_INTERVAL = 0.25
+
+    def __init__(self, redis_client: aioredis.Redis):
+        self.redis = redis_client
+        self.ttl = settings.IDEMPOTENCY_TTL
+        self.lock_ttl = settings.IDEMPOTENCY_LOCK_TTL
+        self.wait_timeout = settings.IDEMPOTENCY_WAIT_TIMEOUT
+
+    def _key(self, scope: str, key: str) -> str:
+        return f"{self.PREFIX}:{scope}:{key}"
+
+    async def run(self, scope: str, key: Optional[str], fn: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        if not key:
+            return await fn()
+
+        redis_key = self._key(scope, key)
+        try:
+            acquired = await self.redis.set(redis_key, json.dumps({"state": "pending"}), nx=True, ex=self.lock_ttl)
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Idempotency store unavailable, running without key: {e}")
+            return await fn()
+
+        if not acquired:
+            logger.info(f"♻️ Idempotent replay: {scope}:{key}")
+            return await self._wait_for_result(redis_key)
+
+        try:
+            result = await fn()
+        except Exception:
+            # 결과 없이 실패한 경우에만 키를 해제하여 재시도 허용
+            await self._safe_delete(redis_key)
+            raise
+
+        try:
+            await self.redis.set(redis_key, json.dumps({"state": "done", "result": result}, ensure_ascii=False), ex=self.ttl)
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Failed to store idempotent result: {e}")
+        return result
+
+    async def _wait_for_result(self, redis_key: str) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait_timeout
+        while True:
+            try:
+                raw = await self.redis.get(redis_key)
+            except redis.RedisError as e:
+                raise IdempotencyConflict(f"결과 조회 실패: {e}")
+            if raw is None:
+                raise IdempotencyConflict("이전 요청이 결과 없이 종료되었습니다.")
+            entry = json.loads(raw)
+            if entry.get("state") == "done":
+                return entry["result"]
+            if loop.time() >= deadline:
+                raise IdempotencyConflict("같은 요청이 아직 처리 중입니다.")
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+    async def _safe_delete(self, redis_key: str):
+        try:
+            await self.redis.delete(redis_key)
+        except redis.RedisError:
+            pass
+
+
+idempotency_store = IdempotencyStore(
+    aioredis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=0,
+        decode_responses=True,
+        socket_timeout=1.0,
+        socket_connect_timeout=1.0,
+    )
+)
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from src.core.config import settings
+from src.core.embedding_cache import normalize_text
+from src.core.two_tier_cache import TwoTierCache
+
+logger = logging.getLogger(__name__)
+
+
+class RagResultCache:
+    """
+    외부 RAG 결과 TTL 캐시 (Google 검색 결과, VLM 분석 요약, TwoTierCache L1 + Redis)
+    - 키: rag:{종류}:{sha256(정규화된 키)}, 값: JSON
+    - 동기 Redis 호출이므로 async 코드에서는 asyncio.to_thread 로 호출
+    """
+
+    LOCAL_MAX_ENTRIES = 1024
+
+    def __init__(self):
+        self.ttl = settings.RAG_CACHE_TTL
+        self._cache = TwoTierCache(
+            "RAG",
+            ttl=self.ttl,
+            enabled=self.ttl > 0,
+            redis_enabled=settings.RAG_CACHE_REDIS_ENABLED,
+            max_entries=self.LOCAL_MAX_ENTRIES,
+        )
+
+    def _key(self, kind: str, raw_key: str) -> str:
+        digest = hashlib.sha256(normalize_text(raw_key).lower().encode("utf-8")).hexdigest()
+        return f"rag:{kind}:{digest}"
+
+    def get(self, kind: str, raw_key: str) -> Optional[Any]:
+        data = self._cache.get(self._key(kind, raw_key))
+        return json.loads(data) if data is not None else None
+
+    def set(self, kind: str, raw_key: str, value: Any):
+        self._cache.set(self._key(kind, raw_key), json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+
+class CandidateImageStore:
+    """
+    외부 후보 이미지 디스크 저장소 (URL -> 원본 바이트)
+    - 파일명: sha256(url), 접근 시 mtime 갱신 -> mtime 기준 LRU 삭제
+    - 전체 크기가 RAG_IMAGE_STORE_MAX_BYTES를 넘으면 오래된 파일부터 삭제
+    - 디코딩 불가/부적합 이미지는 빈 파일로 표시하고 RAG_IMAGE_NEGATIVE_TTL 동안 재시도하지 않음
+    """
+
+    def __init__(self):
+        self.root = settings.RAG_IMAGE_STORE_DIR
+        self.max_bytes = settings.RAG_IMAGE_STORE_MAX_BYTES
+        self.negative_ttl = settings.RAG_IMAGE_NEGATIVE_TTL
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.root, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def _scan(self) -> int:
+        if self._total_bytes is None:
+            os.makedirs(self.root, exist_ok=True)
+            self._total_bytes = sum(entry.stat().st_size for entry in os.scandir(self.root) if entry.is_file())
+        return self._total_bytes
+
+    def get(self, url: str) -> Optional[bytes]:
+        """저장된 이미지 바이트 반환 (실패 표시면 b"", 없으면 None)"""
+        path = self._path(url)
+        try:
+            stat = os.stat(path)
+            if stat.st_size == 0 and time.time() - stat.st_mtime > self.negative_ttl:
+                return None
+            with open(path, "rb") as f:
+                data = f.read()
+            if data: os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def put(self, url: str, data: bytes):
+        if self.max_bytes <= 0: return
+        path = self._path(url)
+        try:
+            with self._lock:
+                self._scan()
+                old_size = os.path.getsize(path) if os.path.exists(path) else 0
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                self._total_bytes += len(data) - old_size
+                if self._total_bytes > self.max_bytes:
+                    self._evict()
+        except OSError as e:
+            logger.warning(f"⚠️ Candidate image store write failed: {e}")
+
+    def mark_failed(self, url: str):
+        self.put(url, b"")
+
+    def _evict(self):
+        entries = sorted(
+            (entry for entry in os.scandir(self.root) if entry.is_file()),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in entries:
+            if self._total_bytes <= self.max_bytes * 0.9: break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+                self._total_bytes -= size
+            except OSError: pass
+
+
+rag_result_cache = RagResultCache()
+candidate_image_store = CandidateImageStore()
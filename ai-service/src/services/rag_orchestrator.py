@@ -8,8 +8,11 @@ from typing import List, Dict, Any, Optional, Set
 from PIL import Image
 
 from src.core.model_engine import model_engine
+from src.core.embedding_cache import image_digest
+from src.core.executor import inference_pool, llm_pool
 from src.services.quota_monitor import quota_monitor
 from src.services.google_search_client import GoogleSearchClient
+from src.services.rag_cache import rag_result_cache, candidate_image_store
 
 logger = logging.getLogger(__name__)
 
@@ -102,7 +105,20 @@ class AIOrchestrator:
         # ✅ 한글 이름 패턴 (2-3글자, 성+이름)
         self.korean_name_pattern = re.compile(r'^[가-힣]{2,3}$')
 
+    def _decode_candidate(self, data: bytes) -> Optional[Image.Image]:
+        image = Image.open(BytesIO(data)).convert("RGB")
+        if image.width < 250 or image.height < 250: return None
+        return image
+
     async def _download_image(self, session: aiohttp.ClientSession, url: str) -> Optional[Image.Image]:
+        # 디스크 저장소에 있으면 네트워크 생략 (b"" = 이전에 실패/부적합으로 판정된 URL)
+        stored = await asyncio.to_thread(candidate_image_store.get, url)
+        if stored is not None:
+            try:
+                return self._decode_candidate(stored) if stored else None
+            except Exception:
+                return None
+
         async with self.semaphore:
             try:
                 timeout = aiohttp.ClientTimeout(total=4)
@@ -111,15 +127,24 @@ class AIOrchestrator:
                     "Referer": "https://www.google.com/"
                 }
                 async with session.get(url, headers=headers, timeout=timeout) as response:
-                    if response.status == 200:
-                        data = await response.read()
-                        image = Image.open(BytesIO(data)).convert("RGB")
-                        if image.width < 250 or image.height < 250: return None
-                        return image
+                    if response.status != 200:
+                        return None
+                    data = await response.read()
             except Exception as e:
+                # 타임아웃/연결 오류는 일시적일 수 있으므로 실패로 기록하지 않음 (다음 검색에서 재시도)
                 logger.debug(f"Image download failed: {url} - {e}")
                 return None
-        return None
+
+        # 받은 데이터가 이미지가 아니거나 너무 작을 때만 실패로 기록
+        try:
+            image = self._decode_candidate(data)
+        except Exception:
+            image = None
+        if image:
+            await asyncio.to_thread(candidate_image_store.put, url, data)
+        else:
+            await asyncio.to_thread(candidate_image_store.mark_failed, url)
+        return image
 
     def _image_to_base64(self, image: Image.Image) -> str:
         try:
@@ -163,17 +188,24 @@ class AIOrchestrator:
         """외부 이미지 검색 + VLM 분석 (연예인/유명인 검색 전용)"""
         logger.info(f"🌍 Processing EXTERNAL RAG: {query}")
         
-        allowed, reason = quota_monitor.check_and_increment()
-        if not allowed:
-            logger.warning(f"⚠️ Quota exceeded: {reason}")
-            return await self.process_internal_search(query)
-
         optimized_query = self._optimize_query_for_celebrity(query)
         
-        logger.info(f"🔎 Searching Google Images: '{optimized_query}'")
-        search_results = await self.search_client.search_images(
-            optimized_query, num_results=15, start_index=1
-        )
+        # 같은 검색어는 TTL 동안 Google을 다시 호출하지 않음 (쿼터는 실제 호출 시에만 차감)
+        search_results = await asyncio.to_thread(rag_result_cache.get, "google", optimized_query)
+        if search_results is not None:
+            logger.info(f"♻️ Google Images cache hit: '{optimized_query}'")
+        else:
+            allowed, reason = await asyncio.to_thread(quota_monitor.check_and_increment)
+            if not allowed:
+                logger.warning(f"⚠️ Quota exceeded: {reason}")
+                return await self.process_internal_search(query)
+
+            logger.info(f"🔎 Searching Google Images: '{optimized_query}'")
+            search_results = await self.search_client.search_images(
+                optimized_query, num_results=15, start_index=1
+            )
+            if search_results:
+                await asyncio.to_thread(rag_result_cache.set, "google", optimized_query, search_results)
         
         if not search_results:
             logger.warning("❌ No search results from Google")
@@ -191,19 +223,24 @@ class AIOrchestrator:
             scored_candidates = []
             clip_prompt = f"{optimized_query} {self._get_scoring_context(optimized_query)}"
 
-            for i, img in enumerate(downloaded_images):
-                if img:
-                    base_score = self.engine.calculate_similarity(clip_prompt, img)
-                    ratio_bonus = 0.05 if img.height > img.width else 0.0
-                    final_score = base_score + ratio_bonus
+            # 프롬프트 1회 인코딩 + 후보 이미지 일괄 인코딩 후 한 번에 유사도 계산
+            valid_indices = [i for i, img in enumerate(downloaded_images) if img]
+            base_scores = await inference_pool.run(
+                self.engine.score_images_against_text, clip_prompt, [downloaded_images[i] for i in valid_indices]
+            )
 
-                    if final_score > 0.18:
-                        scored_candidates.append({
-                            "image": img,
-                            "url": search_results[i]['link'],
-                            "raw_score": final_score,
-                            "display_score": self._normalize_score(final_score)
-                        })
+            for i, base_score in zip(valid_indices, base_scores):
+                img = downloaded_images[i]
+                ratio_bonus = 0.05 if img.height > img.width else 0.0
+                final_score = base_score + ratio_bonus
+
+                if final_score > 0.18:
+                    scored_candidates.append({
+                        "image": img,
+                        "url": search_results[i]['link'],
+                        "raw_score": final_score,
+                        "display_score": self._normalize_score(final_score)
+                    })
 
             scored_candidates.sort(key=lambda x: x['raw_score'], reverse=True)
             top_candidates = scored_candidates[:4]
@@ -227,9 +264,13 @@ class AIOrchestrator:
         summary = await self._analyze_image_with_vlm(best_image, query)
         final_data_uri = self._image_to_base64(best_image)
 
+        dual_vectors, image_vectors = await asyncio.gather(
+            inference_pool.run(self.engine.generate_dual_embedding, summary),
+            inference_pool.run(self.engine.generate_image_embedding, best_image)
+        )
         vectors = {
-            "bert": self.engine.generate_dual_embedding(summary)["bert"],
-            "clip": self.engine.generate_image_embedding(best_image)["clip"]
+            "bert": dual_vectors["bert"],
+            "clip": image_vectors["clip"]
         }
 
         return {
@@ -275,7 +316,14 @@ class AIOrchestrator:
             
             반드시 한국어로 작성하세요.
             """
-            return self.engine.generate_with_image(vlm_prompt, img_b64)
+            # 같은 이미지 + 질문 조합의 분석 결과는 캐시에서 재사용
+            cache_key = f"{query}|{image_digest(image_data) if isinstance(image_data, Image.Image) else img_b64}"
+            summary = await asyncio.to_thread(rag_result_cache.get, "vlm", cache_key)
+            if summary is None:
+                summary = await llm_pool.run(self.engine.generate_with_image, vlm_prompt, img_b64)
+                if summary and summary != "분석 불가":
+                    await asyncio.to_thread(rag_result_cache.set, "vlm", cache_key, summary)
+            return summary
         except Exception as e:
             logger.error(f"VLM analysis failed: {e}")
             return "분석 불가"
@@ -283,7 +331,7 @@ class AIOrchestrator:
     async def process_internal_search(self, query: str) -> Dict[str, Any]:
         """내부 텍스트 검색 (일반 상품 검색)"""
         logger.info(f"📦 Processing INTERNAL search: {query}")
-        vectors = self.engine.generate_dual_embedding(query)
+        vectors = await inference_pool.run(self.engine.generate_dual_embedding, query)
         return {
             "vectors": vectors,
             "search_path": "INTERNAL",
@@ -293,6 +341,23 @@ class AIOrchestrator:
             "ref_image": None
         }
 
+    async def plan_search(self, query: str) -> Dict[str, Any]:
+        """
+        경로 결정 + 벡터/분석 생성을 한 번에 수행 (/search-plan)
+        - 외부 RAG 실패 시 내부 검색 결과로 대체하여 항상 결과를 반환
+        """
+        path = await self.determine_search_path(query)
+        if path == 'EXTERNAL':
+            try:
+                result = await self.process_external_rag(query)
+            except Exception as e:
+                logger.error(f"External processing failed: {e}")
+                result = await self.process_internal_search(query)
+        else:
+            result = await self.process_internal_search(query)
+        result["path"] = path
+        return result
+
     def _extract_potential_names(self, query: str) -> List[str]:
         """
         쿼리에서 잠재적인 인물 이름 추출
@@ -11,6 +11,7 @@ from pgvector.sqlalchemy import Vector # pgvector 타입 인식
 # 모델 메타데이터 임포트 (모든 모델이 로드되어야 함)
 from src.db.session import Base
 from src.models.product import Product
+from src.models.product_embedding import ProductEmbedding
 from src.models.user import User
 from src.config.settings import settings
 
@@ -0,0 +1,51 @@
+"""notify_product_vector_changes
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-16 18:00:00.000000
+
+프로세스 내부 벡터 복제본 동기화용 NOTIFY 트리거
+- product_embeddings INSERT / UPDATE / DELETE 시 product_vectors 채널로 product_id 전송
+- 상품 수정/소프트 삭제는 trg_products_sync_embedding_filters 가 product_embeddings 를 갱신하므로 함께 전달됨
+- NOTIFY 는 커밋 시점에 전달되고 같은 트랜잭션 내 중복 payload 는 한 번만 전달됨
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b8c9d0e1f2'
+down_revision: Union[str, None] = 'f6a7b8c9d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION product_embeddings_notify() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('product_vectors', OLD.product_id::text);
+    ELSE
+        PERFORM pg_notify('product_vectors', NEW.product_id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.execute(NOTIFY_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER trg_product_embeddings_notify "
+        "AFTER INSERT OR UPDATE OR DELETE ON product_embeddings "
+        "FOR EACH ROW EXECUTE FUNCTION product_embeddings_notify()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_product_embeddings_notify ON product_embeddings")
+    op.execute("DROP FUNCTION IF EXISTS product_embeddings_notify()")
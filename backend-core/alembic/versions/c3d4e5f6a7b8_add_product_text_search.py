@@ -0,0 +1,93 @@
+"""add_product_text_search
+
+Revision ID: c3d4e5f6a7b8
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-16 10:00:00.000000
+
+상품 키워드 검색용 인덱스
+- pg_trgm GIN 인덱스: name / description / category 의 ILIKE '%kw%' 검색을 인덱스로 처리
+- search_bigrams (tsvector, generated): 한국어 형태소 분석기 없이 2글자 단위(bigram)로 토큰화
+  name(A) > category(B) > description(C) 가중치, GIN 인덱스로 여러 키워드를 한 번에 검색
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d4e5f6a7b8'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 단어별 bigram + 단어 원형을 'simple' 사전으로 tsvector 변환 (generated column 에서 쓰이므로 IMMUTABLE)
+BIGRAM_FUNCTION = """
+CREATE OR REPLACE FUNCTION korean_bigram_tsvector(doc text) RETURNS tsvector
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT to_tsvector('simple'::regconfig, coalesce(string_agg(token, ' '), ''))
+    FROM (
+        SELECT substr(word, i, 2) AS token
+        FROM regexp_split_to_table(lower(coalesce(doc, '')), '[^0-9a-z가-힣]+') AS word,
+             generate_series(1, greatest(char_length(word) - 1, 1)) AS i
+        WHERE word <> ''
+        UNION ALL
+        SELECT word
+        FROM regexp_split_to_table(lower(coalesce(doc, '')), '[^0-9a-z가-힣]+') AS word
+        WHERE char_length(word) > 2
+    ) tokens
+$$;
+"""
+
+SEARCH_BIGRAMS_EXPR = (
+    "setweight(korean_bigram_tsvector(name), 'A') || "
+    "setweight(korean_bigram_tsvector(category), 'B') || "
+    "setweight(korean_bigram_tsvector(description), 'C')"
+)
+
+TRGM_COLUMNS = ('name', 'description', 'category')
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(BIGRAM_FUNCTION)
+
+    for column in TRGM_COLUMNS:
+        op.create_index(
+            f'ix_product_{column}_trgm',
+            'products',
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        )
+
+    # STORED generated column: 기존 행도 추가 시점에 한 번 계산됨
+    op.add_column(
+        'products',
+        sa.Column(
+            'search_bigrams',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_BIGRAMS_EXPR, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_product_search_bigrams_gin',
+        'products',
+        ['search_bigrams'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_search_bigrams_gin', table_name='products')
+    op.drop_column('products', 'search_bigrams')
+    for column in TRGM_COLUMNS:
+        op.drop_index(f'ix_product_{column}_trgm', table_name='products')
+    op.execute("DROP FUNCTION IF EXISTS korean_bigram_tsvector(text)")
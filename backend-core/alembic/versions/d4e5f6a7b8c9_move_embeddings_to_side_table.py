@@ -0,0 +1,102 @@
+"""move_embeddings_to_side_table
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-16 12:00:00.000000
+
+상품 벡터(BERT 768 + CLIP 512 x 3)를 product_embeddings 테이블로 분리
+- products 행 크기를 줄여 목록/키워드 검색/최신순 정렬 시 벡터 데이터를 읽지 않도록 함
+- HNSW 인덱스는 product_embeddings 에 생성
+- model_version: 임베딩 생성 모델 버전 (모델 교체 시 재생성 대상 식별용)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, None] = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+VECTOR_COLUMNS = {
+    'embedding': 768,
+    'embedding_clip': 512,
+    'embedding_clip_upper': 512,
+    'embedding_clip_lower': 512,
+}
+
+OLD_INDEXES = (
+    'ix_product_embedding_hnsw',
+    'ix_product_embedding_clip_hnsw',
+    'ix_product_embedding_clip_upper_hnsw',
+    'ix_product_embedding_clip_lower_hnsw',
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'product_embeddings',
+        sa.Column('product_id', sa.Integer(), sa.ForeignKey('products.id', ondelete='CASCADE'), primary_key=True),
+        *[sa.Column(name, Vector(dim), nullable=True) for name, dim in VECTOR_COLUMNS.items()],
+        sa.Column('model_version', sa.String(length=100), nullable=False, server_default='v1'),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+
+    # 상/하의 컬럼은 모델에만 있고 마이그레이션이 없던 환경도 있으므로 실제 존재하는 컬럼만 이관
+    existing = {col['name'] for col in sa.inspect(op.get_bind()).get_columns('products')}
+    columns = [name for name in VECTOR_COLUMNS if name in existing]
+    if columns:
+        column_list = ", ".join(columns)
+        has_vector = " OR ".join(f"{name} IS NOT NULL" for name in columns)
+        op.execute(
+            f"INSERT INTO product_embeddings (product_id, {column_list}) "
+            f"SELECT id, {column_list} FROM products WHERE {has_vector}"
+        )
+
+    for index_name in OLD_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+    for name in columns:
+        op.drop_column('products', name)
+
+    for name in VECTOR_COLUMNS:
+        op.create_index(
+            f'ix_product_embeddings_{name}_hnsw',
+            'product_embeddings',
+            [name],
+            unique=False,
+            postgresql_using='hnsw',
+            postgresql_with={'m': 32, 'ef_construction': 128},
+            postgresql_ops={name: 'vector_cosine_ops'},
+        )
+
+
+def downgrade() -> None:
+    for name, dim in VECTOR_COLUMNS.items():
+        op.add_column('products', sa.Column(name, Vector(dim), nullable=True))
+
+    op.execute(
+        "UPDATE products p SET "
+        + ", ".join(f"{name} = e.{name}" for name in VECTOR_COLUMNS)
+        + " FROM product_embeddings e WHERE e.product_id = p.id"
+    )
+
+    for name in VECTOR_COLUMNS:
+        op.drop_index(f'ix_product_embeddings_{name}_hnsw', table_name='product_embeddings')
+    op.drop_table('product_embeddings')
+
+    for name, index_name in zip(VECTOR_COLUMNS, OLD_INDEXES):
+        op.create_index(
+            index_name,
+            'products',
+            [name],
+            unique=False,
+            postgresql_using='hnsw',
+            postgresql_with={'m': 32, 'ef_construction': 128},
+            postgresql_ops={name: 'vector_cosine_ops'},
+            postgresql_where=sa.text('deleted_at IS NULL'),
+        )
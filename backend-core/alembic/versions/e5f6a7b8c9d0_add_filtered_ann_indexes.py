@@ -0,0 +1,121 @@
+"""add_filtered_ann_indexes
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-16 14:00:00.000000
+
+필터 조건이 있는 벡터 검색용 부분 HNSW 인덱스
+- product_embeddings 에 필터 컬럼(gender, category, price, is_listed) 비정규화 (트리거로 products 와 동기화)
+- 성별별(Unisex/NULL 포함) 부분 인덱스: 4개 벡터 컬럼 x Male/Female
+- 카테고리별 부분 인덱스: embedding_clip x ProductCategory
+  -> 필터를 인덱스 조건으로 흡수하여 ef_search 후보가 WHERE 에서 걸러져 결과가 모자라는 문제 방지
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+VECTOR_COLUMNS = ('embedding', 'embedding_clip', 'embedding_clip_upper', 'embedding_clip_lower')
+GENDERS = ('Male', 'Female')
+CATEGORIES = ('Tops', 'Bottoms', 'Outerwear', 'Dresses', 'Shoes', 'Accessories')
+
+SYNC_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION product_embeddings_fill_filters() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    SELECT p.gender, p.category, p.price, (p.is_active AND p.deleted_at IS NULL)
+      INTO NEW.gender, NEW.category, NEW.price, NEW.is_listed
+      FROM products p WHERE p.id = NEW.product_id;
+    RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION products_sync_embedding_filters() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE product_embeddings
+       SET gender = NEW.gender,
+           category = NEW.category,
+           price = NEW.price,
+           is_listed = (NEW.is_active AND NEW.deleted_at IS NULL)
+     WHERE product_id = NEW.id;
+    RETURN NULL;
+END;
+$$;
+"""
+
+
+def _gender_predicate(gender: str) -> str:
+    return f"is_listed AND (gender = '{gender}' OR gender = 'Unisex' OR gender IS NULL)"
+
+
+def upgrade() -> None:
+    op.add_column('product_embeddings', sa.Column('gender', sa.String(length=20), nullable=True))
+    op.add_column('product_embeddings', sa.Column('category', sa.String(length=100), nullable=True))
+    op.add_column('product_embeddings', sa.Column('price', sa.Integer(), nullable=True))
+    op.add_column('product_embeddings', sa.Column('is_listed', sa.Boolean(), nullable=False, server_default=sa.true()))
+
+    op.execute(
+        "UPDATE product_embeddings e SET gender = p.gender, category = p.category, price = p.price, "
+        "is_listed = (p.is_active AND p.deleted_at IS NULL) FROM products p WHERE p.id = e.product_id"
+    )
+
+    op.execute(SYNC_FUNCTIONS)
+    op.execute(
+        "CREATE TRIGGER trg_product_embeddings_fill_filters BEFORE INSERT ON product_embeddings "
+        "FOR EACH ROW EXECUTE FUNCTION product_embeddings_fill_filters()"
+    )
+    op.execute(
+        "CREATE TRIGGER trg_products_sync_embedding_filters "
+        "AFTER UPDATE OF gender, category, price, is_active, deleted_at ON products "
+        "FOR EACH ROW EXECUTE FUNCTION products_sync_embedding_filters()"
+    )
+
+    for column in VECTOR_COLUMNS:
+        for gender in GENDERS:
+            op.create_index(
+                f'ix_product_embeddings_{column}_{gender.lower()}_hnsw',
+                'product_embeddings',
+                [column],
+                unique=False,
+                postgresql_using='hnsw',
+                postgresql_with={'m': 16, 'ef_construction': 64},
+                postgresql_ops={column: 'vector_cosine_ops'},
+                postgresql_where=sa.text(_gender_predicate(gender)),
+            )
+
+    for category in CATEGORIES:
+        op.create_index(
+            f'ix_product_embeddings_embedding_clip_{category.lower()}_hnsw',
+            'product_embeddings',
+            ['embedding_clip'],
+            unique=False,
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding_clip': 'vector_cosine_ops'},
+            postgresql_where=sa.text(f"is_listed AND category = '{category}'"),
+        )
+
+
+def downgrade() -> None:
+    for category in CATEGORIES:
+        op.drop_index(f'ix_product_embeddings_embedding_clip_{category.lower()}_hnsw', table_name='product_embeddings')
+    for column in VECTOR_COLUMNS:
+        for gender in GENDERS:
+            op.drop_index(f'ix_product_embeddings_{column}_{gender.lower()}_hnsw', table_name='product_embeddings')
+
+    op.execute("DROP TRIGGER IF EXISTS trg_products_sync_embedding_filters ON products")
+    op.execute("DROP TRIGGER IF EXISTS trg_product_embeddings_fill_filters ON product_embeddings")
+    op.execute("DROP FUNCTION IF EXISTS products_sync_embedding_filters()")
+    op.execute("DROP FUNCTION IF EXISTS product_embeddings_fill_filters()")
+
+    for column in ('is_listed', 'price', 'category', 'gender'):
+        op.drop_column('product_embeddings', column)
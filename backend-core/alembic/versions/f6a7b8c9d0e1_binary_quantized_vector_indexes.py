@@ -0,0 +1,84 @@
+"""binary_quantized_vector_indexes
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-16 16:00:00.000000
+
+벡터 저장/인덱스 방식 변경 (pgvector 0.7 이상 필요)
+- 기존 벡터 L2 정규화 -> 내적(<#>) = 코사인 순위
+- full-precision HNSW(vector_cosine_ops) 인덱스를 binary_quantize 비트 HNSW(bit_hamming_ops)로 교체
+  (768차원 기준 3KB -> 96B, 인덱스 메모리 약 1/32)
+- 검색은 해밍 거리로 1차 후보(VECTOR_RERANK_CANDIDATES개)를 뽑고 원본 벡터 내적으로 재정렬
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+VECTOR_DIMS = {
+    'embedding': 768,
+    'embedding_clip': 512,
+    'embedding_clip_upper': 512,
+    'embedding_clip_lower': 512,
+}
+GENDERS = ('Male', 'Female')
+CATEGORIES = ('Tops', 'Bottoms', 'Outerwear', 'Dresses', 'Shoes', 'Accessories')
+
+
+def _index_specs():
+    """(기존 인덱스명, 컬럼, WHERE, m, ef_construction)"""
+    for column in VECTOR_DIMS:
+        yield f'ix_product_embeddings_{column}_hnsw', column, None, 32, 128
+    for column in VECTOR_DIMS:
+        for gender in GENDERS:
+            yield (
+                f'ix_product_embeddings_{column}_{gender.lower()}_hnsw', column,
+                f"is_listed AND (gender = '{gender}' OR gender = 'Unisex' OR gender IS NULL)", 16, 64
+            )
+    for category in CATEGORIES:
+        yield (
+            f'ix_product_embeddings_embedding_clip_{category.lower()}_hnsw', 'embedding_clip',
+            f"is_listed AND category = '{category}'", 16, 64
+        )
+
+
+def _where(predicate):
+    return f" WHERE {predicate}" if predicate else ""
+
+
+def upgrade() -> None:
+    op.execute("ALTER EXTENSION vector UPDATE")
+
+    op.execute(
+        "UPDATE product_embeddings SET "
+        + ", ".join(f"{column} = l2_normalize({column})" for column in VECTOR_DIMS)
+    )
+
+    for name, column, predicate, m, ef_construction in _index_specs():
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+        bq_name = name[:-len('_hnsw')] + '_bq_hnsw'
+        op.execute(
+            f"CREATE INDEX {bq_name} ON product_embeddings USING hnsw "
+            f"((binary_quantize({column})::bit({VECTOR_DIMS[column]})) bit_hamming_ops) "
+            f"WITH (m = {m}, ef_construction = {ef_construction}){_where(predicate)}"
+        )
+
+
+def downgrade() -> None:
+    # 정규화된 벡터는 되돌리지 않음 (코사인 거리에는 영향 없음)
+    for name, column, predicate, m, ef_construction in _index_specs():
+        bq_name = name[:-len('_hnsw')] + '_bq_hnsw'
+        op.execute(f"DROP INDEX IF EXISTS {bq_name}")
+        op.execute(
+            f"CREATE INDEX {name} ON product_embeddings USING hnsw "
+            f"({column} vector_cosine_ops) "
+            f"WITH (m = {m}, ef_construction = {ef_construction}){_where(predicate)}"
+        )
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.db.session import AsyncSessionLocal
 from src.core.security import settings
 from src.models.user import User
+from src.services.ai_client import AIServiceClient, ai_client
 from src.schemas.token import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/v1/auth/login")
@@ -15,6 +16,10 @@ async def get_db() -> Generator:
     async with AsyncSessionLocal() as session:
         yield session
 
+def get_ai_client() -> AIServiceClient:
+    """애플리케이션 공유 AI 서비스 클라이언트 (main.lifespan에서 생성/종료)"""
+    return ai_client
+
 async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme)
@@ -8,18 +8,16 @@ import re
 
 from src.schemas.email import EmailBroadcastRequest, EmailStatusResponse 
 from src.core.celery_app import broadcast_email_task 
-from src.api.deps import get_db, get_current_user
+from src.api.deps import get_db, get_current_user, get_ai_client
 from src.schemas.admin import DashboardStatsResponse, SalesData
 from src.models.user import User
 from src.schemas.product import ProductCreate
 from src.crud.crud_product import crud_product
+from src.services.ai_client import AIServiceClient
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# AI Service URL
-AI_SERVICE_URL = "http://ai-service-api:8000"
-
 def check_superuser(current_user: User = Depends(get_current_user)) -> User:
     if not current_user.is_superuser:
         raise HTTPException(
@@ -119,6 +117,7 @@ async def upload_product_image(
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(check_superuser),
+    ai: AIServiceClient = Depends(get_ai_client),
 ) -> Any:
     """
     [관리자] 이미지 업로드 -> AI 분석 -> DB 자동 등록
@@ -128,20 +127,19 @@ async def upload_product_image(
 
     ai_response = None
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            await file.seek(0)
-            files = {"file": (file.filename, await file.read(), file.content_type)}
-            
-            logger.info(f"📤 Sending image to AI Service: {file.filename}")
-            response = await client.post(f"{AI_SERVICE_URL}/api/v1/analyze-image", files=files)
-            
-            if response.status_code != 200:
-                logger.error(f"❌ AI Service Error: {response.text}")
-                # AI가 죽어있어도 프로세스는 계속 진행하기 위해 더미 데이터 생성 가능하지만
-                # 여기서는 에러를 명시하고 중단합니다.
-                raise HTTPException(status_code=502, detail="AI 분석 서비스 응답 오류")
-            
-            ai_response = response.json()
+        await file.seek(0)
+        files = {"file": (file.filename, await file.read(), file.content_type)}
+        
+        logger.info(f"📤 Sending image to AI Service: {file.filename}")
+        response = await ai.post("/analyze-image", files=files)
+        
+        if response.status_code != 200:
+            logger.error(f"❌ AI Service Error: {response.text}")
+            # AI가 죽어있어도 프로세스는 계속 진행하기 위해 더미 데이터 생성 가능하지만
+            # 여기서는 에러를 명시하고 중단합니다.
+            raise HTTPException(status_code=502, detail="AI 분석 서비스 응답 오류")
+        
+        ai_response = response.json()
             
     except httpx.RequestError as exc:
         logger.error(f"❌ AI Connection Failed: {exc}")
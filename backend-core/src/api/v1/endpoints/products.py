@@ -1,18 +1,17 @@
 import logging
-import csv
-import io
 import shutil
 import os
 import uuid
 from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
-import httpx
 
 # 의존성 및 모듈 임포트
 from src.api import deps
 from src.crud.crud_product import crud_product
-from src.config.settings import settings
+from src.services.ai_client import AIServiceClient
+from src.services.product_healing import enqueue_heal
+from src.services.product_import import sanitize_string, start_import, get_import_status
 from src.schemas.user import UserResponse as User
 from src.schemas.product import (
     ProductResponse, 
@@ -24,68 +23,6 @@ from src.schemas.product import (
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# ------------------------------------------------------------------
-# [Helper] 문자열 정리
-# ------------------------------------------------------------------
-def sanitize_string(value: Any) -> Any:
-    if isinstance(value, str):
-        return value.replace("\x00", "").strip()
-    return value
-
-# ------------------------------------------------------------------
-# [Helper] Self-Healing
-# ------------------------------------------------------------------
-async def _heal_product_embedding(db: AsyncSession, product: Any) -> Any:
-    """상품 데이터(임베딩, 설명) 누락 시 AI 서비스로 복구"""
-    AI_SERVICE_API_URL = settings.AI_SERVICE_API_URL
-    
-    is_broken = (
-        product.embedding is None or 
-        (isinstance(product.embedding, list) and len(product.embedding) == 0) or
-        product.description == "AI 분석 실패" or 
-        not product.description
-    )
-    
-    if not is_broken:
-        return product 
-
-    logger.warning(f"🚑 [Self-Healing] Product ID {product.id} data missing. Attempting recovery...")
-
-    new_description = product.description
-    # 1. 텍스트 생성 복구
-    if not product.description or product.description == "AI 분석 실패":
-        try:
-            async with httpx.AsyncClient(timeout=20.0) as client:
-                prompt = f"상품명: {product.name}, 카테고리: {product.category}. 매력적인 쇼핑몰 상세 설명을 5문장 작성해줘."
-                res = await client.post(f"{AI_SERVICE_API_URL}/llm-generate-response", json={"prompt": prompt})
-                if res.status_code == 200:
-                    new_description = res.json().get("answer", product.name)
-        except Exception as e:
-            logger.error(f"Heal Description Failed: {e}")
-
-    # 2. 임베딩 복구
-    new_vector = product.embedding
-    try:
-        text_to_embed = f"{product.name} {product.category} {new_description}"
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            res = await client.post(f"{AI_SERVICE_API_URL}/embed-text", json={"text": text_to_embed})
-            if res.status_code == 200:
-                new_vector = res.json().get("vector", [])
-    except Exception as e:
-        logger.error(f"Heal Embedding Failed: {e}")
-
-    # 3. DB 업데이트
-    if new_vector and len(new_vector) > 0:
-        update_data = {"embedding": new_vector}
-        if new_description != product.description:
-            update_data["description"] = new_description
-            
-        product = await crud_product.update(db, db_obj=product, obj_in=update_data)
-        logger.info(f"✅ Product {product.id} healed.")
-    
-    return product
-
-
 # =========================================================
 # 1️⃣ [API] 이미지 자동 분석 업로드 (단일) - 경로 수정됨! 🚨
 # =========================================================
@@ -94,33 +31,29 @@ async def upload_product_image_auto(
     file: UploadFile = File(...),
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
+    ai: AIServiceClient = Depends(deps.get_ai_client),
 ):
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
 
-    AI_SERVICE_API_URL = settings.AI_SERVICE_API_URL
     ai_analyzed_data = {}
     
     logger.info(f"Processing Image: {file.filename}")
 
     # [Step A] AI 서비스로 이미지 전송
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        try:
-            await file.seek(0)
-            file_content = await file.read()
-            files = {"file": (file.filename, file_content, file.content_type)}
-            
-            response = await client.post(
-                f"{AI_SERVICE_API_URL}/analyze-image",
-                files=files
-            )
-            
-            if response.status_code == 200:
-                ai_analyzed_data = response.json()
-            else:
-                logger.error(f"AI Service Error ({response.status_code}): {response.text}")
-        except Exception as e:
-            logger.error(f"AI Connection Error: {e}")
+    await file.seek(0)
+    file_content = await file.read()
+    try:
+        files = {"file": (file.filename, file_content, file.content_type)}
+        
+        response = await ai.post("/analyze-image", files=files)
+        
+        if response.status_code == 200:
+            ai_analyzed_data = response.json()
+        else:
+            logger.error(f"AI Service Error ({response.status_code}): {response.text}")
+    except Exception as e:
+        logger.error(f"AI Connection Error: {e}")
 
     # [Step B] 로컬 저장 (경로 수정됨)
     try:
@@ -187,7 +120,7 @@ async def upload_product_image_auto(
 
     try:
         new_product = await crud_product.create(db, obj_in=product_in_data)
-        new_product = await _heal_product_embedding(db, new_product)
+        await enqueue_heal(new_product)
         logger.info(f"✅ Product created with ID {new_product.id} (BERT + CLIP vectors saved)")
         return new_product
     except Exception as e:
@@ -198,107 +131,38 @@ async def upload_product_image_auto(
 # =========================================================
 # 2️⃣ [Mode 2] CSV 대량 업로드
 # =========================================================
-@router.post("/upload/csv")
+@router.post("/upload/csv", status_code=202)
 async def upload_products_csv(
     file: UploadFile = File(...),
-    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
+    ai: AIServiceClient = Depends(deps.get_ai_client),
 ):
+    """
+    CSV 대량 등록 작업 시작 (백그라운드 처리)
+    - 스트리밍 파싱 -> 청크별 배치 임베딩/이미지 CLIP 벡터 -> 다중 행 INSERT
+    - 진행 상황은 GET /upload/csv/{job_id} 로 조회
+    """
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
 
-    content = await file.read()
-    try:
-        decoded_content = content.decode("utf-8")
-    except UnicodeDecodeError:
-        try:
-            decoded_content = content.decode("cp949")
-        except UnicodeDecodeError:
-            decoded_content = content.decode("euc-kr", errors="ignore")
-
-    csv_reader = csv.DictReader(io.StringIO(decoded_content))
-    results = {"success": 0, "failed": 0, "errors": []}
-    AI_SERVICE_API_URL = settings.AI_SERVICE_API_URL
-
-    for row in csv_reader:
-        try:
-            name = row.get("name") or row.get("상품명")
-            if not name: continue 
-
-            category = row.get("category") or row.get("카테고리") or "Uncategorized"
-            description = row.get("description") or row.get("설명") or ""
-            gender = row.get("gender") or row.get("성별") or "Unisex"
-            
-            price_raw = row.get("price") or row.get("가격") or "0"
-            try:
-                price = int(str(price_raw).replace(",", "").strip())
-            except:
-                price = 0
-
-            stock_raw = row.get("stock_quantity") or row.get("재고") or "100"
-            try:
-                stock = int(str(stock_raw).replace(",", "").strip())
-            except:
-                stock = 100
-            
-            image_url = row.get("image_url") or row.get("이미지") or "https://placehold.co/400x500?text=No+Image"
+    job = await start_import(file, ai)
+    logger.info(f"🚀 CSV import job {job['job_id']} started ({file.filename})")
+    return job
 
-            # BERT 벡터 생성
-            vector = []
-            text_for_vector = f"[{gender}] {name} {category} {description}"
-            
-            async with httpx.AsyncClient(timeout=3.0) as client:
-                try:
-                    res = await client.post(
-                        f"{AI_SERVICE_API_URL}/embed-text", 
-                        json={"text": text_for_vector}
-                    )
-                    if res.status_code == 200:
-                        vector = res.json().get("vector", [])
-                except Exception:
-                    pass 
-
-            # CLIP 벡터 생성
-            vector_clip = []
-            if image_url and not image_url.startswith("https://placehold"):
-                try:
-                    async with httpx.AsyncClient(timeout=10.0) as client:
-                        img_response = await client.get(image_url)
-                        if img_response.status_code == 200:
-                            import base64
-                            image_b64 = base64.b64encode(img_response.content).decode("utf-8")
-                            
-                            clip_res = await client.post(
-                                f"{AI_SERVICE_API_URL}/generate-clip-vector",
-                                json={"image_b64": image_b64}
-                            )
-                            if clip_res.status_code == 200:
-                                vector_clip = clip_res.json().get("vector", [])
-                                logger.info(f"✅ CLIP vector generated for {name}")
-                except Exception as e:
-                    logger.warning(f"⚠️ CLIP vector generation failed for {name}: {e}")
-
-            product_in = {
-                "name": sanitize_string(name),
-                "category": sanitize_string(category),
-                "description": sanitize_string(description),
-                "price": price,
-                "stock_quantity": stock,
-                "image_url": image_url,
-                "embedding": vector,              
-                "embedding_clip": vector_clip,    
-                "gender": gender,
-                "is_active": True
-            }
-            
-            await crud_product.create(db, obj_in=product_in)
-            results["success"] += 1
 
-        except Exception as e:
-            results["failed"] += 1
-            results["errors"].append(f"{name}: {str(e)}")
+@router.get("/upload/csv/{job_id}")
+async def get_products_csv_status(
+    job_id: str,
+    current_user: User = Depends(deps.get_current_user),
+):
+    """CSV 대량 등록 진행 상황 (status: queued | running | completed | failed)"""
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
 
-    return results
+    job = await get_import_status(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
 
 
 # =========================================================
@@ -311,6 +175,7 @@ async def create_product(
     db: AsyncSession = Depends(deps.get_db),
     product_in: ProductCreate,
     current_user: User = Depends(deps.get_current_user),
+    ai: AIServiceClient = Depends(deps.get_ai_client),
 ) -> Any:
     """단일 상품 직접 생성"""
     if not current_user.is_superuser:
@@ -323,16 +188,11 @@ async def create_product(
     # BERT 임베딩 생성
     embedding_vector = []
     text_to_embed = f"상품명: {product_data['name']} | 카테고리: {product_data.get('category', '')} | 설명: {product_data.get('description', '')}"
-    AI_SERVICE_API_URL = settings.AI_SERVICE_API_URL
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                f"{AI_SERVICE_API_URL}/embed-text",
-                json={"text": text_to_embed}
-            )
-            if response.status_code == 200:
-                embedding_vector = response.json().get("vector", [])
+        response = await ai.post("/embed-text", json={"text": text_to_embed})
+        if response.status_code == 200:
+            embedding_vector = response.json().get("vector", [])
     except Exception as e:
         logger.error(f"❌ Failed to generate BERT embedding: {e}")
 
@@ -351,7 +211,8 @@ async def read_product(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    product = await _heal_product_embedding(db, product)
+    # 누락 데이터는 백그라운드 복구 예약만 하고 현재 데이터로 즉시 응답
+    await enqueue_heal(product)
     return product
 
 @router.post("/{product_id}/llm-query", response_model=Dict[str, str])
@@ -360,12 +221,13 @@ async def llm_query_product(
     query_body: LLMQueryBody,
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
+    ai: AIServiceClient = Depends(deps.get_ai_client),
 ) -> Dict[str, str]:
     product = await crud_product.get(db, product_id=product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    product = await _heal_product_embedding(db, product)
+    await enqueue_heal(product)
 
     context = (
         f"상품명: {product.name}, 카테고리: {product.category}, 가격: {product.price}원, "
@@ -375,20 +237,15 @@ async def llm_query_product(
         f"사용자 질문: {query_body.question}\n"
         f"다음 상품 정보를 바탕으로 쇼핑몰 전문가처럼 친절하게 답변하세요.\n정보: {context}"
     )
-    AI_SERVICE_API_URL = settings.AI_SERVICE_API_URL
-
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            ai_response = await client.post(
-                f"{AI_SERVICE_API_URL}/llm-generate-response", 
-                json={"prompt": prompt}
-            )
-            ai_response.raise_for_status()
-            ai_data = ai_response.json()
-            return {"answer": ai_data.get("answer", "답변을 생성하지 못했습니다.")}
-        except Exception as e:
-            logger.error(f"LLM Query failed: {e}")
-            raise HTTPException(status_code=503, detail="AI 서비스 통신 오류")
+
+    try:
+        ai_response = await ai.post("/llm-generate-response", json={"prompt": prompt})
+        ai_response.raise_for_status()
+        ai_data = ai_response.json()
+        return {"answer": ai_data.get("answer", "답변을 생성하지 못했습니다.")}
+    except Exception as e:
+        logger.error(f"LLM Query failed: {e}")
+        raise HTTPException(status_code=503, detail="AI 서비스 통신 오류")
 
 # --- AI Coordination ---
 @router.get("/ai-coordination/{product_id}", response_model=CoordinationResponse)
@@ -396,14 +253,14 @@ async def get_ai_coordination_products(
     product_id: int, 
     db: AsyncSession = Depends(deps.get_db),
     current_user: Any = Depends(deps.get_current_user),
+    ai: AIServiceClient = Depends(deps.get_ai_client),
 ) -> CoordinationResponse:
     
     product = await crud_product.get(db, product_id=product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    product = await _heal_product_embedding(db, product)
-    
+    await enqueue_heal(product)
     
     has_embedding = (
         product.embedding is not None and 
@@ -418,37 +275,28 @@ async def get_ai_coordination_products(
         f"상품명 '{product.name}', 성별 '{product.gender}', 카테고리 '{product.category}'의 코디에 적합한 "
         f"다른 카테고리(예: 상의면 하의)의 검색 키워드 3개를 한국어로 쉼표로 구분해줘."
     )
-    AI_SERVICE_API_URL = settings.AI_SERVICE_API_URL
     coordination_keywords = ["추천", "베이직", "데일리"]
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            llm_res = await client.post(
-                f"{AI_SERVICE_API_URL}/llm-generate-response", 
-                json={"prompt": coordination_prompt}
-            )
-            if llm_res.status_code == 200:
-                data = llm_res.json()
-                answer_text = data.get("answer", "")
-                extracted = [k.strip() for k in answer_text.split(',') if k.strip()]
-                if extracted:
-                    coordination_keywords = extracted
-        except Exception as e:
-            logger.error(f"LLM Keyword Generation failed: {e}")
+    try:
+        llm_res = await ai.post("/llm-generate-response", json={"prompt": coordination_prompt}, timeout=10.0)
+        if llm_res.status_code == 200:
+            data = llm_res.json()
+            answer_text = data.get("answer", "")
+            extracted = [k.strip() for k in answer_text.split(',') if k.strip()]
+            if extracted:
+                coordination_keywords = extracted
+    except Exception as e:
+        logger.error(f"LLM Keyword Generation failed: {e}")
 
     embedding_text = f"{product.name} 코디 {' '.join(coordination_keywords)}"
     coordination_vector = list(product.embedding) if product.embedding is not None else []
     
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            vector_res = await client.post(
-                f"{AI_SERVICE_API_URL}/embed-text", 
-                json={"text": embedding_text}
-            )
-            if vector_res.status_code == 200:
-                coordination_vector = vector_res.json().get("vector", coordination_vector)
-        except Exception as e:
-            logger.error(f"Embedding API failed: {e}")
+    try:
+        vector_res = await ai.post("/embed-text", json={"text": embedding_text})
+        if vector_res.status_code == 200:
+            coordination_vector = vector_res.json().get("vector", coordination_vector)
+    except Exception as e:
+        logger.error(f"Embedding API failed: {e}")
 
     coordination_products = await crud_product.search_by_vector(
         db, 
@@ -474,9 +322,10 @@ async def get_related_by_price(
     product_id: int, 
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
+    ai: AIServiceClient = Depends(deps.get_ai_client),
 ) -> CoordinationResponse:
     product = await crud_product.get(db, product_id=product_id)
-    product = await _heal_product_embedding(db, product) 
+    await enqueue_heal(product)
     
     if not product or not product.embedding:
         raise HTTPException(status_code=404, detail="AI Analysis Required")
@@ -509,41 +358,33 @@ async def get_related_by_color(
     product_id: int, 
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
+    ai: AIServiceClient = Depends(deps.get_ai_client),
 ) -> CoordinationResponse:
     product = await crud_product.get(db, product_id=product_id)
-    product = await _heal_product_embedding(db, product)
+    await enqueue_heal(product)
     
     if not product or not product.embedding:
         raise HTTPException(status_code=404, detail="AI Analysis Required")
     
     color_prompt = f"상품 '{product.name}'의 설명에서 가장 지배적인 색상 키워드 1개만 (예: 블랙, 네이비) 답변하시오."
-    AI_SERVICE_API_URL = settings.AI_SERVICE_API_URL
     target_color = "유사색상"
     
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        try:
-            llm_res = await client.post(
-                f"{AI_SERVICE_API_URL}/llm-generate-response", 
-                json={"prompt": color_prompt}
-            )
-            if llm_res.status_code == 200:
-                target_color = llm_res.json().get("answer", "유사색상")
-        except Exception:
-            pass
+    try:
+        llm_res = await ai.post("/llm-generate-response", json={"prompt": color_prompt}, timeout=5.0)
+        if llm_res.status_code == 200:
+            target_color = llm_res.json().get("answer", "유사색상")
+    except Exception:
+        pass
 
     embedding_text = f"{product.name} 디자인 {target_color} 색상"
     color_vector = product.embedding 
     
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        try:
-            vector_res = await client.post(
-                f"{AI_SERVICE_API_URL}/embed-text", 
-                json={"text": embedding_text}
-            )
-            if vector_res.status_code == 200:
-                color_vector = vector_res.json().get("vector", [])
-        except Exception:
-            pass
+    try:
+        vector_res = await ai.post("/embed-text", json={"text": embedding_text}, timeout=5.0)
+        if vector_res.status_code == 200:
+            color_vector = vector_res.json().get("vector", [])
+    except Exception:
+        pass
     
     related_products = await crud_product.search_by_vector(
         db, 
@@ -562,42 +403,34 @@ async def get_related_by_brand(
     product_id: int, 
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
+    ai: AIServiceClient = Depends(deps.get_ai_client),
 ) -> CoordinationResponse:
     product = await crud_product.get(db, product_id=product_id)
-    product = await _heal_product_embedding(db, product)
+    await enqueue_heal(product)
     
     if not product or not product.embedding:
         raise HTTPException(status_code=404, detail="AI Analysis Required")
     
     style_prompt = f"'{product.name}' 상품의 스타일(예: 미니멀리즘, 스트리트) 키워드 3개만 쉼표로 구분하여 답변하시오."
-    AI_SERVICE_API_URL = settings.AI_SERVICE_API_URL
     style_keywords = ["유사 스타일"]
     
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        try:
-            llm_res = await client.post(
-                f"{AI_SERVICE_API_URL}/llm-generate-response", 
-                json={"prompt": style_prompt}
-            )
-            if llm_res.status_code == 200:
-                text = llm_res.json().get("answer", "")
-                style_keywords = [k.strip() for k in text.split(',') if k.strip()]
-        except Exception:
-            pass
+    try:
+        llm_res = await ai.post("/llm-generate-response", json={"prompt": style_prompt}, timeout=5.0)
+        if llm_res.status_code == 200:
+            text = llm_res.json().get("answer", "")
+            style_keywords = [k.strip() for k in text.split(',') if k.strip()]
+    except Exception:
+        pass
 
     embedding_text = f"다른 브랜드 {product.category} {', '.join(style_keywords)}"
     brand_vector = product.embedding 
     
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        try:
-            vector_res = await client.post(
-                f"{AI_SERVICE_API_URL}/embed-text", 
-                json={"text": embedding_text}
-            )
-            if vector_res.status_code == 200:
-                brand_vector = vector_res.json().get("vector", [])
-        except Exception:
-            pass
+    try:
+        vector_res = await ai.post("/embed-text", json={"text": embedding_text}, timeout=5.0)
+        if vector_res.status_code == 200:
+            brand_vector = vector_res.json().get("vector", [])
+    except Exception:
+        pass
         
     related_products = await crud_product.search_by_vector(
         db, 
@@ -1,8 +1,7 @@
 import logging
 import base64
-import asyncio
 import re
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
 import httpx
@@ -10,13 +9,18 @@ from pydantic import BaseModel, ValidationError
 
 from src.api import deps
 from src.crud.crud_product import crud_product
+from src.db.session import async_session_maker
 from src.schemas.product import ProductResponse
-from src.config.settings import settings
+from src.services.ai_client import AIServiceClient
+from src.services.search_cache import search_cache
 from src.constants import ProductCategory
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# AI 서비스 장애로 키워드 검색만 수행한 결과는 캐시하지 않음 (복구 후 바로 정상 결과 제공)
+UNCACHED_SEARCH_PATHS = {"KEYWORD_FALLBACK"}
+
 # ------------------------------------------------------------------
 # DTO Definitions
 # ------------------------------------------------------------------
@@ -29,7 +33,8 @@ class ClipSearchRequest(BaseModel):
     image_b64: str
     limit: int = 12
     query: Optional[str] = None  # 원본 검색어 (성별 추출용)
-    target: str = "full"  # "full", "upper", "lower"
+    target: str = "full"  # "full", "upper", "lower", "outfit"(전신+상의+하의 동시)
+    weights: Optional[Dict[str, float]] = None  # outfit 영역별 가중치 {"full": 1.0, "upper": 1.0, "lower": 1.0}
 
 # ------------------------------------------------------------------
 # Helper Functions
@@ -138,12 +143,13 @@ def map_product_to_response(product) -> Optional[ProductResponse]:
 async def search_by_clip_image(
     request: ClipSearchRequest,
     db: AsyncSession = Depends(deps.get_db),
+    ai: AIServiceClient = Depends(deps.get_ai_client),
 ):
     """
     이미지 기반 상품 검색 (CLIP Vector)
     - 후보 이미지 클릭 시 호출
     - 이미지 → CLIP 벡터 → 유사 상품 검색
-    - target: "full"(전체), "upper"(상의), "lower"(하의)
+    - target: "full"(전체), "upper"(상의), "lower"(하의), "outfit"(전신/상의/하의를 한 쿼리로 점수화)
     """
     logger.info(f"🖼️ CLIP Image Search Request (limit: {request.limit}, query: {request.query}, target: {request.target})")
     
@@ -165,51 +171,63 @@ async def search_by_clip_image(
         # 하의라고 판단되면 Bottoms 검색
         target_categories = [ProductCategory.BOTTOMS.value] 
     
-    AI_SERVICE_API_URL = settings.AI_SERVICE_API_URL.rstrip("/")
-    
     try:
-        # 2. AI 서비스에서 CLIP 벡터 생성 (Fashion CLIP or Standard CLIP)
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            clip_res = await client.post(
-                f"{AI_SERVICE_API_URL}/generate-fashion-clip-vector",
-                json={
-                    "image_b64": request.image_b64,
-                    "target": request.target  # 영역 지정
-                }
-            )
-            
-            if clip_res.status_code != 200:
-                # Fallback: 기존 CLIP 엔드포인트
-                logger.warning("⚠️ Fashion CLIP endpoint failed, falling back to standard CLIP")
-                clip_res = await client.post(
-                    f"{AI_SERVICE_API_URL}/generate-clip-vector",
-                    json={"image_b64": request.image_b64}
-                )
-            
+        # 2. AI 서비스에서 CLIP 벡터 생성
+        #    전신/상의/하의 벡터를 한 번에 받음 (YOLO 1회, 결과는 AI 서비스에서 캐시)
+        clip_res = await ai.post("/generate-fashion-clip-vectors", json={"image_b64": request.image_b64})
+        
+        if clip_res.status_code == 200:
+            data = clip_res.json()
+            region_vectors = {region: data.get(region, []) for region in ("full", "upper", "lower")}
+        else:
+            # Fallback: 기존 CLIP 엔드포인트 (전신 벡터만)
+            logger.warning("⚠️ Fashion CLIP endpoint failed, falling back to standard CLIP")
+            clip_res = await ai.post("/generate-clip-vector", json={"image_b64": request.image_b64})
             if clip_res.status_code != 200:
                 raise HTTPException(status_code=500, detail="CLIP 벡터 생성 실패")
-            
-            clip_data = clip_res.json()
-            clip_vector = clip_data.get("vector", [])
-            
-            if not clip_vector or len(clip_vector) != 512:
-                raise HTTPException(status_code=500, detail="유효하지 않은 CLIP 벡터")
+            region_vectors = {"full": clip_res.json().get("vector", [])}
+        
+        full_vector = region_vectors.get("full") or []
+        if len(full_vector) != 512:
+            raise HTTPException(status_code=500, detail="유효하지 않은 CLIP 벡터")
         
-        logger.info(f"✅ CLIP vector generated: {len(clip_vector)} dims (target: {request.target})")
+        # 3. 검색할 영역 선택
+        if request.target == "outfit":
+            vectors = region_vectors
+            categories = None
+        elif request.target in ("upper", "lower") and region_vectors.get(request.target):
+            vectors = {request.target: region_vectors[request.target]}
+            categories = None
+        else:
+            # 영역 벡터가 없으면 전신 벡터를 해당 카테고리로 제한해 검색
+            vectors = {"full": full_vector}
+            categories = {"full": target_categories}
         
-        # 3. CLIP 벡터로 상품 검색 (성별 필터 적용)
-        results = await crud_product.search_by_clip_vector(
+        logger.info(f"✅ CLIP vectors generated: regions={list(vectors)} (target: {request.target})")
+        
+        # 4. 영역별 CLIP 벡터로 상품 검색 (단일 쿼리, 성별 필터 적용)
+        results = await crud_product.search_outfit(
             db,
-            clip_vector=clip_vector,
+            vectors=vectors,
             limit=request.limit,
-            filter_gender=target_gender,
-            target=request.target,
-            include_category=target_categories
+            weights=request.weights,
+            categories=categories,
+            filter_gender=target_gender
         )
         
+        # 상/하의 영역 벡터가 없는 상품만 있는 경우 전신 벡터로 재검색
+        if not results and request.target in ("upper", "lower"):
+            results = await crud_product.search_by_clip_vector(
+                db,
+                clip_vector=full_vector,
+                limit=request.limit,
+                filter_gender=target_gender,
+                include_category=target_categories
+            )
+        
         logger.info(f"✅ CLIP search found {len(results)} products (gender filter: {target_gender})")
         
-        # 4. Response 구성 (with similarity)
+        # 5. Response 구성 (with similarity)
         product_responses = []
         for p in results:
             response = map_product_to_response(p)
@@ -218,7 +236,7 @@ async def search_by_clip_image(
         
         return {
             "status": "SUCCESS",
-            "search_type": "CLIP_IMAGE_SIMILARITY",
+            "search_type": "CLIP_OUTFIT_SIMILARITY" if request.target == "outfit" else "CLIP_IMAGE_SIMILARITY",
             "products": product_responses
         }
         
@@ -230,25 +248,20 @@ async def search_by_clip_image(
 
 
 @router.post("/analyze-image")
-async def analyze_image_proxy(request: ImageAnalysisRequest):
+async def analyze_image_proxy(
+    request: ImageAnalysisRequest,
+    ai: AIServiceClient = Depends(deps.get_ai_client),
+):
     """개별 이미지 분석 프록시 (후보 이미지 상세 분석)"""
-    AI_SERVICE_API_URL = settings.AI_SERVICE_API_URL.rstrip("/")
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            target_url = f"{AI_SERVICE_API_URL}/analyze-image-detail"
-            # URL 경로 보정
-            if "/api/v1" not in AI_SERVICE_API_URL and "/api/v1" not in target_url:
-                 # AI Service 구조에 따라 유동적일 수 있음, 여기선 안전하게 기본 경로 사용
-                 pass 
-
-            logger.info(f"📤 Calling AI Service: {target_url}")
-
-            response = await client.post(
-                target_url,
-                json={"image_b64": request.image_b64, "query": request.query}
-            )
-            response.raise_for_status()
-            return response.json()
+        logger.info(f"📤 Calling AI Service: {ai.base_url}/analyze-image-detail")
+
+        response = await ai.post(
+            "/analyze-image-detail",
+            json={"image_b64": request.image_b64, "query": request.query}
+        )
+        response.raise_for_status()
+        return response.json()
     except httpx.HTTPStatusError as e:
         logger.error(f"❌ AI Service HTTP Error: {e.response.status_code} - {e.response.text}")
         raise HTTPException(status_code=502, detail=f"AI Service Error: {e.response.status_code}")
@@ -257,21 +270,14 @@ async def analyze_image_proxy(request: ImageAnalysisRequest):
         raise HTTPException(status_code=500, detail=f"AI Service Error: {str(e)}")
 
 
-@router.post("/ai-search", response_model=Dict[str, Any])
-async def ai_search(
-    query: str = Form(..., description="사용자 검색 쿼리"),
-    image_file: Optional[UploadFile] = File(None),
-    limit: int = Form(12),
-    db: AsyncSession = Depends(deps.get_db),
-) -> Any:
-    """
-    [Upgraded v2] 스마트 하이브리드 검색
-    1. 텍스트/이미지 입력 -> AI 서비스로 경로(Internal/External) 판단
-    2. EXTERNAL: 외부 이미지/트렌드 분석 -> CLIP 벡터 생성 -> 시각적 유사도 상품 검색
-    3. INTERNAL: 핵심 키워드 + BERT/CLIP 벡터 -> 하이브리드 검색
-    """
-    logger.info(f"🔍 AI Search Request: '{query}' (Image: {image_file is not None})")
-
+async def _run_ai_search(
+    db: AsyncSession,
+    ai: AIServiceClient,
+    query: str,
+    image_b64: Optional[str],
+    limit: int,
+) -> Tuple[Dict[str, Any], List[Any]]:
+    """ai-search 본 처리 -> (응답 메타 정보, 상품 목록)"""
     # 1. 의도 및 정보 추출
     target_gender = detect_gender_intent(query)
     core_keyword = extract_core_keyword(query)
@@ -279,18 +285,7 @@ async def ai_search(
     
     logger.info(f"📌 Gender: {target_gender}, Core Keyword: '{core_keyword}', Celebrity: {is_celeb_search}")
 
-    # 2. 업로드 이미지 처리
-    image_b64: Optional[str] = None
-    if image_file:
-        try:
-            content = await image_file.read()
-            image_b64 = base64.b64encode(content).decode("utf-8")
-        except Exception:
-            raise HTTPException(status_code=400, detail="Invalid image file")
-
-    # 3. AI Service 호출 (경로 판단 및 벡터 생성)
-    AI_SERVICE_API_URL = settings.AI_SERVICE_API_URL.rstrip("/")
-    
+    # 2. AI Service 호출 (경로 판단 및 벡터 생성)
     search_strategy = "SMART_HYBRID"
     search_path = "INTERNAL"
     ai_summary = "검색 결과입니다."
@@ -300,129 +295,83 @@ async def ai_search(
     bert_vec: Optional[List[float]] = None
     clip_vec: Optional[List[float]] = None
     
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                # 3-1. 경로 결정 API 호출
-                path_res = await client.post(
-                    f"{AI_SERVICE_API_URL}/determine-path",
-                    json={"query": query}
-                )
-                
-                search_path = "INTERNAL"
-                if path_res.status_code == 200:
-                    search_path = path_res.json().get("path", "INTERNAL")
-                
-                logger.info(f"🛤️ Search Path Decision: {search_path}")
-                
-                # 3-2. 경로에 따른 상세 처리 호출
-                endpoint = "/process-external" if search_path == 'EXTERNAL' else "/process-internal"
-                
-                # URL 결합 시 중복 슬래시 방지
-                target_ai_url = f"{AI_SERVICE_API_URL}{endpoint}"
-                
-                payload = {"query": query, "image_b64": image_b64}
-                ai_res = await client.post(target_ai_url, json=payload)
-                ai_res.raise_for_status()
-                
-                data = ai_res.json()
-                
-                # 벡터 추출
-                if "vectors" in data:
-                    bert_vec = data["vectors"].get("bert")
-                    clip_vec = data["vectors"].get("clip")
-                    logger.info(f"📊 Vectors received - BERT: {len(bert_vec) if bert_vec else 0}dim, CLIP: {len(clip_vec) if clip_vec else 0}dim")
-                elif "vector" in data:
-                    bert_vec = data["vector"]
-                
-                # AI 분석 결과 추출
-                if "ai_analysis" in data and data["ai_analysis"]:
-                    analysis = data["ai_analysis"]
-                    ai_summary = analysis.get("summary") or ai_summary
-                    ref_image_url = analysis.get("reference_image")
-                    candidates = analysis.get("candidates", [])
-                else:
-                    ai_summary = data.get("description") or data.get("reason") or ai_summary
-                    ref_image_url = data.get("ref_image")
-                
-                search_strategy = data.get("strategy", search_path).upper()
-                
-                # 외부 이미지 URL이면 프록시 처리 (CORS 방지)
-                if ref_image_url and ref_image_url.startswith("http"):
-                    logger.info(f"🔄 Proxying reference image...")
-                    proxy_image = await fetch_image_as_base64(ref_image_url)
-                    if proxy_image:
-                        ref_image_url = proxy_image
-                
-                break  # 성공 시 재시도 루프 탈출
+    try:
+        # 경로 결정 + 벡터/분석을 한 번의 왕복으로 처리 (재시도는 클라이언트에서 멱등 키로 안전하게 수행)
+        data = await ai.search_plan(query, image_b64)
+        search_path = data.get("path", "INTERNAL")
+        logger.info(f"🛤️ Search Path Decision: {search_path}")
+        
+        # 벡터 추출
+        if "vectors" in data:
+            bert_vec = data["vectors"].get("bert")
+            clip_vec = data["vectors"].get("clip")
+            logger.info(f"📊 Vectors received - BERT: {len(bert_vec) if bert_vec else 0}dim, CLIP: {len(clip_vec) if clip_vec else 0}dim")
+        elif "vector" in data:
+            bert_vec = data["vector"]
+        
+        # AI 분석 결과 추출
+        if "ai_analysis" in data and data["ai_analysis"]:
+            analysis = data["ai_analysis"]
+            ai_summary = analysis.get("summary") or ai_summary
+            ref_image_url = analysis.get("reference_image")
+            candidates = analysis.get("candidates", [])
+        else:
+            ai_summary = data.get("description") or data.get("reason") or ai_summary
+            ref_image_url = data.get("ref_image")
+        
+        search_strategy = data.get("strategy", search_path).upper()
+        
+        # 외부 이미지 URL이면 프록시 처리 (CORS 방지)
+        if ref_image_url and ref_image_url.startswith("http"):
+            logger.info(f"🔄 Proxying reference image...")
+            proxy_image = await fetch_image_as_base64(ref_image_url)
+            if proxy_image:
+                ref_image_url = proxy_image
 
-        except Exception as e:
-            logger.warning(f"⚠️ AI Service Retry ({attempt+1}/{max_retries}): {e}")
-            if attempt == max_retries - 1:
-                search_strategy = "KEYWORD_FALLBACK"
-                logger.error(f"❌ AI Service failed after {max_retries} retries")
-            await asyncio.sleep(1)
+    except Exception as e:
+        search_strategy = "KEYWORD_FALLBACK"
+        logger.error(f"❌ AI Service search-plan failed: {e}")
 
-    # 4. 🌟 검색 실행 - DB 조회
+    # 3. 🌟 검색 실행 - DB 조회
     results = []
     gender_filtered = True  # 성별 필터 적용 여부 추적
     
     try:
-        # Case A: EXTERNAL 경로이면서 CLIP 벡터가 있는 경우 (핵심 기능!)
-        if search_path == "EXTERNAL" and clip_vec and len(clip_vec) == 512:
-            logger.info(f"🖼️ Using CLIP image vector search (512-dim)")
-            
-            # CLIP 이미지 벡터로 시각적 유사도 검색
-            results = await crud_product.search_by_clip_vector(
-                db,
-                clip_vector=clip_vec,
-                limit=limit,
-                filter_gender=target_gender
-            )
-            
-            if results:
-                search_strategy = "CLIP_VISUAL_SEARCH"
-                logger.info(f"✅ CLIP search found {len(results)} products")
-            else:
-                # CLIP 검색 결과 없으면 BERT로 Fallback
-                logger.info(f"⚠️ CLIP search empty, falling back to BERT")
-                if bert_vec and len(bert_vec) == 768:
-                    results = await crud_product.search_hybrid(
-                        db,
-                        bert_vector=bert_vec,
-                        limit=limit,
-                        filter_gender=target_gender
-                    )
-                    search_strategy = "BERT_FALLBACK"
-        
-        # Case B: INTERNAL 경로 또는 벡터 검색 실패 시 -> 스마트 하이브리드 (키워드 + 벡터)
-        if not results:
-            results = await crud_product.search_smart_hybrid(
+        # Case A/B: 키워드 + BERT + CLIP 순위를 RRF 로 결합 (DB 왕복 1회)
+        # EXTERNAL 경로에서 CLIP 벡터가 있으면 시각적 유사도에 가중치 (핵심 기능!)
+        visual_search = search_path == "EXTERNAL" and bool(clip_vec) and len(clip_vec) == 512
+        fused_weights = {"keyword_weight": 0.5, "bert_weight": 1.0, "clip_weight": 2.0} if visual_search else {}
+
+        results = await crud_product.search_fused(
+            db,
+            query=core_keyword,  # 핵심 키워드 우선
+            bert_vector=bert_vec,
+            clip_vector=clip_vec,
+            limit=limit,
+            filter_gender=target_gender,
+            **fused_weights
+        )
+        if results:
+            if visual_search: search_strategy = "CLIP_VISUAL_SEARCH"
+            logger.info(f"✅ Fused search found {len(results)} products")
+
+        # ✅ [FIX] 결과 없으면 성별 필터를 완화하되 전체 쿼리로 재시도
+        # 하지만 필터 완화 사실을 추적
+        if not results and target_gender:
+            logger.info(f"⚠️ No results with gender filter '{target_gender}', trying relaxed search")
+            results = await crud_product.search_fused(
                 db,
-                query=core_keyword,  # 핵심 키워드 우선
+                query=query,
                 bert_vector=bert_vec,
                 clip_vector=clip_vec,
                 limit=limit,
-                filter_gender=target_gender
+                filter_gender=None,  # 성별 필터 해제
+                **fused_weights
             )
-            
-            # ✅ [FIX] 결과 없으면 성별 필터를 완화하되 전체 쿼리로 재시도
-            # 하지만 필터 완화 사실을 추적
-            if not results:
-                logger.info(f"⚠️ No results with gender filter '{target_gender}', trying relaxed search")
-                results = await crud_product.search_smart_hybrid(
-                    db,
-                    query=query,
-                    bert_vector=bert_vec,
-                    clip_vector=clip_vec,
-                    limit=limit,
-                    filter_gender=None  # 성별 필터 해제
-                )
-                if results:
-                    search_strategy = "RELAXED_SEARCH"
-                    gender_filtered = False
-                    logger.info(f"⚠️ Relaxed search found {len(results)} products (gender filter removed)")
+            if results:
+                search_strategy = "RELAXED_SEARCH"
+                gender_filtered = False
+                logger.info(f"⚠️ Relaxed search found {len(results)} products (gender filter removed)")
         
         # Case C: 최후의 수단 (최신 상품)
         if not results:
@@ -435,17 +384,7 @@ async def ai_search(
         # DB 에러가 나도 앱이 죽지 않도록 빈 리스트 반환 혹은 에러 처리
         raise HTTPException(status_code=500, detail="Database Search Failed")
 
-    # 5. ✅ [FIX] Response 매핑 (similarity 포함)
-    product_responses = []
-    for p in results:
-        response = map_product_to_response(p)
-        if response:
-            product_responses.append(response)
-
-    logger.info(f"✅ Search Complete: {len(product_responses)} products found (Strategy: {search_strategy})")
-
     return {
-        "status": "SUCCESS",
         "search_path": search_strategy,
         "gender_filter_applied": gender_filtered,  # ✅ [NEW] 성별 필터 적용 여부
         "detected_gender": target_gender,  # ✅ [NEW] 감지된 성별
@@ -454,5 +393,92 @@ async def ai_search(
             "reference_image": ref_image_url,
             "candidates": candidates
         },
-        "products": product_responses
-    }
\ No newline at end of file
+    }, results
+
+
+def _build_search_response(meta: Dict[str, Any], results: List[Any]) -> Dict[str, Any]:
+    # ✅ [FIX] Response 매핑 (similarity 포함)
+    product_responses = []
+    for p in results:
+        response = map_product_to_response(p)
+        if response:
+            product_responses.append(response)
+
+    logger.info(f"✅ Search Complete: {len(product_responses)} products found (Strategy: {meta['search_path']})")
+
+    return {"status": "SUCCESS", **meta, "products": product_responses}
+
+
+def _search_cache_compute(ai: AIServiceClient, query: str, limit: int):
+    """캐시 미스/갱신용 계산 (요청이 끝나도 계속 실행될 수 있으므로 세션은 따로 염)"""
+    async def compute() -> Tuple[Dict[str, Any], bool]:
+        async with async_session_maker() as db:
+            meta, results = await _run_ai_search(db, ai, query, None, limit)
+        products = []
+        for p in results:
+            similarity = getattr(p, 'similarity', None)
+            products.append([p.id, float(similarity) if similarity is not None else None])
+        entry = {**meta, "products": products}
+        return entry, meta["search_path"] not in UNCACHED_SEARCH_PATHS
+    return compute
+
+
+async def _cached_ai_search(db: AsyncSession, ai: AIServiceClient, query: str, limit: int) -> Dict[str, Any]:
+    """결과 캐시 경유 검색 (hit: Redis 조회 + 상품 id 조회 1회, stale: 응답 후 백그라운드 갱신)"""
+    key = await search_cache.key(query, detect_gender_intent(query), limit)
+    compute = _search_cache_compute(ai, query, limit)
+
+    cached = await search_cache.get(key)
+    if cached:
+        entry, stale = cached
+        if stale:
+            await search_cache.refresh(key, compute)
+        logger.info(f"🟢 AI search cache hit{' (stale)' if stale else ''}: '{query}'")
+    else:
+        # 같은 검색이 동시에 몰려도 재계산은 한 번만 (나머지는 결과 공유)
+        entry = await search_cache.run(key, compute)
+
+    similarities = {product_id: similarity for product_id, similarity in entry["products"]}
+    results = await crud_product.get_by_ids(db, list(similarities))
+    for p in results:
+        p.similarity = similarities[p.id]
+    meta = {k: v for k, v in entry.items() if k not in ("products", "cached_at")}
+    return _build_search_response(meta, results)
+
+
+@router.post("/ai-search", response_model=Dict[str, Any])
+async def ai_search(
+    query: str = Form(..., description="사용자 검색 쿼리"),
+    image_file: Optional[UploadFile] = File(None),
+    limit: int = Form(12),
+    db: AsyncSession = Depends(deps.get_db),
+    ai: AIServiceClient = Depends(deps.get_ai_client),
+) -> Any:
+    """
+    [Upgraded v2] 스마트 하이브리드 검색
+    1. 텍스트/이미지 입력 -> AI 서비스로 경로(Internal/External) 판단
+    2. EXTERNAL: 외부 이미지/트렌드 분석 -> CLIP 벡터 생성 -> 시각적 유사도 상품 검색
+    3. INTERNAL: 핵심 키워드 + BERT/CLIP 벡터 -> 하이브리드 검색
+    - 텍스트 검색은 결과 캐시(search_cache) 경유 (이미지 검색은 입력이 매번 달라 캐시하지 않음)
+    """
+    logger.info(f"🔍 AI Search Request: '{query}' (Image: {image_file is not None})")
+
+    if image_file is None and search_cache.enabled:
+        try:
+            return await _cached_ai_search(db, ai, query, limit)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️ AI search cache unavailable, searching directly: {e}")
+
+    # 업로드 이미지 처리
+    image_b64: Optional[str] = None
+    if image_file:
+        try:
+            content = await image_file.read()
+            image_b64 = base64.b64encode(content).decode("utf-8")
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid image file")
+
+    meta, results = await _run_ai_search(db, ai, query, image_b64, limit)
+    return _build_search_response(meta, results)
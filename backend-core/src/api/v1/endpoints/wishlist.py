@@ -6,6 +6,7 @@ from sqlalchemy import select, delete, desc
 from src.api import deps
 from src.models.wishlist import Wishlist
 from src.models.product import Product
+from src.crud.crud_product import LIST_LOAD_OPTIONS
 from src.models.user import User
 from src.schemas.product import ProductResponse
 
@@ -80,6 +81,7 @@ async def read_wishlist(
     # Wishlist 테이블과 Product 테이블을 JOIN하여 상품 정보를 조회
     stmt = (
         select(Product)
+        .options(*LIST_LOAD_OPTIONS)  # 벡터 컬럼 제외
         .join(Wishlist, Wishlist.product_id == Product.id)
         .where(Wishlist.user_id == current_user.id)
         .order_by(desc(Wishlist.created_at)) # 최신순 정렬
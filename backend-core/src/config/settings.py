@@ -44,9 +44,29 @@ class Settings(BaseSettings):
     REDIS_HOST: str
     REDIS_PORT: int = 6379
     CELERY_TASK_TIME_LIMIT: int = 600
+    PRODUCT_HEAL_LOCK_TTL: int = Field(600, description="상품 Self-Healing 중복 예약 방지 잠금 시간 (초, 실패 시 재시도 간격)")
     
     # AI & Vector DB
     EMBEDDING_DIMENSION: int = 768 # 벡터 차원 (768D)
+    EMBEDDING_MODEL_VERSION: str = Field("v1", description="product_embeddings.model_version 에 기록할 임베딩 모델 버전")
+
+    # 벡터 검색(HNSW) 튜닝 - 필터 선택도에 따라 쿼리별 ef_search 조정
+    VECTOR_EF_SEARCH_MIN: int = Field(40, description="hnsw.ef_search 최소값 (pgvector 기본값 40)")
+    VECTOR_EF_SEARCH_MAX: int = Field(1000, description="hnsw.ef_search 최대값 (pgvector 허용 최대 1000)")
+    VECTOR_RERANK_CANDIDATES: int = Field(200, description="비트 양자화 인덱스로 뽑을 1차 후보 수 (원본 벡터로 재정렬)")
+    VECTOR_REFILL_ATTEMPTS: int = Field(2, description="필터로 결과가 모자랄 때 ef_search 를 키워 재조회하는 횟수")
+    VECTOR_FILTER_STATS_TTL: int = Field(300, description="성별/카테고리 분포 통계 캐시 시간 (초)")
+    VECTOR_ITERATIVE_SCAN: str = Field("off", description="hnsw.iterative_scan (off | relaxed_order | strict_order, pgvector 0.8 이상)")
+    VECTOR_REPLICA_ENABLED: bool = Field(False, description="프로세스 내부 벡터 복제본 사용 여부 (LISTEN/NOTIFY 로 동기화)")
+    VECTOR_REPLICA_COLUMNS: str = Field("embedding,embedding_clip", description="복제본에 올릴 벡터 컬럼 (콤마 구분)")
+    VECTOR_REPLICA_MAX_ITEMS: int = Field(200000, description="복제본 최대 상품 수 (초과 시 DB 검색만 사용)")
+    VECTOR_REPLICA_RESYNC_SECONDS: int = Field(900, description="NOTIFY 누락 보정용 전체 재동기화 주기 (초)")
+
+    # AI 검색 결과 캐시 (정규화 검색어 + 성별 + limit + 카탈로그 세대 기준)
+    AI_SEARCH_CACHE_TTL: int = Field(300, description="AI 검색 결과를 그대로 사용하는 시간 (초, 0 이면 캐시 사용 안 함)")
+    AI_SEARCH_CACHE_STALE_TTL: int = Field(3600, description="TTL 이 지난 결과를 응답하면서 백그라운드로 갱신하는 추가 시간 (초)")
+    AI_SEARCH_CACHE_LOCK_TTL: int = Field(150, description="같은 검색 재계산을 한 번만 실행하기 위한 잠금 시간 (초)")
+    AI_SEARCH_CACHE_WAIT: float = Field(10.0, description="다른 인스턴스가 계산 중인 결과를 기다리는 최대 시간 (초)")
     
     # 기본값: http://ai-service-api:8000/api/v1 (docker-compose 서비스명 기준)
     AI_SERVICE_API_URL: str = Field(
@@ -54,6 +74,14 @@ class Settings(BaseSettings):
         description="AI 서비스 내부 통신 URL"
     )
     
+    # AI 서비스 공유 HTTP 클라이언트 (커넥션 풀 / 타임아웃)
+    AI_CLIENT_MAX_CONNECTIONS: int = Field(100, description="AI 서비스 최대 동시 연결 수")
+    AI_CLIENT_MAX_KEEPALIVE: int = Field(20, description="유지할 keep-alive 연결 수")
+    AI_CLIENT_CONNECT_TIMEOUT: float = Field(5.0, description="AI 서비스 연결 타임아웃 (초)")
+    AI_CLIENT_DEFAULT_TIMEOUT: float = Field(30.0, description="엔드포인트별 설정이 없을 때 기본 타임아웃 (초)")
+    AI_CLIENT_HTTP2: bool = Field(False, description="HTTP/2 사용 여부 (h2 패키지 및 서버 지원 필요)")
+    AI_VECTOR_ENCODING: Literal["json", "f32", "f16"] = Field("json", description="AI 서비스 응답 벡터 전송 형식 (json | f32 | f16, base64 압축 전송)")
+    
     @field_validator("EMBEDDING_DIMENSION", mode="before")
     @classmethod
     def validate_embedding_dim(cls, v: Any) -> int:
@@ -56,4 +56,33 @@ def broadcast_email_task(subject: str, body: str, filter_type: str = "all"):
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
     
-    return loop.run_until_complete(_process_email_sending())
\ No newline at end of file
+    return loop.run_until_complete(_process_email_sending())
+
+
+@celery_app.task(name="tasks.heal_product")
+def heal_product_task(product_id: int):
+    """
+    상품 Self-Healing Task (임베딩/설명 복구)
+    - API 의 GET 경로는 enqueue_heal 로 예약만 하고 즉시 응답
+    """
+    from src.services.ai_client import AIServiceClient
+    from src.services.product_healing import heal_product, release_heal_lock
+
+    async def _process_heal():
+        ai = AIServiceClient()
+        try:
+            async with async_session_maker() as session:
+                healed = await heal_product(session, product_id, ai)
+        finally:
+            await ai.close()
+        # 실패 시 잠금은 TTL 만료까지 유지 -> 그동안 같은 상품은 다시 예약되지 않음
+        if healed:
+            await release_heal_lock(product_id)
+        return f"Product {product_id} healed: {healed}"
+
+    loop = asyncio.get_event_loop()
+    if loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(_process_heal())
@@ -8,23 +8,73 @@ crud_product.py - 수정된 버전 v2
 3. ✅ NEW: search_by_clip_vector - CLIP 이미지 벡터 기반 검색
 """
 
-from typing import List, Optional, Any, Union, Dict
+import logging
+import math
+import re
+import time
+from typing import List, Optional, Any, Union, Dict, Tuple
 from datetime import datetime
-from sqlalchemy import select, update, func, text, case, or_, and_
+from sqlalchemy import select, update, func, text, case, or_, and_, literal_column, union_all, cast, literal, Float
+from sqlalchemy.dialects.postgresql import BIT
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from src.db.vector import Vector
 
 from src.models.product import Product
+from src.models.product_embedding import ProductEmbedding, VECTOR_COLUMNS, VECTOR_DIMS, ANN_PARTIAL_GENDERS, ANN_PARTIAL_CATEGORIES
 from src.schemas.product import ProductCreate, ProductUpdate 
+from src.config.settings import settings
+from src.constants import ProductCategory
+from src.utils.vector import l2_normalize
+from src.services.vector_replica import vector_replica
+from src.services.search_cache import search_cache
+
+logger = logging.getLogger(__name__)
+
+# 목록/검색 결과용 로드 옵션: product_embeddings(행당 약 9KB)는 조회하지 않음
+# - 상품 카드 렌더링에는 표시용 컬럼만 필요, 벡터가 필요하면 get(with_vectors=True) 사용
+# - 벡터 정렬이 필요한 검색만 product_embeddings 를 JOIN (정렬용으로만 사용, 로드하지 않음)
+# - raiseload: 로드되지 않은 벡터에 접근하면 암묵적 추가 쿼리 대신 즉시 에러
+LIST_LOAD_OPTIONS = (
+    raiseload(Product.vectors),
+)
+
+ITERATIVE_SCAN_MODES = {"relaxed_order", "strict_order"}
+
+# 값이 바뀌면 AI 검색 결과가 달라지는 필드 (그 외 필드 수정은 검색 캐시를 무효화하지 않음)
+SEARCH_FIELDS = {"name", "description", "category", "gender", "price", "is_active", *VECTOR_COLUMNS}
+
+# 코디 이미지 검색 영역 -> (벡터 컬럼, 기본 가중치, 기본 카테고리 제한)
+OUTFIT_REGIONS = {
+    "full": ("embedding_clip", 1.0, None),
+    "upper": ("embedding_clip_upper", 1.0, [
+        ProductCategory.TOPS.value, ProductCategory.OUTERWEAR.value, ProductCategory.DRESSES.value
+    ]),
+    "lower": ("embedding_clip_lower", 1.0, [ProductCategory.BOTTOMS.value]),
+}
+
+
+def _sql_literal(value: str):
+    # 부분 인덱스 조건과 비교되는 고정 값(성별/카테고리 enum)만 리터럴로 렌더링
+    return literal_column("'" + value.replace("'", "''") + "'")
+
 
 class CRUDProduct:
+    def __init__(self):
+        # (gender, category) -> 노출 중인 벡터 행 수 (ef_search 산정용, 주기적으로 갱신)
+        self._filter_counts: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+        self._filter_counts_expires = 0.0
+
     # 기본 CRUD 메서드
-    async def get(self, db: AsyncSession, product_id: int) -> Optional[Product]:
+    async def get(self, db: AsyncSession, product_id: int, with_vectors: bool = True) -> Optional[Product]:
         stmt = select(Product).where(Product.id == product_id, Product.deleted_at.is_(None))
+        if not with_vectors:
+            stmt = stmt.options(*LIST_LOAD_OPTIONS)
         result = await db.execute(stmt)
         return result.scalars().first()
 
     async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[Product]:
-        stmt = select(Product).where(Product.deleted_at.is_(None)).offset(skip).limit(limit)
+        stmt = select(Product).options(*LIST_LOAD_OPTIONS).where(Product.deleted_at.is_(None)).offset(skip).limit(limit)
         result = await db.execute(stmt)
         return result.scalars().all()
 
@@ -36,18 +86,37 @@ class CRUDProduct:
         db_obj = Product(**create_data)
         db.add(db_obj)
         await db.commit()
+        await search_cache.bump_generation()
         await db.refresh(db_obj)
         return db_obj
 
-    async def update(self, db: AsyncSession, *, db_obj: Product, obj_in: Union[ProductUpdate, Dict[str, Any]]) -> Product:
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Product,
+        obj_in: Union[ProductUpdate, Dict[str, Any]],
+        invalidate_search: bool = True,
+    ) -> Product:
+        """
+        상품 수정
+        - 검색에 영향을 주는 필드(SEARCH_FIELDS)가 바뀐 경우에만 AI 검색 캐시 세대를 올림
+        - invalidate_search=False: 백그라운드 보정(Self-Healing 등)처럼 캐시를 비울 필요가 없는 쓰기
+        """
         if isinstance(obj_in, dict): 
             update_data = obj_in
         else: 
             update_data = obj_in.model_dump(exclude_unset=True)
+        search_changed = False
         for field, value in update_data.items(): 
+            # 벡터는 비교 비용이 커서 값이 들어오면 변경으로 간주
+            if field in SEARCH_FIELDS and (field in VECTOR_COLUMNS or getattr(db_obj, field, None) != value):
+                search_changed = True
             setattr(db_obj, field, value)
         db.add(db_obj)
         await db.commit()
+        if invalidate_search and search_changed:
+            await search_cache.bump_generation()
         await db.refresh(db_obj)
         return db_obj
 
@@ -56,6 +125,7 @@ class CRUDProduct:
         stmt = update(Product).where(Product.id == product_id).values(deleted_at=now)
         await db.execute(stmt)
         await db.commit()
+        await search_cache.bump_generation()
         return await self.get(db, product_id)
 
     # -------------------------------------------------------
@@ -72,9 +142,9 @@ class CRUDProduct:
     ) -> List[Product]:
         """
         스마트 하이브리드 검색:
-        1단계: 키워드 매칭 상품 (이름/설명에 검색어 포함)
-        2단계: 벡터 유사도로 정렬
-        3단계: 부족하면 벡터 검색으로 보완
+        1단계: 키워드 매칭 상품 (search_bigrams 전문 검색 1회, 일치도 → 벡터 유사도 순)
+        2단계: 부족하면 벡터 검색으로 보완
+        3단계: 그래도 부족하면 최신 상품
         """
         
         # 기본 필터
@@ -99,42 +169,34 @@ class CRUDProduct:
         # 🥇 1단계: 키워드 정확 매칭 (최우선)
         # =====================================================
         if query and len(query.strip()) >= 2:
-            # 핵심 키워드 추출 (조사 제거)
-            keywords = self._extract_keywords(query)
-            
-            for keyword in keywords:
-                if len(keyword) < 2:
-                    continue
-                    
-                search_pattern = f"%{keyword}%"
-                
-                stmt = select(Product).where(
+            # 핵심 키워드 추출 (조사 제거) -> 모든 키워드를 OR 로 묶은 tsquery 하나로 검색
+            ts_query = self._bigram_tsquery(self._extract_keywords(query))
+
+            if ts_query:
+                tsq = func.to_tsquery(literal_column("'simple'::regconfig"), ts_query)
+                stmt = select(Product).options(*LIST_LOAD_OPTIONS).where(
                     *base_conditions,
-                    or_(
-                        Product.name.ilike(search_pattern),
-                        Product.description.ilike(search_pattern),
-                        Product.category.ilike(search_pattern)
-                    )
+                    Product.search_bigrams.op('@@')(tsq)
                 )
-                
-                # 벡터가 있으면 벡터 유사도순, 없으면 최신순
+
+                # 여러 키워드 / 이름(A 가중치) 일치가 많을수록 상위, 동점이면 벡터 유사도순 또는 최신순
+                order_by = [func.ts_rank_cd(Product.search_bigrams, tsq).desc()]
                 if bert_vector and len(bert_vector) == 768:
-                    stmt = stmt.where(Product.embedding.is_not(None))
-                    dist = Product.embedding.cosine_distance(bert_vector)
-                    stmt = stmt.order_by(dist)
-                else:
-                    stmt = stmt.order_by(Product.created_at.desc())
-                
-                stmt = stmt.limit(limit)
+                    stmt = stmt.outerjoin(ProductEmbedding, ProductEmbedding.product_id == Product.id)
+                    # 저장 벡터는 정규화되어 있으므로 내적(<#>) 순위 = 코사인 순위
+                    inner = ProductEmbedding.embedding.max_inner_product(l2_normalize(bert_vector))
+                    order_by.append(inner.asc().nulls_last())
+                order_by.append(Product.created_at.desc())
+
+                stmt = stmt.order_by(*order_by).limit(limit)
                 result = await db.execute(stmt)
-                
+
                 for product in result.scalars().all():
-                    if product.id not in seen_ids:
-                        final_results.append(product)
-                        seen_ids.add(product.id)
-                        
-                        if len(final_results) >= limit:
-                            return final_results
+                    final_results.append(product)
+                    seen_ids.add(product.id)
+
+                if len(final_results) >= limit:
+                    return final_results
 
         # =====================================================
         # 🥈 2단계: 벡터 유사도 검색 (보완)
@@ -142,18 +204,12 @@ class CRUDProduct:
         if len(final_results) < limit and bert_vector and len(bert_vector) == 768:
             remaining = limit - len(final_results)
             
-            stmt = select(Product).where(
-                *base_conditions,
-                Product.embedding.is_not(None),
-                Product.id.notin_(seen_ids) if seen_ids else True
+            rows = await self._vector_search(
+                db, 'embedding', bert_vector, remaining,
+                filter_gender=filter_gender, exclude_id=list(seen_ids)
             )
             
-            dist = Product.embedding.cosine_distance(bert_vector)
-            stmt = stmt.order_by(dist).limit(remaining)
-            
-            result = await db.execute(stmt)
-            
-            for product in result.scalars().all():
+            for product, _ in rows:
                 if product.id not in seen_ids:
                     final_results.append(product)
                     seen_ids.add(product.id)
@@ -164,7 +220,7 @@ class CRUDProduct:
         if len(final_results) < limit:
             remaining = limit - len(final_results)
             
-            stmt = select(Product).where(
+            stmt = select(Product).options(*LIST_LOAD_OPTIONS).where(
                 *base_conditions,
                 Product.id.notin_(seen_ids) if seen_ids else True
             )
@@ -211,39 +267,57 @@ class CRUDProduct:
         
         return keywords
 
+    def _bigram_tsquery(self, keywords: List[str]) -> Optional[str]:
+        """
+        키워드 목록 -> search_bigrams 용 tsquery 문자열
+        - 키워드 하나 = 구성 bigram 의 AND (부분 문자열 매칭과 동일한 효과)
+        - 키워드끼리는 OR  예) ['청바지', '니트'] -> ('청바' & '바지') | ('니트')
+        - 토큰화 규칙은 DB 함수 korean_bigram_tsvector 와 같아야 함
+        """
+        groups = []
+        for keyword in keywords:
+            tokens = []
+            for word in re.split(r'[^0-9a-z가-힣]+', keyword.lower()):
+                if not word:
+                    continue
+                tokens.extend([word[i:i + 2] for i in range(max(len(word) - 1, 1))])
+            if tokens:
+                group = " & ".join(f"'{token}'" for token in dict.fromkeys(tokens))
+                groups.append(f"({group})")
+        return " | ".join(dict.fromkeys(groups)) or None
+
     # -------------------------------------------------------
-    # ✅ [NEW] CLIP 이미지 벡터 기반 검색 (시각적 유사도)
+    # 🔀 [NEW] 통합 랭킹 검색 - 키워드 / BERT / CLIP 순위를 RRF 로 한 번에 결합
     # -------------------------------------------------------
-    async def search_by_clip_vector(
-        self, 
-        db: AsyncSession, 
-        clip_vector: List[float], 
+    async def search_fused(
+        self,
+        db: AsyncSession,
+        query: Optional[str] = None,
+        bert_vector: Optional[List[float]] = None,
+        clip_vector: Optional[List[float]] = None,
         limit: int = 12,
         filter_gender: Optional[str] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
         exclude_category: Optional[List[str]] = None,
         exclude_id: Optional[List[int]] = None,
-        min_price: Optional[int] = None,
-        max_price: Optional[int] = None
+        keyword_weight: float = 1.0,
+        bert_weight: float = 1.0,
+        clip_weight: float = 1.0,
+        candidate_k: int = 50,
+        rrf_k: int = 60
     ) -> List[Product]:
         """
-        ✅ CLIP 이미지 벡터(512차원)로 시각적 유사도 검색
-        - 연예인 패션 검색 등 이미지 기반 검색에 사용
-        - embedding_clip 컬럼 사용
+        Reciprocal Rank Fusion 하이브리드 검색 (DB 왕복 1회)
+        - CTE별 상위 candidate_k 개 순위: 키워드(ts_rank_cd), BERT 코사인 거리, CLIP 코사인 거리
+        - score = Σ weight / (rrf_k + rank), 신호가 없는(벡터 없음 등) CTE는 제외
+        - 필터(성별/가격/제외)는 모든 CTE에 동일하게 한 번 정의
+        - 결과 Product 에 similarity(0~1, 모든 신호 1위일 때 1.0) 속성을 채워 반환
         """
-        import logging
-        logger = logging.getLogger(__name__)
-        
-        if not clip_vector or len(clip_vector) != 512:
-            logger.warning("❌ Invalid CLIP vector (expected 512 dims)")
-            return []
-        
         conditions = [
             Product.is_active == True,
-            Product.deleted_at.is_(None),
-            Product.embedding_clip.is_not(None)
+            Product.deleted_at.is_(None)
         ]
-        
-        # 성별 필터
         if filter_gender:
             conditions.append(
                 or_(
@@ -252,31 +326,339 @@ class CRUDProduct:
                     Product.gender.is_(None)
                 )
             )
-        
-        # 카테고리 제외
+        if min_price is not None:
+            conditions.append(Product.price >= min_price)
+        if max_price is not None:
+            conditions.append(Product.price <= max_price)
         if exclude_category:
-            for cat in exclude_category:
-                conditions.append(Product.category != cat)
-        
-        # ID 제외
+            conditions.append(Product.category.notin_(exclude_category))
         if exclude_id:
             conditions.append(Product.id.notin_(exclude_id))
-        
-        # 가격 범위
+
+        ranked_sources = []
+        ann_conditions = self._ann_conditions(
+            filter_gender=filter_gender,
+            exclude_category=exclude_category,
+            exclude_id=exclude_id,
+            min_price=min_price,
+            max_price=max_price
+        )
+        has_price_filter = min_price is not None or max_price is not None
+        ef_search = 0
+
+        ts_query = self._bigram_tsquery(self._extract_keywords(query)) if query and len(query.strip()) >= 2 else None
+        if ts_query and keyword_weight > 0:
+            tsq = func.to_tsquery(literal_column("'simple'::regconfig"), ts_query)
+            order = func.ts_rank_cd(Product.search_bigrams, tsq).desc()
+            ranked_sources.append((keyword_weight, select(
+                Product.id, func.row_number().over(order_by=order).label('rnk')
+            ).where(*conditions, Product.search_bigrams.op('@@')(tsq)).order_by(order).limit(candidate_k).cte('kw_rank')))
+
+        # 벡터 CTE: product_embeddings 만 스캔 (부분 HNSW 인덱스 조건 형태의 필터)
+        for column, vector, dims, weight in (
+            ('embedding', bert_vector, 768, bert_weight),
+            ('embedding_clip', clip_vector, 512, clip_weight),
+        ):
+            if not vector or len(vector) != dims or weight <= 0:
+                continue
+            ranked = self._ann_ranked(column, vector, ann_conditions, candidate_k, name=f'{column}_ann')
+            ranked_sources.append((weight, select(
+                ranked.c.id, func.row_number().over(order_by=ranked.c.distance).label('rnk')
+            ).cte(f'{column}_rank')))
+
+            selectivity, _ = await self._ann_selectivity(
+                db, column, filter_gender, exclude_category=exclude_category, has_price_filter=has_price_filter
+            )
+            ef_search = max(ef_search, self._ef_search(self._candidate_count(candidate_k), selectivity))
+
+        if not ranked_sources:
+            return []
+        if ef_search:
+            await self._set_ann_params(db, ef_search)
+
+        scored = union_all(*[
+            select(cte.c.id, (weight / (rrf_k + cte.c.rnk)).label('score'))
+            for weight, cte in ranked_sources
+        ]).subquery('scored')
+        fused = select(scored.c.id, func.sum(scored.c.score).label('score')).group_by(scored.c.id).subquery('fused')
+
+        stmt = (
+            select(Product, fused.c.score)
+            .options(*LIST_LOAD_OPTIONS)
+            .join(fused, Product.id == fused.c.id)
+            .order_by(fused.c.score.desc(), Product.id)
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+
+        # 이론상 최대 점수(모든 신호에서 1위)로 나눠 0~1 범위로 정규화
+        max_score = sum(weight for weight, _ in ranked_sources) / (rrf_k + 1)
+        products = []
+        for product, score in result.all():
+            product.similarity = round(float(score) / max_score, 4)
+            products.append(product)
+        return products
+
+    # -------------------------------------------------------
+    # 🎯 필터 인식 ANN 검색 헬퍼 (부분 HNSW 인덱스 + ef_search 조정 + 재조회)
+    # -------------------------------------------------------
+    def _ann_conditions(
+        self,
+        filter_gender: Optional[str] = None,
+        include_category: Optional[List[str]] = None,
+        exclude_category: Optional[List[str]] = None,
+        exclude_id: Optional[List[int]] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None
+    ) -> List[Any]:
+        """
+        벡터 검색 필터 (product_embeddings 비정규화 컬럼 기준)
+        - 부분 HNSW 인덱스 조건식과 같은 형태로 작성해야 플래너가 해당 인덱스를 선택함
+        - 인덱스 조건에 쓰인 값은 리터럴로 렌더링 (바인드 파라미터는 generic plan 에서 인덱스 조건 증명 불가)
+        """
+        conditions = [ProductEmbedding.is_listed]
+
+        if filter_gender:
+            gender = _sql_literal(filter_gender) if filter_gender in ANN_PARTIAL_GENDERS else filter_gender
+            conditions.append(
+                or_(
+                    ProductEmbedding.gender == gender,
+                    ProductEmbedding.gender == _sql_literal('Unisex'),
+                    ProductEmbedding.gender.is_(None)
+                )
+            )
+        if include_category:
+            if len(include_category) == 1 and include_category[0] in ANN_PARTIAL_CATEGORIES:
+                conditions.append(ProductEmbedding.category == _sql_literal(include_category[0]))
+            else:
+                conditions.append(ProductEmbedding.category.in_(include_category))
+        if exclude_category:
+            conditions.append(ProductEmbedding.category.notin_(exclude_category))
+        if exclude_id:
+            conditions.append(ProductEmbedding.product_id.notin_(exclude_id))
         if min_price is not None:
-            conditions.append(Product.price >= min_price)
+            conditions.append(ProductEmbedding.price >= min_price)
         if max_price is not None:
-            conditions.append(Product.price <= max_price)
-        
-        # ✅ 코사인 거리 계산 (거리가 작을수록 유사)
-        dist = Product.embedding_clip.cosine_distance(clip_vector)
-        
-        # ✅ SELECT에 거리 포함하여 로깅용
-        stmt = select(Product, dist.label('distance')).where(*conditions)
-        stmt = stmt.order_by(dist).limit(limit)
+            conditions.append(ProductEmbedding.price <= max_price)
+        return conditions
+
+    async def _get_filter_counts(self, db: AsyncSession) -> Dict[Tuple[Optional[str], Optional[str]], int]:
+        now = time.monotonic()
+        if now < self._filter_counts_expires:
+            return self._filter_counts
+        try:
+            stmt = (
+                select(ProductEmbedding.gender, ProductEmbedding.category, func.count())
+                .where(ProductEmbedding.is_listed)
+                .group_by(ProductEmbedding.gender, ProductEmbedding.category)
+            )
+            rows = (await db.execute(stmt)).all()
+            self._filter_counts = {(gender, category): count for gender, category, count in rows}
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load ANN filter stats: {e}")
+        self._filter_counts_expires = now + settings.VECTOR_FILTER_STATS_TTL
+        return self._filter_counts
+
+    async def _ann_selectivity(
+        self,
+        db: AsyncSession,
+        column: str,
+        filter_gender: Optional[str] = None,
+        include_category: Optional[List[str]] = None,
+        exclude_category: Optional[List[str]] = None,
+        has_price_filter: bool = False
+    ) -> Tuple[float, int]:
+        """
+        (선택도, 조건을 만족하는 행 수 추정) 반환
+        - 선택도 = 필터 통과 행 / 사용할 인덱스가 담고 있는 행 (부분 인덱스가 흡수한 조건은 1.0)
+        """
+        counts = await self._get_filter_counts(db)
+        if not counts:
+            return 1.0, -1
+
+        def gender_ok(gender):
+            return not filter_gender or gender in (filter_gender, 'Unisex', None)
+
+        def category_ok(category):
+            if include_category and category not in include_category:
+                return False
+            return not exclude_category or (category is not None and category not in exclude_category)
+
+        matched = sum(c for (g, cat), c in counts.items() if gender_ok(g) and category_ok(cat))
+
+        # 플래너가 고를 수 있는 인덱스 중 가장 작은 범위를 기준으로 함
+        scopes = [sum(counts.values())]
+        if filter_gender in ANN_PARTIAL_GENDERS:
+            scopes.append(sum(c for (g, _), c in counts.items() if gender_ok(g)))
+        if column == 'embedding_clip' and include_category and len(include_category) == 1 and include_category[0] in ANN_PARTIAL_CATEGORIES:
+            scopes.append(sum(c for (_, cat), c in counts.items() if cat == include_category[0]))
+        index_rows = min(scopes)
+        if index_rows <= 0:
+            return 1.0, matched
+
+        selectivity = max(matched, 1) / index_rows
+        if has_price_filter:
+            selectivity *= 0.5  # 가격 분포는 통계가 없으므로 절반 통과로 가정
+        return min(selectivity, 1.0), matched
+
+    def _candidate_count(self, limit: int) -> int:
+        return max(settings.VECTOR_RERANK_CANDIDATES, limit)
+
+    def _ef_search(self, candidates: int, selectivity: float) -> int:
+        # 필터 통과 후에도 후보 수만큼 남도록 선택도에 반비례하여 확대
+        ef = math.ceil(candidates / max(selectivity, 1e-3))
+        return max(settings.VECTOR_EF_SEARCH_MIN, min(ef, settings.VECTOR_EF_SEARCH_MAX))
+
+    def _ann_ranked(self, column: str, vector: List[float], conditions: List[Any], limit: int, name: str = 'ann'):
+        """
+        2단계 벡터 검색 서브쿼리 (id, distance)
+        1) binary_quantize 비트 HNSW 인덱스(해밍 거리)로 1차 후보 VECTOR_RERANK_CANDIDATES 개
+        2) 후보만 원본 벡터 내적(<#>)으로 정확히 재정렬
+           - 저장/쿼리 벡터 모두 정규화 -> distance = 1 + (a <#> b) = 코사인 거리
+        """
+        dims = VECTOR_DIMS[column]
+        vector_column = getattr(ProductEmbedding, column)
+        query_vector = l2_normalize(vector)
+
+        # 인덱스 식 (binary_quantize(col)::bit(dims)) 과 같은 형태여야 인덱스 사용
+        hamming = cast(func.binary_quantize(vector_column), BIT(dims)).op('<~>', return_type=Float)(
+            func.binary_quantize(cast(literal(query_vector, Vector(dims)), Vector(dims)))
+        )
+        candidates = (
+            select(ProductEmbedding.product_id, vector_column.label('vec'))
+            .where(*conditions, vector_column.is_not(None))
+            .order_by(hamming)
+            .limit(self._candidate_count(limit))
+            .subquery(f'{name}_candidates')
+        )
+        distance = (1 + candidates.c.vec.max_inner_product(query_vector)).label('distance')
+        return select(candidates.c.product_id.label('id'), distance).order_by(distance).limit(limit).subquery(name)
+
+    async def _set_ann_params(self, db: AsyncSession, ef_search: int):
+        # SET LOCAL: 현재 트랜잭션에만 적용
+        await db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+        if settings.VECTOR_ITERATIVE_SCAN in ITERATIVE_SCAN_MODES:
+            # pgvector 0.8+ : 필터로 후보가 모자라면 인덱스를 계속 탐색
+            await db.execute(text(f"SET LOCAL hnsw.iterative_scan = {settings.VECTOR_ITERATIVE_SCAN}"))
+
+    async def _ann_execute(self, db: AsyncSession, stmt: Any, limit: int, selectivity: float, expected: int) -> List[Any]:
+        """
+        ef_search 를 설정하고 ANN 쿼리(_ann_ranked 기반) 실행
+        - 필터 때문에 결과가 limit (또는 조건을 만족하는 전체 행 수)보다 적으면 ef_search 를 키워 재조회
+        """
+        ef_search = self._ef_search(self._candidate_count(limit), selectivity)
+        target = limit if expected < 0 else min(limit, expected)
+        rows: List[Any] = []
+        for attempt in range(settings.VECTOR_REFILL_ATTEMPTS + 1):
+            await self._set_ann_params(db, ef_search)
+            rows = (await db.execute(stmt)).all()
+            if len(rows) >= target or ef_search >= settings.VECTOR_EF_SEARCH_MAX:
+                break
+            ef_search = min(ef_search * 4, settings.VECTOR_EF_SEARCH_MAX)
+            logger.info(f"♻️ ANN refill: {len(rows)}/{target} rows, retrying with ef_search={ef_search}")
+        return rows
+
+    async def _hydrate(self, db: AsyncSession, product_ids: List[int]) -> Dict[int, Product]:
+        """복제본 검색 결과 id -> 상품 (복제본이 약간 늦을 수 있으므로 판매 상태는 DB 기준으로 다시 확인)"""
+        if not product_ids:
+            return {}
+        stmt = select(Product).options(*LIST_LOAD_OPTIONS).where(
+            Product.id.in_(product_ids),
+            Product.is_active == True,
+            Product.deleted_at.is_(None)
+        )
+        return {product.id: product for product in (await db.execute(stmt)).scalars().all()}
+
+    async def get_by_ids(self, db: AsyncSession, product_ids: List[int]) -> List[Product]:
+        """id 순서를 유지한 판매 중 상품 목록 (캐시된 검색 결과 복원용)"""
+        products = await self._hydrate(db, product_ids)
+        return [products[product_id] for product_id in product_ids if product_id in products]
+
+    async def _vector_search(
+        self,
+        db: AsyncSession,
+        column: str,
+        vector: List[float],
+        limit: int,
+        filter_gender: Optional[str] = None,
+        include_category: Optional[List[str]] = None,
+        exclude_category: Optional[List[str]] = None,
+        exclude_id: Optional[List[int]] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None
+    ) -> List[Tuple[Product, float]]:
+        """
+        (상품, 코사인 거리) 목록 - 거리 오름차순
+        1) 프로세스 내부 벡터 복제본이 준비되어 있으면 복제본에서 id 를 찾고 상품 행만 id 로 조회
+        2) 아니면 DB ANN (비트 인덱스 후보 + 재정렬, ef_search 조정/재조회)
+        """
+        filters = dict(
+            filter_gender=filter_gender,
+            include_category=include_category,
+            exclude_category=exclude_category,
+            exclude_id=exclude_id,
+            min_price=min_price,
+            max_price=max_price
+        )
+
+        ranked_ids = await vector_replica.search(column, vector, limit, **filters)
+        if ranked_ids is not None:
+            if not ranked_ids:
+                return []
+            products = await self._hydrate(db, [product_id for product_id, _ in ranked_ids])
+            return [
+                (products[product_id], distance)
+                for product_id, distance in ranked_ids
+                if product_id in products
+            ]
+
+        ranked = self._ann_ranked(column, vector, self._ann_conditions(**filters), limit)
+        stmt = select(Product, ranked.c.distance).options(*LIST_LOAD_OPTIONS).join(
+            ranked, Product.id == ranked.c.id
+        ).order_by(ranked.c.distance)
+
+        selectivity, expected = await self._ann_selectivity(
+            db, column, filter_gender, include_category, exclude_category,
+            has_price_filter=min_price is not None or max_price is not None
+        )
+        rows = await self._ann_execute(db, stmt, limit, selectivity, expected)
+        return [(row[0], float(row[1]) if row[1] is not None else 1.0) for row in rows]
+
+    # -------------------------------------------------------
+    # ✅ [NEW] CLIP 이미지 벡터 기반 검색 (시각적 유사도)
+    # -------------------------------------------------------
+    async def search_by_clip_vector(
+        self, 
+        db: AsyncSession, 
+        clip_vector: List[float], 
+        limit: int = 12,
+        filter_gender: Optional[str] = None,
+        exclude_category: Optional[List[str]] = None,
+        exclude_id: Optional[List[int]] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        include_category: Optional[List[str]] = None
+    ) -> List[Product]:
+        """
+        ✅ CLIP 이미지 벡터(512차원)로 시각적 유사도 검색
+        - 연예인 패션 검색 등 이미지 기반 검색에 사용
+        - embedding_clip 컬럼 사용
+        - 성별/카테고리 필터는 부분 HNSW 인덱스로 처리, 결과가 모자라면 ef_search 를 키워 재조회
+        """
+        if not clip_vector or len(clip_vector) != 512:
+            logger.warning("❌ Invalid CLIP vector (expected 512 dims)")
+            return []
         
-        result = await db.execute(stmt)
-        rows = result.all()
+        # ✅ 코사인 거리 (거리가 작을수록 유사) - 복제본 또는 비트 인덱스 후보를 원본 벡터로 재정렬
+        rows = await self._vector_search(
+            db, 'embedding_clip', clip_vector, limit,
+            filter_gender=filter_gender,
+            include_category=include_category,
+            exclude_category=exclude_category,
+            exclude_id=exclude_id,
+            min_price=min_price,
+            max_price=max_price
+        )
         
         # ✅ 유사도 점수 상세 로깅
         products = []
@@ -285,9 +667,7 @@ class CRUDProduct:
         logger.info("=" * 70)
         
         total_similarity = 0
-        for i, row in enumerate(rows):
-            product = row[0]
-            distance = float(row[1]) if row[1] is not None else 1.0
+        for i, (product, distance) in enumerate(rows):
             similarity = 1.0 - distance  # 코사인 유사도 = 1 - 거리
             total_similarity += similarity
             
@@ -314,6 +694,107 @@ class CRUDProduct:
         
         return products
 
+    # -------------------------------------------------------
+    # 👗 코디 이미지 검색 (전신/상의/하의 CLIP 벡터 동시 점수화)
+    # -------------------------------------------------------
+    async def search_outfit(
+        self,
+        db: AsyncSession,
+        vectors: Dict[str, List[float]],
+        limit: int = 12,
+        weights: Optional[Dict[str, float]] = None,
+        categories: Optional[Dict[str, Optional[List[str]]]] = None,
+        filter_gender: Optional[str] = None,
+        exclude_id: Optional[List[int]] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        candidate_k: int = 50
+    ) -> List[Product]:
+        """
+        코디 단위 이미지 검색
+        - vectors: {"full" | "upper" | "lower": CLIP 벡터(512)}, 주어진 영역만 사용
+        - 영역별로 embedding_clip / embedding_clip_upper / embedding_clip_lower 와 비교 (OUTFIT_REGIONS)
+        - 영역별 카테고리 제한 (기본: 상의 영역 -> Tops/Outerwear/Dresses, 하의 영역 -> Bottoms)
+        - score = Σ weight x 코사인 유사도 (영역별 상위 candidate_k 후보)
+        - 복제본이 준비되어 있으면 메모리에서, 아니면 DB 왕복 1회로 계산
+        - 결과 Product 에 similarity(영역별 최고 유사도) 속성을 채워 반환
+        """
+        weights = weights or {}
+        categories = categories or {}
+        regions = []
+        for region, (column, default_weight, default_categories) in OUTFIT_REGIONS.items():
+            vector = vectors.get(region)
+            weight = weights.get(region, default_weight)
+            if not vector or len(vector) != VECTOR_DIMS[column] or weight <= 0:
+                continue
+            regions.append((region, column, vector, weight, categories.get(region, default_categories)))
+        if not regions:
+            return []
+
+        filters = dict(filter_gender=filter_gender, exclude_id=exclude_id, min_price=min_price, max_price=max_price)
+
+        # 1) 프로세스 내부 복제본
+        region_hits = []
+        for region, column, vector, weight, include in regions:
+            hits = await vector_replica.search(column, vector, candidate_k, include_category=include, **filters)
+            if hits is None:
+                break
+            region_hits.append((weight, hits))
+        else:
+            scores: Dict[int, List[float]] = {}
+            for weight, hits in region_hits:
+                for product_id, distance in hits:
+                    entry = scores.setdefault(product_id, [0.0, 0.0])
+                    entry[0] += weight * (1.0 - distance)
+                    entry[1] = max(entry[1], 1.0 - distance)
+            top = sorted(scores.items(), key=lambda item: (-item[1][0], item[0]))[:limit]
+            products = await self._hydrate(db, [product_id for product_id, _ in top])
+            results = []
+            for product_id, (_, similarity) in top:
+                if product_id in products:
+                    products[product_id].similarity = round(similarity, 4)
+                    results.append(products[product_id])
+            logger.info(f"👗 Outfit search (replica): regions={[r[0] for r in regions]}, results={len(results)}")
+            return results
+
+        # 2) DB: 영역별 ANN 서브쿼리를 UNION ALL 후 상품별 합산 (단일 쿼리)
+        scored_parts = []
+        ef_search = 0
+        has_price_filter = min_price is not None or max_price is not None
+        for region, column, vector, weight, include in regions:
+            conditions = self._ann_conditions(include_category=include, **filters)
+            ranked = self._ann_ranked(column, vector, conditions, candidate_k, name=f'{region}_ann')
+            similarity = 1 - ranked.c.distance
+            scored_parts.append(select(ranked.c.id, (weight * similarity).label('score'), similarity.label('sim')))
+
+            selectivity, _ = await self._ann_selectivity(
+                db, column, filter_gender, include_category=include, has_price_filter=has_price_filter
+            )
+            ef_search = max(ef_search, self._ef_search(self._candidate_count(candidate_k), selectivity))
+        await self._set_ann_params(db, ef_search)
+
+        scored = union_all(*scored_parts).subquery('outfit_scored')
+        fused = select(
+            scored.c.id,
+            func.sum(scored.c.score).label('score'),
+            func.max(scored.c.sim).label('sim')
+        ).group_by(scored.c.id).subquery('outfit_fused')
+
+        stmt = (
+            select(Product, fused.c.sim)
+            .options(*LIST_LOAD_OPTIONS)
+            .join(fused, Product.id == fused.c.id)
+            .order_by(fused.c.score.desc(), Product.id)
+            .limit(limit)
+        )
+        results = []
+        for product, similarity in (await db.execute(stmt)).all():
+            product.similarity = round(float(similarity), 4) if similarity is not None else None
+            results.append(product)
+
+        logger.info(f"👗 Outfit search: regions={[r[0] for r in regions]}, results={len(results)}")
+        return results
+
     # -------------------------------------------------------
     # 🔧 [UPDATED] 기존 하이브리드 검색 - exclude 파라미터 추가
     # -------------------------------------------------------
@@ -359,36 +840,29 @@ class CRUDProduct:
         if exclude_id:
             base_conditions.append(Product.id.notin_(exclude_id))
 
+        # 벡터 검색용 필터 (복제본 / 부분 HNSW 인덱스 공통)
+        ann_filters = dict(
+            filter_gender=filter_gender,
+            exclude_category=exclude_category,
+            exclude_id=exclude_id,
+            min_price=min_price,
+            max_price=max_price
+        )
+
         # BERT 벡터 우선
         if bert_vector and len(bert_vector) == 768:
-            stmt = select(Product).where(
-                *base_conditions,
-                Product.embedding.is_not(None)
-            )
-            dist = Product.embedding.cosine_distance(bert_vector)
-            stmt = stmt.order_by(dist).limit(limit)
-            
-            result = await db.execute(stmt)
-            results = list(result.scalars().all())
+            results = [product for product, _ in await self._vector_search(db, 'embedding', bert_vector, limit, **ann_filters)]
             if results:
                 return results
 
         # CLIP 벡터 (512차원)
         if clip_vector and len(clip_vector) == 512:
-            stmt = select(Product).where(
-                *base_conditions,
-                Product.embedding_clip.is_not(None)
-            )
-            dist = Product.embedding_clip.cosine_distance(clip_vector)
-            stmt = stmt.order_by(dist).limit(limit)
-            
-            result = await db.execute(stmt)
-            results = list(result.scalars().all())
+            results = [product for product, _ in await self._vector_search(db, 'embedding_clip', clip_vector, limit, **ann_filters)]
             if results:
                 return results
 
         # Fallback
-        stmt = select(Product).where(*base_conditions)
+        stmt = select(Product).options(*LIST_LOAD_OPTIONS).where(*base_conditions)
         stmt = stmt.order_by(Product.created_at.desc()).limit(limit)
         result = await db.execute(stmt)
         return list(result.scalars().all())
@@ -413,44 +887,15 @@ class CRUDProduct:
         if not query_vector or len(query_vector) == 0:
             return await self.get_multi(db, limit=limit)
         
-        conditions = [
-            Product.is_active == True,
-            Product.deleted_at.is_(None),
-            Product.embedding.is_not(None)
-        ]
-        
-        # 카테고리 제외
-        if exclude_category:
-            for cat in exclude_category:
-                conditions.append(Product.category != cat)
-        
-        # ID 제외
-        if exclude_id:
-            conditions.append(Product.id.notin_(exclude_id))
-        
-        # 가격 범위
-        if min_price is not None:
-            conditions.append(Product.price >= min_price)
-        if max_price is not None:
-            conditions.append(Product.price <= max_price)
-        
-        # ✅ 추가: 성별 필터
-        if filter_gender:
-            conditions.append(
-                or_(
-                    Product.gender == filter_gender,
-                    Product.gender == 'Unisex',
-                    Product.gender.is_(None)
-                )
-            )
-        
-        stmt = select(Product).where(*conditions)
-        
-        dist = Product.embedding.cosine_distance(query_vector)
-        stmt = stmt.order_by(dist).limit(limit)
-        
-        result = await db.execute(stmt)
-        return list(result.scalars().all())
+        rows = await self._vector_search(
+            db, 'embedding', query_vector, limit,
+            filter_gender=filter_gender,
+            exclude_category=exclude_category,
+            exclude_id=exclude_id,
+            min_price=min_price,
+            max_price=max_price
+        )
+        return [product for product, _ in rows]
     
     # -------------------------------------------------------
     # 키워드 검색
@@ -464,7 +909,7 @@ class CRUDProduct:
     ) -> List[Product]:
         """키워드 검색"""
         search_pattern = f"%{query}%"
-        stmt = select(Product).where(
+        stmt = select(Product).options(*LIST_LOAD_OPTIONS).where(
             Product.is_active == True,
             Product.deleted_at.is_(None),
             or_(
@@ -1,6 +1,8 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from src.config.settings import settings
+from src.db.vector import register_vector_codec
 
 # 비동기 엔진 생성
 # pool_pre_ping=True: 연결 끊김 시 자동 복구 (Production 필수)
@@ -13,6 +15,11 @@ engine = create_async_engine(
     future=True
 )
 
+# 새 연결마다 pgvector 바이너리 코덱 등록 (벡터를 텍스트 변환 없이 float32 배열로 주고받음)
+@event.listens_for(engine.sync_engine, "connect")
+def _register_vector_codec(dbapi_connection, connection_record):
+    dbapi_connection.run_async(register_vector_codec)
+
 # 비동기 세션 팩토리
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -0,0 +1,41 @@
+import logging
+
+import numpy as np
+from pgvector.asyncpg import register_vector
+from pgvector.sqlalchemy import Vector as _PgVector
+
+logger = logging.getLogger(__name__)
+
+
+class Vector(_PgVector):
+    """
+    pgvector 컬럼 타입 (asyncpg 바이너리 코덱 사용)
+    - asyncpg: 문자열 "[0.1,...]" 대신 float32 배열을 그대로 넘기고, 코덱이 바이너리로 인코딩
+    - 조회 결과는 코덱이 바로 float32 numpy 배열로 디코딩 (텍스트 파싱 없음)
+    - 그 외 드라이버(psycopg2 등)는 pgvector 기본 텍스트 변환 사용
+    """
+
+    def bind_processor(self, dialect):
+        if dialect.driver != "asyncpg":
+            return super().bind_processor(dialect)
+        dim = self.dim
+
+        def process(value):
+            if value is None:
+                return None
+            array = np.asarray(value, dtype=np.float32)
+            if array.ndim != 1 or (dim is not None and array.shape[0] != dim):
+                raise ValueError(f"expected {dim} dimensions, not {array.shape}")
+            return array
+
+        return process
+
+
+async def register_vector_codec(connection) -> bool:
+    """asyncpg 연결에 pgvector 바이너리 코덱 등록 (vector 확장이 없으면 건너뜀)"""
+    try:
+        await register_vector(connection)
+        return True
+    except ValueError as e:
+        logger.warning(f"⚠️ pgvector codec not registered (extension missing?): {e}")
+        return False
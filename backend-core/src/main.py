@@ -10,6 +10,8 @@ from fastapi.staticfiles import StaticFiles
 from src.config.settings import settings
 from src.core.security import setup_superuser
 from src.db.session import engine, async_session_maker
+from src.services.ai_client import ai_client
+from src.services.vector_replica import vector_replica
 from src.middleware.exception_handler import global_exception_handler
 from src.api.v1 import api_router
 
@@ -33,6 +35,9 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Redis Connection Failed. Rate Limiter will be inactive: {e}")
     
+    # [Startup 1-1] AI 서비스 공유 HTTP 클라이언트 (커넥션 풀 재사용)
+    await ai_client.start()
+    
     # [Startup 2] 초기 관리자 계정 생성 및 DB 유효성 검사
     async with async_session_maker() as session:
         try:
@@ -41,6 +46,9 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"❌ Failed to set up superuser (DB Error likely): {e}")
 
+    # [Startup 2-1] 프로세스 내부 벡터 복제본 (VECTOR_REPLICA_ENABLED, 로드는 백그라운드)
+    await vector_replica.start()
+
     # [Startup 3] AI 모델 프리로딩 (선택사항: 필요시 주석 해제)
     # try:
     #     from src.core.model_engine import ModelEngine
@@ -52,6 +60,8 @@ async def lifespan(app: FastAPI):
     yield # 애플리케이션 실행 구간
 
     # [Shutdown] 리소스 해제
+    await vector_replica.stop()
+    await ai_client.close()
     if redis_connection:
         await redis_connection.close()
     await engine.dispose()
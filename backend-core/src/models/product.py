@@ -1,10 +1,12 @@
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import String, Integer, Boolean, TIMESTAMP, Text, CheckConstraint, Index, text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, Boolean, TIMESTAMP, Text, CheckConstraint, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.ext.associationproxy import association_proxy, AssociationProxy
 from sqlalchemy.sql import func
-from pgvector.sqlalchemy import Vector
 from src.db.session import Base 
+from src.models.product_embedding import ProductEmbedding
 from src.config.settings import settings
 
 class Product(Base):
@@ -23,17 +25,36 @@ class Product(Base):
     # [수정] 성별 필터링 (기본값 Unisex 설정)
     gender: Mapped[Optional[str]] = mapped_column(String(20), index=True, default="Unisex", nullable=True)
 
-    # [Existing] BERT Vector (768차원 - Text Context)
-    embedding: Mapped[Optional[List[float]]] = mapped_column(Vector(768))
-
-    # [Existing] CLIP Vector (512차원 - Visual Context, 전체 이미지)
-    embedding_clip: Mapped[Optional[List[float]]] = mapped_column(Vector(512))
-
-    # ✅ [NEW] CLIP Upper Vector (512차원 - 상의 영역)
-    embedding_clip_upper: Mapped[Optional[List[float]]] = mapped_column(Vector(512))
+    # 벡터는 product_embeddings 테이블에 분리 저장 (1:1)
+    # - 단건 조회 시 selectin 으로 함께 로드, 목록/검색은 crud 의 LIST_LOAD_OPTIONS 로 로드하지 않음
+    # - product.embedding 등 기존 속성명은 프록시로 유지 (값 설정 시 ProductEmbedding 자동 생성)
+    vectors: Mapped[Optional[ProductEmbedding]] = relationship(
+        ProductEmbedding, uselist=False, lazy="selectin", cascade="all, delete-orphan", passive_deletes=True
+    )
+    embedding: AssociationProxy[Optional[List[float]]] = association_proxy(
+        "vectors", "embedding", creator=lambda v: ProductEmbedding(embedding=v)
+    )
+    embedding_clip: AssociationProxy[Optional[List[float]]] = association_proxy(
+        "vectors", "embedding_clip", creator=lambda v: ProductEmbedding(embedding_clip=v)
+    )
+    embedding_clip_upper: AssociationProxy[Optional[List[float]]] = association_proxy(
+        "vectors", "embedding_clip_upper", creator=lambda v: ProductEmbedding(embedding_clip_upper=v)
+    )
+    embedding_clip_lower: AssociationProxy[Optional[List[float]]] = association_proxy(
+        "vectors", "embedding_clip_lower", creator=lambda v: ProductEmbedding(embedding_clip_lower=v)
+    )
 
-    # ✅ [NEW] CLIP Lower Vector (512차원 - 하의 영역)
-    embedding_clip_lower: Mapped[Optional[List[float]]] = mapped_column(Vector(512))
+    # 키워드 검색용 bigram tsvector (DB generated column, 조회 시 로드하지 않음)
+    search_bigrams: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(korean_bigram_tsvector(name), 'A') || "
+            "setweight(korean_bigram_tsvector(category), 'B') || "
+            "setweight(korean_bigram_tsvector(description), 'C')",
+            persisted=True
+        ),
+        deferred=True
+    )
 
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
@@ -51,40 +72,24 @@ class Product(Base):
         CheckConstraint('stock_quantity >= 0', name='check_stock_positive'),
         CheckConstraint("gender IN ('Male', 'Female', 'Unisex', NULL)", name='check_gender_valid'),
         
-        # 1. BERT Index (HNSW - 고성능 검색용)
-        Index(
-            'ix_product_embedding_hnsw',
-            'embedding',
-            postgresql_using='hnsw',
-            postgresql_with={'m': 32, 'ef_construction': 128},
-            postgresql_ops={'embedding': 'vector_cosine_ops'},
-            postgresql_where=text("deleted_at IS NULL")
-        ),
-        # 2. CLIP Index (전체 이미지)
-        Index(
-            'ix_product_embedding_clip_hnsw',
-            'embedding_clip',
-            postgresql_using='hnsw',
-            postgresql_with={'m': 32, 'ef_construction': 128},
-            postgresql_ops={'embedding_clip': 'vector_cosine_ops'},
-            postgresql_where=text("deleted_at IS NULL")
-        ),
-        # 3. ✅ [NEW] CLIP Upper Index (상의)
+        # 벡터 HNSW 인덱스는 product_embeddings 테이블에 있음
+
+        # 1. 키워드 검색 (bigram 전문 검색)
         Index(
-            'ix_product_embedding_clip_upper_hnsw',
-            'embedding_clip_upper',
-            postgresql_using='hnsw',
-            postgresql_with={'m': 32, 'ef_construction': 128},
-            postgresql_ops={'embedding_clip_upper': 'vector_cosine_ops'},
+            'ix_product_search_bigrams_gin',
+            'search_bigrams',
+            postgresql_using='gin',
             postgresql_where=text("deleted_at IS NULL")
         ),
-        # 4. ✅ [NEW] CLIP Lower Index (하의)
-        Index(
-            'ix_product_embedding_clip_lower_hnsw',
-            'embedding_clip_lower',
-            postgresql_using='hnsw',
-            postgresql_with={'m': 32, 'ef_construction': 128},
-            postgresql_ops={'embedding_clip_lower': 'vector_cosine_ops'},
-            postgresql_where=text("deleted_at IS NULL")
+        # 2. 부분 문자열 검색 (pg_trgm, ILIKE '%kw%')
+        *(
+            Index(
+                f'ix_product_{column}_trgm',
+                column,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_where=text("deleted_at IS NULL")
+            )
+            for column in ('name', 'description', 'category')
         ),
     )
\ No newline at end of file
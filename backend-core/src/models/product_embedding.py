@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import Optional, List
+from sqlalchemy import String, Integer, Boolean, TIMESTAMP, ForeignKey, Index, text
+from sqlalchemy.orm import Mapped, mapped_column, validates
+from sqlalchemy.sql import func
+from src.db.vector import Vector
+from src.db.session import Base
+from src.config.settings import settings
+from src.constants import ProductCategory
+from src.utils.vector import l2_normalize
+
+VECTOR_COLUMNS = ('embedding', 'embedding_clip', 'embedding_clip_upper', 'embedding_clip_lower')
+VECTOR_DIMS = {'embedding': 768, 'embedding_clip': 512, 'embedding_clip_upper': 512, 'embedding_clip_lower': 512}
+
+# 부분 HNSW 인덱스가 있는 필터 값 (조건식은 crud 의 ANN 필터와 같은 형태여야 인덱스가 선택됨)
+ANN_PARTIAL_GENDERS = ('Male', 'Female')
+ANN_PARTIAL_CATEGORIES = tuple(ProductCategory.list())
+
+
+def binary_quantized_expr(column: str) -> str:
+    # HNSW 인덱스 식 (crud 의 1차 후보 조회 ORDER BY 식과 같아야 인덱스 사용)
+    return f"(binary_quantize({column})::bit({VECTOR_DIMS[column]}))"
+
+
+def _bq_index(name: str, column: str, where: Optional[str] = None, m: int = 16, ef_construction: int = 64) -> Index:
+    return Index(
+        name,
+        text(f"{binary_quantized_expr(column)} bit_hamming_ops"),
+        postgresql_using='hnsw',
+        postgresql_with={'m': m, 'ef_construction': ef_construction},
+        postgresql_where=text(where) if where else None
+    )
+
+class ProductEmbedding(Base):
+    """
+    상품 벡터 전용 테이블 (products 1:1)
+    - products 행을 가볍게 유지하기 위해 분리, 벡터 검색 시에만 JOIN
+    - 벡터는 저장 시 L2 정규화 -> 내적(<#>)으로 코사인 순위 계산
+    - 인덱스는 binary_quantize 비트 벡터 HNSW (해밍 거리 1차 후보 -> 원본 벡터로 재정렬)
+    """
+    __tablename__ = "product_embeddings"
+
+    # 상품 삭제 시 자동 삭제
+    product_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    # BERT Vector (768차원 - Text Context)
+    embedding: Mapped[Optional[List[float]]] = mapped_column(Vector(768))
+
+    # CLIP Vector (512차원 - Visual Context, 전체 / 상의 / 하의)
+    embedding_clip: Mapped[Optional[List[float]]] = mapped_column(Vector(512))
+    embedding_clip_upper: Mapped[Optional[List[float]]] = mapped_column(Vector(512))
+    embedding_clip_lower: Mapped[Optional[List[float]]] = mapped_column(Vector(512))
+
+    # 임베딩 생성 모델 버전 (모델 교체 시 재생성 대상 식별)
+    model_version: Mapped[str] = mapped_column(
+        String(100), nullable=False, server_default="v1",
+        default=lambda: settings.EMBEDDING_MODEL_VERSION, onupdate=lambda: settings.EMBEDDING_MODEL_VERSION
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    # 필터용 비정규화 컬럼 (DB 트리거가 products 값으로 채우고 동기화, 앱에서 직접 쓰지 않음)
+    gender: Mapped[Optional[str]] = mapped_column(String(20))
+    category: Mapped[Optional[str]] = mapped_column(String(100))
+    price: Mapped[Optional[int]] = mapped_column(Integer)
+    is_listed: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("true"))
+
+    @validates(*VECTOR_COLUMNS)
+    def _normalize_vector(self, key, value):
+        return l2_normalize(value) if value is not None and len(value) > 0 else value
+
+    __table_args__ = (
+        # 전체 인덱스
+        *(
+            _bq_index(f'ix_product_embeddings_{column}_bq_hnsw', column, m=32, ef_construction=128)
+            for column in VECTOR_COLUMNS
+        ),
+        # 성별 부분 인덱스 (Unisex / 미지정 포함)
+        *(
+            _bq_index(
+                f'ix_product_embeddings_{column}_{gender.lower()}_bq_hnsw',
+                column,
+                where=f"is_listed AND (gender = '{gender}' OR gender = 'Unisex' OR gender IS NULL)"
+            )
+            for column in VECTOR_COLUMNS
+            for gender in ANN_PARTIAL_GENDERS
+        ),
+        # 카테고리 부분 인덱스 (CLIP 전체 이미지)
+        *(
+            _bq_index(
+                f'ix_product_embeddings_embedding_clip_{category.lower()}_bq_hnsw',
+                'embedding_clip',
+                where=f"is_listed AND category = '{category}'"
+            )
+            for category in ANN_PARTIAL_CATEGORIES
+        ),
+    )
@@ -29,6 +29,8 @@ class ProductResponse(ProductBase):
     gender: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    # 검색 점수 (0~1, 검색 결과에만 채워짐)
+    similarity: Optional[float] = None
     
     # [FIX] DB 컬럼이 아닌 계산된 필드로 변경하여 에러 방지
     @computed_field
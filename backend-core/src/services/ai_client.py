@@ -0,0 +1,179 @@
+# backend-core/src/services/ai_client.py
+
+import asyncio
+import logging
+import random
+import uuid
+from typing import Any, Dict, List, Optional
+
+import httpx
+from src.config.settings import settings
+from src.utils.vector import VECTOR_MEDIA_TYPE, decode_vectors
+
+logger = logging.getLogger(__name__)
+
+
+class AIServiceClient:
+    """
+    Backend -> AI 서비스 호출용 공유 HTTP 클라이언트
+    - 애플리케이션 수명 동안 하나의 커넥션 풀을 재사용 (keep-alive)
+    - 엔드포인트별 기본 타임아웃 적용 (호출 시 timeout 인자로 재정의 가능)
+    - main.lifespan 에서 start/close, 라우터에서는 deps.get_ai_client 로 주입
+    """
+
+    # 엔드포인트별 읽기 타임아웃 (초)
+    ENDPOINT_TIMEOUTS: Dict[str, float] = {
+        "/embed-text": 10.0,
+        "/embed-text-batch": 60.0,
+        "/llm-generate-response": 30.0,
+        "/analyze-image": 60.0,
+        "/analyze-image-detail": 60.0,
+        "/generate-clip-vector": 30.0,
+        "/generate-fashion-clip-vector": 30.0,
+        "/generate-fashion-clip-vectors": 30.0,
+        "/determine-path": 10.0,
+        "/process-internal": 30.0,
+        "/process-external": 120.0,
+        "/search-plan": 130.0,
+    }
+
+    # 재시도 대상: 연결/타임아웃 오류 및 게이트웨이 계열 응답만 (4xx, 500은 재시도해도 결과가 같음)
+    RETRYABLE_STATUS = {502, 503, 504}
+    RETRY_BASE_DELAY = 0.3
+    RETRY_MAX_DELAY = 3.0
+
+    def __init__(self, base_url: str = settings.AI_SERVICE_API_URL):
+        self.base_url = base_url.rstrip("/")
+        self._client: Optional[httpx.AsyncClient] = None
+        self.http2 = False
+        # 벡터 압축 전송 협상용 Accept 헤더 (json 이면 사용 안 함)
+        encoding = settings.AI_VECTOR_ENCODING
+        self.vector_accept = (
+            f"{VECTOR_MEDIA_TYPE}; encoding={encoding}, application/json;q=0.9" if encoding != "json" else None
+        )
+
+    def _build_client(self) -> httpx.AsyncClient:
+        http2 = settings.AI_CLIENT_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("⚠️ h2 package not installed. AI client falls back to HTTP/1.1.")
+                http2 = False
+        self.http2 = http2
+
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=http2,
+            timeout=httpx.Timeout(settings.AI_CLIENT_DEFAULT_TIMEOUT, connect=settings.AI_CLIENT_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.AI_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.AI_CLIENT_MAX_KEEPALIVE,
+                keepalive_expiry=30.0,
+            ),
+        )
+
+    async def start(self):
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+            logger.info(f"✅ AI Service client ready ({self.base_url}, http2={self.http2})")
+
+    async def close(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # lifespan 밖(스크립트, 테스트 등)에서 호출되어도 동작하도록 지연 생성
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    def _timeout(self, path: str, timeout: Optional[float]) -> httpx.Timeout:
+        read_timeout = timeout if timeout is not None else self.ENDPOINT_TIMEOUTS.get(path, settings.AI_CLIENT_DEFAULT_TIMEOUT)
+        return httpx.Timeout(read_timeout, connect=settings.AI_CLIENT_CONNECT_TIMEOUT)
+
+    # -----------------------------------------------------------
+    # Raw 호출
+    # -----------------------------------------------------------
+    async def post(self, path: str, *, timeout: Optional[float] = None, **kwargs) -> httpx.Response:
+        """
+        AI 서비스 API 호출 (path는 /api/v1 이하 경로, 예: "/embed-text")
+        - AI_VECTOR_ENCODING 이 f32/f16 이면 벡터를 base64 로 받고 res.json() 에서 list 로 복원
+        """
+        if self.vector_accept:
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers.setdefault("Accept", self.vector_accept)
+            kwargs["headers"] = headers
+        response = await self.client.post(path, timeout=self._timeout(path, timeout), **kwargs)
+        return self._decode_vectors(response)
+
+    @staticmethod
+    def _decode_vectors(response: httpx.Response) -> httpx.Response:
+        content_type = response.headers.get("content-type", "")
+        if not content_type.startswith(VECTOR_MEDIA_TYPE):
+            return response
+        raw_json = response.json
+        response.json = lambda **kwargs: decode_vectors(raw_json(**kwargs))
+        return response
+
+    async def get(self, url: str, *, timeout: Optional[float] = None, **kwargs) -> httpx.Response:
+        """GET 요청 (절대 URL이면 외부 주소로 요청, 예: 상품 이미지 다운로드)"""
+        return await self.client.get(url, timeout=self._timeout(url, timeout), **kwargs)
+
+    # -----------------------------------------------------------
+    # 자주 쓰는 호출 (실패 시 기본값 반환)
+    # -----------------------------------------------------------
+    async def embed_text(self, text: str, timeout: Optional[float] = None) -> List[float]:
+        try:
+            res = await self.post("/embed-text", json={"text": text}, timeout=timeout)
+            if res.status_code == 200:
+                return res.json().get("vector", [])
+        except httpx.HTTPError as e:
+            logger.error(f"❌ AI embed-text failed: {e}")
+        return []
+
+    async def generate_text(self, prompt: str, timeout: Optional[float] = None) -> Optional[str]:
+        try:
+            res = await self.post("/llm-generate-response", json={"prompt": prompt}, timeout=timeout)
+            if res.status_code == 200:
+                return res.json().get("answer")
+        except httpx.HTTPError as e:
+            logger.error(f"❌ AI llm-generate-response failed: {e}")
+        return None
+
+    async def search_plan(self, query: str, image_b64: Optional[str] = None, max_attempts: int = 3) -> Dict[str, Any]:
+        """
+        /search-plan 호출 (경로 결정 + 벡터/분석 1회 왕복)
+        - 모든 시도에 같은 Idempotency-Key 사용: AI 서비스가 이미 처리했거나 처리 중인 요청은
+          외부 RAG(Google 쿼터 소모)를 다시 실행하지 않고 같은 결과를 돌려줌
+        - 전송 오류 / 502·503·504 에서만 지수 백오프(full jitter)로 재시도
+        """
+        headers = {"Idempotency-Key": uuid.uuid4().hex}
+        payload = {"query": query, "image_b64": image_b64}
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                res = await self.post("/search-plan", json=payload, headers=headers)
+                if res.status_code not in self.RETRYABLE_STATUS or attempt == max_attempts:
+                    res.raise_for_status()
+                    return res.json()
+                logger.warning(f"⚠️ search-plan {res.status_code}, retrying ({attempt}/{max_attempts})")
+            except httpx.TransportError as e:
+                if attempt == max_attempts:
+                    raise
+                logger.warning(f"⚠️ search-plan transport error, retrying ({attempt}/{max_attempts}): {e}")
+
+            delay = min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+            await asyncio.sleep(random.uniform(0, delay))
+
+        raise RuntimeError("search-plan retry loop exhausted")
+
+    async def embed_texts(self, texts: List[str], include_clip: bool = False) -> Dict[str, Any]:
+        res = await self.post("/embed-text-batch", json={"texts": texts, "include_clip": include_clip})
+        res.raise_for_status()
+        return res.json()
+
+
+ai_client = AIServiceClient()
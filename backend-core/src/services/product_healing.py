@@ -0,0 +1,96 @@
+# backend-core/src/services/product_healing.py
+
+import logging
+from typing import Any
+
+import redis.asyncio as redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.settings import settings
+from src.crud.crud_product import crud_product
+from src.services.ai_client import AIServiceClient
+
+logger = logging.getLogger(__name__)
+
+FAILED_DESCRIPTION = "AI 분석 실패"
+HEAL_LOCK_KEY = "heal:product:{product_id}"
+HEAL_TASK_NAME = "tasks.heal_product"
+
+# Redis 클라이언트 (상품별 복구 진행 중 잠금)
+redis_client = redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+
+
+def needs_healing(product: Any) -> bool:
+    """임베딩 누락 또는 설명 누락/분석 실패 여부"""
+    return (
+        product.embedding is None or
+        (hasattr(product.embedding, '__len__') and len(product.embedding) == 0) or
+        product.description == FAILED_DESCRIPTION or
+        not product.description
+    )
+
+
+async def enqueue_heal(product: Any) -> bool:
+    """
+    Self-Healing 백그라운드 예약 (GET 요청은 현재 데이터로 즉시 응답)
+    - Redis SET NX 잠금으로 상품당 한 번만 예약 (동시 조회자가 같은 복구를 중복 실행하지 않음)
+    - 잠금은 복구 성공 시 해제, 실패 시 TTL 만료까지 유지 (AI 장애 시 재시도 폭주 방지)
+    """
+    if product is None or not needs_healing(product):
+        return False
+
+    key = HEAL_LOCK_KEY.format(product_id=product.id)
+    try:
+        acquired = await redis_client.set(key, "queued", nx=True, ex=settings.PRODUCT_HEAL_LOCK_TTL)
+    except Exception as e:
+        logger.warning(f"⚠️ Heal lock unavailable, skipping heal for product {product.id}: {e}")
+        return False
+    if not acquired:
+        return False
+
+    try:
+        # celery_app 이 이 모듈을 사용하므로 태스크는 이름으로 전송
+        from src.core.celery_app import celery_app
+        celery_app.send_task(HEAL_TASK_NAME, args=[product.id])
+        logger.warning(f"🚑 [Self-Healing] Product ID {product.id} data missing. Repair queued.")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Failed to queue heal for product {product.id}: {e}")
+        await redis_client.delete(key)
+        return False
+
+
+async def heal_product(db: AsyncSession, product_id: int, ai: AIServiceClient) -> bool:
+    """상품 데이터(임베딩, 설명) 누락 시 AI 서비스로 복구 (Celery 워커에서 실행)"""
+    product = await crud_product.get(db, product_id=product_id)
+    if not product or not needs_healing(product):
+        return True
+
+    logger.info(f"🚑 [Self-Healing] Product ID {product.id} recovery started.")
+
+    new_description = product.description
+    # 1. 텍스트 생성 복구
+    if not product.description or product.description == FAILED_DESCRIPTION:
+        prompt = f"상품명: {product.name}, 카테고리: {product.category}. 매력적인 쇼핑몰 상세 설명을 5문장 작성해줘."
+        new_description = await ai.generate_text(prompt, timeout=20.0) or product.name
+
+    # 2. 임베딩 복구
+    text_to_embed = f"{product.name} {product.category} {new_description}"
+    new_vector = await ai.embed_text(text_to_embed)
+
+    # 3. DB 업데이트
+    if not new_vector:
+        logger.error(f"❌ Product {product.id} heal failed (embedding unavailable).")
+        return False
+
+    update_data = {"embedding": new_vector}
+    if new_description != product.description:
+        update_data["description"] = new_description
+    # 누락 데이터 보정은 검색 캐시를 비우지 않음 (힐링이 몰릴 때 모든 /ai-search 캐시가 무효화되지 않도록, 캐시는 TTL 로 갱신)
+    await crud_product.update(db, db_obj=product, obj_in=update_data, invalidate_search=False)
+    logger.info(f"✅ Product {product.id} healed.")
+    return True
+
+
+async def release_heal_lock(product_id: int):
+    await redis_client.delete(HEAL_LOCK_KEY.format(product_id=product_id))
@@ -0,0 +1,319 @@
+# backend-core/src/services/product_import.py
+
+import asyncio
+import base64
+import codecs
+import csv
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional
+
+import aiofiles
+import redis.asyncio as redis
+from fastapi import UploadFile
+from sqlalchemy import insert
+
+from src.config.settings import settings
+from src.db.session import async_session_maker
+from src.models.product import Product
+from src.models.product_embedding import ProductEmbedding
+from src.services.ai_client import AIServiceClient
+from src.services.search_cache import search_cache
+from src.utils.vector import l2_normalize
+
+logger = logging.getLogger(__name__)
+
+# 청크 단위: CSV 행 N개 -> /embed-text-batch 1회 + 다중 행 INSERT 1회
+CSV_IMPORT_CHUNK_SIZE = 256
+# 이미지 다운로드 + CLIP 벡터 생성 동시 실행 수
+CSV_IMAGE_CONCURRENCY = 8
+CSV_SPOOL_CHUNK_BYTES = 1024 * 1024
+CSV_MAX_ERRORS = 100
+PLACEHOLDER_IMAGE = "https://placehold.co/400x500?text=No+Image"
+
+IMPORT_STATUS_KEY = "product_import:{job_id}"
+IMPORT_STATUS_TTL = 60 * 60 * 24
+# 실행 중인 작업은 주기적으로 상태를 갱신 -> 갱신이 끊긴 작업(프로세스 재시작 등)은 실패로 보고
+IMPORT_HEARTBEAT_SECONDS = 15
+IMPORT_STALE_SECONDS = 120
+
+# Redis 클라이언트 (작업 상태 공유 - 어느 백엔드 인스턴스에서든 조회 가능)
+redis_client = redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+
+# 현재 프로세스에서 실행 중인 작업 (Task 참조 유지 + Redis 장애 시 상태 조회용)
+_jobs: Dict[str, Dict[str, Any]] = {}
+_tasks: Dict[str, asyncio.Task] = {}
+
+
+def sanitize_string(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.replace("\x00", "").strip()
+    return value
+
+
+def _to_int(raw: Any, default: int) -> int:
+    try:
+        return int(str(raw).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return default
+
+
+def _parse_row(row: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    name = row.get("name") or row.get("상품명")
+    if not name:
+        return None
+    return {
+        "name": sanitize_string(name),
+        "category": sanitize_string(row.get("category") or row.get("카테고리") or "Uncategorized"),
+        "description": sanitize_string(row.get("description") or row.get("설명") or ""),
+        "gender": sanitize_string(row.get("gender") or row.get("성별") or "Unisex"),
+        "price": _to_int(row.get("price") or row.get("가격") or "0", 0),
+        "stock_quantity": _to_int(row.get("stock_quantity") or row.get("재고") or "100", 100),
+        "image_url": sanitize_string(row.get("image_url") or row.get("이미지") or PLACEHOLDER_IMAGE),
+        "is_active": True,
+    }
+
+
+# -----------------------------------------------------------
+# CSV 스트리밍
+# -----------------------------------------------------------
+async def _spool_upload(file: UploadFile) -> str:
+    """업로드를 청크 단위로 임시 파일에 저장 (요청 종료 후에도 작업이 읽을 수 있도록)"""
+    fd, path = tempfile.mkstemp(prefix="product_import_", suffix=".csv")
+    os.close(fd)
+    async with aiofiles.open(path, "wb") as out:
+        while chunk := await file.read(CSV_SPOOL_CHUNK_BYTES):
+            await out.write(chunk)
+    return path
+
+
+def _detect_encoding(path: str) -> str:
+    # 앞부분만 디코딩해 판단 (UTF-8 실패 시 cp949 - euc-kr 상위 호환)
+    with open(path, "rb") as f:
+        head = f.read(64 * 1024)
+    try:
+        codecs.getincrementaldecoder("utf-8-sig")().decode(head, final=False)
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        return "cp949"
+
+
+def _iter_chunks(path: str, encoding: str) -> Iterator[List[Dict[str, Any]]]:
+    with open(path, newline="", encoding=encoding, errors="replace") as f:
+        chunk: List[Dict[str, Any]] = []
+        for row in csv.DictReader(f):
+            parsed = _parse_row(row)
+            if parsed:
+                chunk.append(parsed)
+            if len(chunk) >= CSV_IMPORT_CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+# -----------------------------------------------------------
+# 벡터 생성
+# -----------------------------------------------------------
+async def _bert_vectors(ai: AIServiceClient, rows: List[Dict[str, Any]]) -> List[List[float]]:
+    texts = [f"[{r['gender']}] {r['name']} {r['category']} {r['description']}" for r in rows]
+    try:
+        data = await ai.embed_texts(texts, include_clip=False)
+        vectors = data.get("bert") or []
+        # 개수가 다르면 어느 행의 벡터인지 알 수 없으므로 청크 전체를 벡터 없이 저장 (밀려서 다른 상품에 붙지 않도록)
+        if len(vectors) == len(rows):
+            return [vector or [] for vector in vectors]
+        logger.warning(f"⚠️ Batch embedding returned {len(vectors)} vectors for {len(rows)} rows. Skipping chunk vectors.")
+    except Exception as e:
+        logger.warning(f"⚠️ Batch embedding failed for {len(rows)} rows: {e}")
+    return [[] for _ in rows]
+
+
+async def _clip_vector(ai: AIServiceClient, semaphore: asyncio.Semaphore, image_url: str) -> List[float]:
+    if not image_url or image_url.startswith("https://placehold"):
+        return []
+    async with semaphore:
+        try:
+            img_response = await ai.get(image_url, timeout=10.0)
+            if img_response.status_code != 200:
+                return []
+            image_b64 = base64.b64encode(img_response.content).decode("utf-8")
+            clip_res = await ai.post("/generate-clip-vector", json={"image_b64": image_b64}, timeout=10.0)
+            if clip_res.status_code == 200:
+                return clip_res.json().get("vector", [])
+        except Exception as e:
+            logger.warning(f"⚠️ CLIP vector generation failed for {image_url}: {e}")
+    return []
+
+
+# -----------------------------------------------------------
+# 저장 (다중 행 INSERT)
+# -----------------------------------------------------------
+async def _insert_rows(rows: List[Dict[str, Any]], bert: List[List[float]], clip: List[List[float]]):
+    """
+    products / product_embeddings 다중 행 INSERT 후 한 번 커밋
+    - ORM validator 를 거치지 않으므로 벡터 정규화는 여기서 수행
+    - 필터 컬럼(gender 등)은 product_embeddings INSERT 트리거가 채움
+    """
+    async with async_session_maker() as session:
+        result = await session.execute(
+            insert(Product).returning(Product.id, sort_by_parameter_order=True), rows
+        )
+        product_ids = list(result.scalars().all())
+
+        vector_rows = [
+            {
+                "product_id": product_id,
+                "embedding": l2_normalize(bert_vector) if bert_vector else None,
+                "embedding_clip": l2_normalize(clip_vector) if clip_vector else None,
+                "model_version": settings.EMBEDDING_MODEL_VERSION,
+            }
+            for product_id, bert_vector, clip_vector in zip(product_ids, bert, clip)
+            if bert_vector or clip_vector
+        ]
+        if vector_rows:
+            await session.execute(insert(ProductEmbedding), vector_rows)
+        await session.commit()
+
+
+# -----------------------------------------------------------
+# 작업 상태
+# -----------------------------------------------------------
+async def _save_status(job: Dict[str, Any]):
+    job["updated_at"] = time.time()
+    try:
+        await redis_client.set(IMPORT_STATUS_KEY.format(job_id=job["job_id"]), json.dumps(job), ex=IMPORT_STATUS_TTL)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to store import status {job['job_id']}: {e}")
+
+
+async def get_import_status(job_id: str) -> Optional[Dict[str, Any]]:
+    job = None
+    try:
+        cached = await redis_client.get(IMPORT_STATUS_KEY.format(job_id=job_id))
+        if cached:
+            job = json.loads(cached)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to read import status {job_id}: {e}")
+    if job is None:
+        job = _jobs.get(job_id)
+    if job is None:
+        return None
+
+    # 작업을 실행하던 프로세스가 종료되면 상태가 running 으로 남으므로 heartbeat 로 판별
+    if job["status"] in ("queued", "running") and time.time() - job.get("updated_at", 0) > IMPORT_STALE_SECONDS:
+        logger.warning(f"⚠️ CSV import {job_id} stopped sending heartbeats, marking as failed")
+        job = {**job, "status": "failed", "finished_at": time.time()}
+        _add_error(job, "작업이 중단되었습니다 (서버 재시작 등). 파일을 다시 업로드해 주세요.")
+        await _save_status(job)
+    return job
+
+
+def _prune_jobs(keep: int = 100):
+    finished = [job_id for job_id, job in _jobs.items() if job["finished_at"] is not None]
+    for job_id in finished[:max(0, len(_jobs) - keep)]:
+        _jobs.pop(job_id, None)
+
+
+def _add_error(job: Dict[str, Any], message: str):
+    if len(job["errors"]) < CSV_MAX_ERRORS:
+        job["errors"].append(message)
+
+
+# -----------------------------------------------------------
+# 작업 실행
+# -----------------------------------------------------------
+async def _process_chunk(job: Dict[str, Any], ai: AIServiceClient, semaphore: asyncio.Semaphore, rows: List[Dict[str, Any]]):
+    # BERT 배치 임베딩과 이미지 CLIP 벡터를 동시에 생성
+    bert, clip = await asyncio.gather(
+        _bert_vectors(ai, rows),
+        asyncio.gather(*[_clip_vector(ai, semaphore, r["image_url"]) for r in rows]),
+    )
+
+    try:
+        await _insert_rows(rows, bert, list(clip))
+        job["success"] += len(rows)
+    except Exception as e:
+        # 청크 실패 시 문제 행만 걸러내도록 행 단위로 재시도
+        logger.warning(f"⚠️ Chunk insert failed, retrying row by row: {e}")
+        for row, bert_vector, clip_vector in zip(rows, bert, clip):
+            try:
+                await _insert_rows([row], [bert_vector], [clip_vector])
+                job["success"] += 1
+            except Exception as row_error:
+                job["failed"] += 1
+                _add_error(job, f"{row['name']}: {row_error}")
+    job["processed"] += len(rows)
+    # 새 상품이 검색 결과에 반영되도록 AI 검색 캐시 무효화
+    await search_cache.bump_generation()
+
+
+async def _heartbeat(job: Dict[str, Any]):
+    # 청크 하나(이미지 다운로드 + CLIP)가 오래 걸려도 상태 갱신 시각이 멈추지 않도록
+    while True:
+        await asyncio.sleep(IMPORT_HEARTBEAT_SECONDS)
+        await _save_status(job)
+
+
+async def _run_import(job: Dict[str, Any], path: str, ai: AIServiceClient):
+    semaphore = asyncio.Semaphore(CSV_IMAGE_CONCURRENCY)
+    job["status"] = "running"
+    await _save_status(job)
+    heartbeat = asyncio.create_task(_heartbeat(job))
+    try:
+        encoding = await asyncio.to_thread(_detect_encoding, path)
+        chunks = _iter_chunks(path, encoding)
+        while True:
+            # 파일 읽기/파싱은 스레드에서 (이벤트 루프 블로킹 방지)
+            rows = await asyncio.to_thread(next, chunks, None)
+            if rows is None:
+                break
+            await _process_chunk(job, ai, semaphore, rows)
+            await _save_status(job)
+            logger.info(f"📦 CSV import {job['job_id']}: {job['processed']} rows (success {job['success']}, failed {job['failed']})")
+        job["status"] = "completed"
+    except Exception as e:
+        logger.error(f"❌ CSV import {job['job_id']} failed: {e}")
+        job["status"] = "failed"
+        _add_error(job, str(e))
+    finally:
+        heartbeat.cancel()
+        job["finished_at"] = time.time()
+        await _save_status(job)
+        _tasks.pop(job["job_id"], None)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+async def start_import(file: UploadFile, ai: AIServiceClient) -> Dict[str, Any]:
+    """
+    CSV 대량 등록 작업 시작 (업로드 저장 후 즉시 반환, 처리는 백그라운드)
+    - CSV 를 스트리밍 파싱하여 CSV_IMPORT_CHUNK_SIZE 행씩 처리
+    - 청크마다 BERT 배치 임베딩 1회 + 이미지 CLIP 벡터(동시 CSV_IMAGE_CONCURRENCY 개) + 다중 행 INSERT 1회
+    - 진행 상황은 get_import_status(job_id) 로 조회
+      (작업은 이 프로세스에서 실행되므로 재시작 시 유실 -> heartbeat 가 끊기면 failed 로 보고)
+    """
+    path = await _spool_upload(file)
+    job_id = uuid.uuid4().hex
+    job = {
+        "job_id": job_id,
+        "filename": file.filename,
+        "status": "queued",
+        "processed": 0,
+        "success": 0,
+        "failed": 0,
+        "errors": [],
+        "started_at": time.time(),
+        "finished_at": None,
+    }
+    _prune_jobs()
+    _jobs[job_id] = job
+    await _save_status(job)
+    _tasks[job_id] = asyncio.create_task(_run_import(job, path, ai))
+    return job
@@ -0,0 +1,192 @@
+# backend-core/src/services/search_cache.py
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+import unicodedata
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import redis.asyncio as redis
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CATALOG_GENERATION_KEY = "catalog:generation"
+SEARCH_CACHE_KEY = "ai_search:{generation}:{digest}"
+SEARCH_LOCK_KEY = "ai_search:lock:{digest}"
+WAIT_POLL_INTERVAL = 0.1
+
+# 잠금 소유자만 해제 (TTL 만료 후 다른 요청이 잡은 잠금을 지우지 않도록)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# compute: (저장할 항목, 캐시 가능 여부) 반환 - AI 장애로 인한 대체 결과 등은 저장하지 않음
+Compute = Callable[[], Awaitable[Tuple[Dict[str, Any], bool]]]
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 검색어 정규화 (유니코드 NFKC + 소문자 + 공백 정리)"""
+    normalized = unicodedata.normalize("NFKC", query or "").lower()
+    return re.sub(r"\s+", " ", normalized).strip()
+
+
+class SearchResultCache:
+    """
+    /search/ai-search 결과 캐시 (Redis)
+    - 키: 정규화 검색어 + 감지된 성별 + limit + 카탈로그 세대(generation)
+      상품 등록/수정/삭제 시 세대를 올려 이전 결과를 한 번에 무효화 (이전 키는 TTL 로 만료)
+    - 값: 상품 id/유사도 목록 + AI 분석 블록 (상품 정보는 조회 시 DB 에서 다시 읽음)
+    - stale-while-revalidate: AI_SEARCH_CACHE_TTL 이 지난 항목은 그대로 응답하고 백그라운드에서 갱신
+    - singleflight: 같은 키의 재계산은 프로세스 내 Task 공유 + Redis 잠금으로 한 번만 실행
+    """
+
+    def __init__(self):
+        self.redis = redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.AI_SEARCH_CACHE_TTL > 0
+
+    # -----------------------------------------------------------
+    # 카탈로그 세대
+    # -----------------------------------------------------------
+    async def generation(self) -> int:
+        return int(await self.redis.get(CATALOG_GENERATION_KEY) or 0)
+
+    async def bump_generation(self):
+        """카탈로그 변경 시 호출 (실패해도 쓰기 요청은 계속 진행, 캐시는 TTL 로 만료)"""
+        try:
+            await self.redis.incr(CATALOG_GENERATION_KEY)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to bump catalog generation: {e}")
+
+    # -----------------------------------------------------------
+    # 조회 / 저장
+    # -----------------------------------------------------------
+    @staticmethod
+    def _digest(query: str, gender: Optional[str], limit: int) -> str:
+        raw = json.dumps([normalize_query(query), gender, limit], ensure_ascii=False)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    async def key(self, query: str, gender: Optional[str], limit: int) -> str:
+        return SEARCH_CACHE_KEY.format(generation=await self.generation(), digest=self._digest(query, gender, limit))
+
+    async def get(self, key: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """(항목, stale 여부) 반환, 없으면 None"""
+        cached = await self.redis.get(key)
+        if not cached:
+            return None
+        entry = json.loads(cached)
+        stale = time.time() - entry.get("cached_at", 0) > settings.AI_SEARCH_CACHE_TTL
+        return entry, stale
+
+    async def _set(self, key: str, entry: Dict[str, Any]):
+        entry["cached_at"] = time.time()
+        ttl = settings.AI_SEARCH_CACHE_TTL + settings.AI_SEARCH_CACHE_STALE_TTL
+        await self.redis.set(key, json.dumps(entry, ensure_ascii=False), ex=ttl)
+
+    # -----------------------------------------------------------
+    # singleflight
+    # -----------------------------------------------------------
+    @staticmethod
+    def _lock_key(key: str) -> str:
+        return SEARCH_LOCK_KEY.format(digest=key.rsplit(":", 1)[-1])
+
+    async def _compute_and_store(self, key: str, compute: Compute, token: Optional[str]) -> Dict[str, Any]:
+        try:
+            entry, cacheable = await compute()
+            if cacheable:
+                await self._set(key, entry)
+            return entry
+        finally:
+            await self._release(key, token)
+
+    async def _acquire(self, key: str) -> Optional[str]:
+        token = uuid.uuid4().hex
+        acquired = await self.redis.set(self._lock_key(key), token, nx=True, ex=settings.AI_SEARCH_CACHE_LOCK_TTL)
+        return token if acquired else None
+
+    async def _release(self, key: str, token: Optional[str]):
+        if not token:
+            return
+        try:
+            await self.redis.eval(_RELEASE_LOCK_SCRIPT, 1, self._lock_key(key), token)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to release search cache lock: {e}")
+
+    async def _wait_for(self, key: str) -> Optional[Dict[str, Any]]:
+        # 다른 인스턴스가 계산 중: 결과가 저장되거나 잠금이 풀릴 때까지 대기
+        deadline = time.monotonic() + settings.AI_SEARCH_CACHE_WAIT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(WAIT_POLL_INTERVAL)
+            cached = await self.get(key)
+            if cached:
+                return cached[0]
+            if not await self.redis.exists(self._lock_key(key)):
+                return None
+        return None
+
+    def _start(self, key: str, compute: Compute, token: Optional[str]) -> asyncio.Task:
+        task = asyncio.create_task(self._compute_and_store(key, compute, token))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def run(self, key: str, compute: Compute) -> Dict[str, Any]:
+        """
+        캐시 미스 시 계산 (같은 키는 한 번만 계산하고 나머지는 결과를 공유)
+        - 계산은 별도 Task 에서 실행: 처음 요청한 클라이언트가 끊겨도 기다리던 요청은 결과를 받음
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            token = None
+            try:
+                token = await self._acquire(key)
+                if token is None:
+                    entry = await self._wait_for(key)
+                    if entry is not None:
+                        return entry
+            except Exception as e:
+                logger.warning(f"⚠️ Search cache lock unavailable: {e}")
+            # 대기 중 같은 프로세스의 다른 요청이 먼저 계산을 시작했을 수 있음
+            task = self._inflight.get(key)
+            if task is None:
+                task = self._start(key, compute, token)
+            else:
+                await self._release(key, token)
+        return await asyncio.shield(task)
+
+    async def refresh(self, key: str, compute: Compute):
+        """stale 항목 백그라운드 갱신 (이미 누군가 갱신 중이면 건너뜀)"""
+        if key in self._inflight:
+            return
+        try:
+            token = await self._acquire(key)
+        except Exception as e:
+            logger.warning(f"⚠️ Search cache lock unavailable: {e}")
+            return
+        if token is None:
+            return
+        if key in self._inflight:
+            await self._release(key, token)
+            return
+        task = self._start(key, compute, token)
+        task.add_done_callback(self._log_refresh_error)
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"⚠️ AI search cache refresh failed: {task.exception()}")
+
+
+search_cache = SearchResultCache()
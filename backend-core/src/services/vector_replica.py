@@ -0,0 +1,382 @@
+# backend-core/src/services/vector_replica.py
+
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import asyncpg
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+
+from src.config.settings import settings
+from src.db.session import async_session_maker
+from src.models.product_embedding import ProductEmbedding, VECTOR_DIMS
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "product_vectors"
+
+
+class _ReadWriteLock:
+    """검색(읽기)은 동시에, 증분 반영(쓰기)은 단독으로 실행 (대기 중인 쓰기가 있으면 새 읽기는 대기)"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writers_waiting = 0
+        self._writing = False
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writing or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+
+class _VectorStore:
+    """
+    상품별 한 행씩 쌓는 배열 저장소 (용량 2배씩 확장)
+    - 성별/카테고리는 정수 코드(0 = NULL)로 저장해 마스크 계산을 벡터화
+    - search 는 스레드에서 실행되므로 배열/위치 변경(upsert/remove)과 읽기-쓰기 잠금으로 분리
+    """
+
+    def __init__(self, columns: List[str], capacity: int = 1024):
+        self.columns = columns
+        self.size = 0
+        self._capacity = 0
+        self._pos: Dict[int, int] = {}
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._listed = np.zeros(0, dtype=bool)
+        self._gender = np.zeros(0, dtype=np.int32)
+        self._category = np.zeros(0, dtype=np.int32)
+        self._price = np.zeros(0, dtype=np.float64)
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._has: Dict[str, np.ndarray] = {}
+        self._codes: Dict[str, int] = {}
+        self._lock = _ReadWriteLock()
+        self._ensure_capacity(max(capacity, 1024))
+
+    def _ensure_capacity(self, needed: int):
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, self._capacity * 2)
+
+        def grow(array: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+            grown = np.zeros(shape, dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            return grown
+
+        self._ids = grow(self._ids, (capacity,))
+        self._listed = grow(self._listed, (capacity,))
+        self._gender = grow(self._gender, (capacity,))
+        self._category = grow(self._category, (capacity,))
+        self._price = grow(self._price, (capacity,))
+        for column in self.columns:
+            self._vectors[column] = grow(self._vectors.get(column, np.zeros((0, VECTOR_DIMS[column]), dtype=np.float32)), (capacity, VECTOR_DIMS[column]))
+            self._has[column] = grow(self._has.get(column, np.zeros(0, dtype=bool)), (capacity,))
+        self._capacity = capacity
+
+    def _code(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        return self._codes.setdefault(value, len(self._codes) + 1)
+
+    def upsert(self, row):
+        with self._lock.write():
+            self._upsert(row)
+
+    def remove(self, product_id: int):
+        with self._lock.write():
+            pos = self._pos.get(product_id)
+            if pos is not None:
+                self._listed[pos] = False
+
+    def apply(self, rows: Iterable, removed_ids: Iterable[int]):
+        """증분 반영 (변경 행 upsert + 사라진 상품 제외)을 한 번의 쓰기 잠금으로 처리"""
+        with self._lock.write():
+            for row in rows:
+                self._upsert(row)
+            for product_id in removed_ids:
+                pos = self._pos.get(product_id)
+                if pos is not None:
+                    self._listed[pos] = False
+
+    def _upsert(self, row):
+        product_id = row.product_id
+        pos = self._pos.get(product_id)
+        if pos is None:
+            self._ensure_capacity(self.size + 1)
+            pos = self.size
+            self._pos[product_id] = pos
+            self.size += 1
+
+        self._ids[pos] = product_id
+        self._listed[pos] = bool(row.is_listed)
+        self._gender[pos] = self._code(row.gender)
+        self._category[pos] = self._code(row.category)
+        self._price[pos] = np.nan if row.price is None else row.price
+        for column in self.columns:
+            vector = getattr(row, column)
+            if vector is None or len(vector) != VECTOR_DIMS[column]:
+                self._has[column][pos] = False
+                continue
+            vector = np.asarray(vector, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            self._vectors[column][pos] = vector / norm if norm > 0 else vector
+            self._has[column][pos] = True
+
+    def _codes_for(self, values: Iterable[Optional[str]]) -> List[int]:
+        return [self._codes[v] if v is not None else 0 for v in values if v is None or v in self._codes]
+
+    def search(
+        self,
+        column: str,
+        vector: List[float],
+        limit: int,
+        filter_gender: Optional[str],
+        include_category: Optional[List[str]],
+        exclude_category: Optional[List[str]],
+        exclude_id: Optional[List[int]],
+        min_price: Optional[int],
+        max_price: Optional[int],
+    ) -> List[Tuple[int, float]]:
+        with self._lock.read():
+            return self._search(column, vector, limit, filter_gender, include_category, exclude_category,
+                                exclude_id, min_price, max_price)
+
+    def _search(
+        self,
+        column: str,
+        vector: List[float],
+        limit: int,
+        filter_gender: Optional[str],
+        include_category: Optional[List[str]],
+        exclude_category: Optional[List[str]],
+        exclude_id: Optional[List[int]],
+        min_price: Optional[int],
+        max_price: Optional[int],
+    ) -> List[Tuple[int, float]]:
+        size = self.size
+        mask = self._listed[:size] & self._has[column][:size]
+
+        # 필터 의미는 crud_product._ann_conditions 와 동일 (NULL 비교는 불일치)
+        if filter_gender:
+            mask &= np.isin(self._gender[:size], self._codes_for([filter_gender, 'Unisex', None]))
+        if include_category:
+            mask &= np.isin(self._category[:size], self._codes_for(include_category))
+        if exclude_category:
+            mask &= (self._category[:size] != 0) & ~np.isin(self._category[:size], self._codes_for(exclude_category))
+        if min_price is not None:
+            mask &= self._price[:size] >= min_price
+        if max_price is not None:
+            mask &= self._price[:size] <= max_price
+        if exclude_id:
+            excluded = [self._pos[i] for i in exclude_id if self._pos.get(i, size) < size]
+            mask[excluded] = False
+
+        candidates = np.flatnonzero(mask)
+        if candidates.size == 0:
+            return []
+
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+        scores = self._vectors[column][candidates] @ query
+
+        if candidates.size > limit:
+            top = np.argpartition(-scores, limit)[:limit]
+        else:
+            top = np.arange(candidates.size)
+        top = top[np.argsort(-scores[top])]
+        return [(int(self._ids[candidates[i]]), float(1.0 - scores[i])) for i in top]
+
+
+class VectorReplica:
+    """
+    프로세스 내부 벡터 검색 복제본 (NumPy 전수 내적)
+    - lifespan 시작 시 product_embeddings 스냅샷 로드
+    - Postgres LISTEN/NOTIFY(product_vectors 채널)로 변경된 상품만 증분 반영
+      (상품 등록/수정/소프트 삭제 -> product_embeddings 트리거가 product_id 를 NOTIFY)
+    - 연결이 끊기면 재연결 후 전체 재동기화, 주기적 재동기화로 누락 보정
+    - 준비되지 않았거나 비활성화 상태면 search() 가 None 을 반환 -> 호출 측은 DB HNSW 검색 사용
+    - 저장 벡터는 L2 정규화 상태이므로 내적 = 코사인 유사도
+    """
+
+    def __init__(self):
+        self.enabled = settings.VECTOR_REPLICA_ENABLED
+        self.columns = [c.strip() for c in settings.VECTOR_REPLICA_COLUMNS.split(",") if c.strip() in VECTOR_DIMS]
+        self.ready = False
+        self._store = _VectorStore(self.columns)
+
+        self._pending: set = set()
+        self._wake = asyncio.Event()
+        self._listen_conn: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # -----------------------------------------------------------
+    # 수명 주기
+    # -----------------------------------------------------------
+    async def start(self):
+        if not self.enabled or not self.columns:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._close_listener()
+        self.ready = False
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_resync = 0.0
+        backoff = 1.0
+        while True:
+            try:
+                if self._listen_conn is None or self._listen_conn.is_closed():
+                    # LISTEN 을 먼저 걸고 스냅샷을 읽어야 그 사이의 변경을 놓치지 않음
+                    await self._open_listener()
+                    next_resync = 0.0
+                if loop.time() >= next_resync:
+                    if not await self._load_snapshot():
+                        await self._close_listener()
+                        return
+                    next_resync = loop.time() + settings.VECTOR_REPLICA_RESYNC_SECONDS
+                backoff = 1.0
+
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=5.0)
+                except asyncio.TimeoutError:
+                    continue
+                await asyncio.sleep(0.2)  # 연속 변경을 한 번에 반영
+                self._wake.clear()
+                ids, self._pending = self._pending, set()
+                if ids:
+                    await self._refresh(ids)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Vector replica sync failed, retrying in {backoff:.0f}s: {e}")
+                await self._close_listener()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+    async def _open_listener(self):
+        dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        self._listen_conn = await asyncpg.connect(dsn)
+        await self._listen_conn.add_listener(NOTIFY_CHANNEL, self._on_notify)
+        logger.info(f"✅ Vector replica listening on '{NOTIFY_CHANNEL}'")
+
+    async def _close_listener(self):
+        if self._listen_conn is not None and not self._listen_conn.is_closed():
+            try:
+                await self._listen_conn.close()
+            except Exception:
+                pass
+        self._listen_conn = None
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            self._pending.add(int(payload))
+            self._wake.set()
+        except ValueError:
+            pass
+
+    # -----------------------------------------------------------
+    # 동기화
+    # -----------------------------------------------------------
+    def _select_rows(self):
+        return select(
+            ProductEmbedding.product_id,
+            ProductEmbedding.is_listed,
+            ProductEmbedding.gender,
+            ProductEmbedding.category,
+            ProductEmbedding.price,
+            *[getattr(ProductEmbedding, column) for column in self.columns]
+        )
+
+    async def _load_snapshot(self) -> bool:
+        # 새 저장소에 다 채운 뒤 교체 (재동기화 중에도 기존 복제본으로 검색)
+        async with async_session_maker() as session:
+            total = (await session.execute(
+                select(ProductEmbedding.product_id).limit(settings.VECTOR_REPLICA_MAX_ITEMS + 1)
+            )).all()
+            if len(total) > settings.VECTOR_REPLICA_MAX_ITEMS:
+                logger.warning(f"⚠️ Catalog exceeds VECTOR_REPLICA_MAX_ITEMS ({settings.VECTOR_REPLICA_MAX_ITEMS}). Vector replica disabled.")
+                self.ready = False
+                return False
+
+            store = _VectorStore(self.columns, capacity=len(total))
+            result = await session.stream(self._select_rows().execution_options(yield_per=2000))
+            async for row in result:
+                store.upsert(row)
+        self._store = store
+        self.ready = True
+        logger.info(f"✅ Vector replica loaded: {store.size} products ({', '.join(self.columns)})")
+        return True
+
+    async def _refresh(self, product_ids: Iterable[int]):
+        product_ids = list(product_ids)
+        async with async_session_maker() as session:
+            rows = (await session.execute(
+                self._select_rows().where(ProductEmbedding.product_id.in_(product_ids))
+            )).all()
+        found = {row.product_id for row in rows}
+        removed = [product_id for product_id in product_ids if product_id not in found]
+        # 검색 스레드와 같은 배열을 고치므로 쓰기 잠금 대기가 이벤트 루프를 막지 않도록 스레드에서 반영
+        await asyncio.to_thread(self._store.apply, rows, removed)
+
+    async def search(
+        self,
+        column: str,
+        vector: List[float],
+        limit: int,
+        filter_gender: Optional[str] = None,
+        include_category: Optional[List[str]] = None,
+        exclude_category: Optional[List[str]] = None,
+        exclude_id: Optional[List[int]] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+    ) -> Optional[List[Tuple[int, float]]]:
+        """(product_id, 코사인 거리) 목록, 복제본을 쓸 수 없으면 None"""
+        if not self.ready or column not in self.columns or not vector or len(vector) != VECTOR_DIMS[column]:
+            return None
+        return await asyncio.to_thread(
+            self._store.search, column, vector, limit,
+            filter_gender, include_category, exclude_category, exclude_id, min_price, max_price
+        )
+
+
+vector_replica = VectorReplica()
@@ -9,6 +9,7 @@ import redis.asyncio as redis
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from src.config.settings import settings
+from src.utils.vector import l2_normalize
 
 # 로깅 설정
 logger = logging.getLogger("vector_search")
@@ -67,23 +68,36 @@ async def search_similar_products(
     logger.info(f"🔴 Cache Miss: {cache_key} (Filter: {gender_filter}) -> Querying DB")
 
     # 4. Dynamic SQL Query Construction (동적 쿼리 생성)
-    # 기본 쿼리
-    base_sql = """
-        SELECT id, name, price, image_url, category, gender, 1 - (embedding <=> :embedding) as similarity
-        FROM products
-        WHERE deleted_at IS NULL
-    """
-    
-    params = {"embedding": str(embedding), "limit": limit}
+    # 비트 양자화 HNSW 인덱스(해밍 거리)로 후보를 뽑고, 원본 벡터 내적으로 재정렬
+    # (저장 벡터는 L2 정규화 상태 -> -(a <#> b) = 코사인 유사도)
+    candidate_filters = ""
+    params = {
+        "embedding": l2_normalize(embedding),
+        "limit": limit,
+        "candidates": max(settings.VECTOR_RERANK_CANDIDATES, limit),
+    }
 
     # [Core Logic] 성별 필터가 있으면 WHERE 절에 추가
     # 'Unisex'는 남녀 모두에게 노출되어야 하므로 OR 조건 처리
     if gender_filter:
-        base_sql += " AND (gender = :gender OR gender = 'Unisex' OR gender IS NULL)"
+        candidate_filters += " AND (e.gender = :gender OR e.gender = 'Unisex' OR e.gender IS NULL)"
         params['gender'] = gender_filter
 
-    # 정렬 및 제한
-    base_sql += " ORDER BY embedding <=> :embedding LIMIT :limit"
+    base_sql = f"""
+        WITH candidates AS (
+            SELECT e.product_id, e.embedding
+            FROM product_embeddings e
+            WHERE e.is_listed AND e.embedding IS NOT NULL{candidate_filters}
+            ORDER BY binary_quantize(e.embedding)::bit(768) <~> binary_quantize(CAST(:embedding AS vector(768)))
+            LIMIT :candidates
+        )
+        SELECT p.id, p.name, p.price, p.image_url, p.category, p.gender,
+               -(c.embedding <#> CAST(:embedding AS vector(768))) as similarity
+        FROM candidates c
+        JOIN products p ON p.id = c.product_id
+        ORDER BY c.embedding <#> CAST(:embedding AS vector(768))
+        LIMIT :limit
+    """
 
     # 5. Execute DB Query
     result = await db.execute(text(base_sql), params)
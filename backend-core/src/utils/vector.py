@@ -0,0 +1,40 @@
+import base64
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+# AI 서비스 벡터 압축 전송 포맷 (ai-service src/core/vector_codec.py 와 동일해야 함)
+VECTOR_MEDIA_TYPE = "application/x-modify-vectors+json"
+VECTOR_DTYPES = {"f32": "<f4", "f16": "<f2"}
+
+
+def l2_normalize(vector: Optional[Sequence[float]]) -> Optional[np.ndarray]:
+    """
+    L2 정규화 (길이 1 벡터, float32 배열 - pgvector 바이너리 코덱으로 그대로 전송)
+    - 정규화된 벡터끼리는 내적(<#>) 순위 = 코사인 유사도 순위
+    - None 은 그대로, 빈 벡터 / 영벡터는 float32 배열로만 변환해 반환
+    """
+    if vector is None:
+        return None
+    values = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(values))
+    if norm == 0.0:
+        return values
+    return values / norm
+
+def decode_vectors(value: Any) -> Any:
+    """
+    압축 전송된 응답의 {"$f32": base64} / {"$f16": base64} 를 float 리스트로 복원
+    - 호출부의 `if not vector` 검사 등이 그대로 동작하도록 numpy 배열이 아닌 list 로 반환
+    """
+    if isinstance(value, dict):
+        if len(value) == 1:
+            key, encoded = next(iter(value.items()))
+            dtype = VECTOR_DTYPES.get(key[1:]) if key.startswith("$") else None
+            if dtype and isinstance(encoded, str):
+                raw = base64.b64decode(encoded)
+                return np.frombuffer(raw, dtype=dtype).astype(np.float32).tolist()
+        return {k: decode_vectors(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode_vectors(v) for v in value]
+    return value
@@ -0,0 +1,23 @@
+# backend-core/tests/conftest.py
+
+import os
+
+# Settings() 필수 값 (실제 서비스에 연결하지 않는 단위 테스트용 기본값, 이미 설정된 값은 유지)
+TEST_ENV = {
+    "JWT_SECRET_KEY": "test-secret-key-for-unit-tests-0000000000",
+    "ENCRYPTION_KEY": "test-encryption-key",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "modify_user",
+    "POSTGRES_PASSWORD": "modify_password",
+    "POSTGRES_DB": "modify_db",
+    "REDIS_HOST": "localhost",
+    "SUPERUSER_EMAIL": "admin@example.com",
+    "SUPERUSER_PASSWORD": "admin-password",
+    "MAIL_USERNAME": "test",
+    "MAIL_PASSWORD": "test",
+    "MAIL_FROM": "noreply@example.com",
+    "MAIL_SERVER": "localhost",
+}
+
+for key, value in TEST_ENV.items():
+    os.environ.setdefault(key, value)
@@ -0,0 +1,55 @@
+# backend-core/tests/test_product_import.py
+
+from src.services.product_import import PLACEHOLDER_IMAGE, _parse_row
+
+
+def test_parse_row_requires_name():
+    assert _parse_row({"name": "", "price": "1000"}) is None
+    assert _parse_row({"price": "1000"}) is None
+
+
+def test_parse_row_defaults():
+    parsed = _parse_row({"name": "기본 티셔츠"})
+    assert parsed == {
+        "name": "기본 티셔츠",
+        "category": "Uncategorized",
+        "description": "",
+        "gender": "Unisex",
+        "price": 0,
+        "stock_quantity": 100,
+        "image_url": PLACEHOLDER_IMAGE,
+        "is_active": True,
+    }
+
+
+def test_parse_row_korean_headers():
+    """한국어 헤더 CSV 도 같은 필드로 변환"""
+    parsed = _parse_row({
+        "상품명": "린넨 셔츠",
+        "카테고리": "Tops",
+        "설명": "여름용",
+        "성별": "Male",
+        "가격": "39000",
+        "재고": "5",
+        "이미지": "https://example.com/a.jpg",
+    })
+    assert parsed["name"] == "린넨 셔츠"
+    assert parsed["category"] == "Tops"
+    assert parsed["description"] == "여름용"
+    assert parsed["gender"] == "Male"
+    assert parsed["price"] == 39000
+    assert parsed["stock_quantity"] == 5
+    assert parsed["image_url"] == "https://example.com/a.jpg"
+
+
+def test_parse_row_numbers():
+    parsed = _parse_row({"name": "코트", "price": " 12,000 ", "stock_quantity": "많음"})
+    assert parsed["price"] == 12000
+    # 숫자가 아닌 재고는 기본값
+    assert parsed["stock_quantity"] == 100
+
+
+def test_parse_row_strips_nul_and_whitespace():
+    parsed = _parse_row({"name": " 청\x00바지 ", "description": "\x00설명\x00"})
+    assert parsed["name"] == "청바지"
+    assert parsed["description"] == "설명"
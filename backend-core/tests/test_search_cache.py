@@ -0,0 +1,33 @@
+# backend-core/tests/test_search_cache.py
+
+import pytest
+
+from src.services.search_cache import SearchResultCache, normalize_query
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("  Red   Dress ", "red dress"),
+        ("ＮＩＫＥ　신발", "nike 신발"),  # 전각 문자/전각 공백 -> NFKC
+        ("여름\t원피스\n추천", "여름 원피스 추천"),
+        ("", ""),
+        (None, ""),
+    ],
+)
+def test_normalize_query(query, expected):
+    assert normalize_query(query) == expected
+
+
+def test_digest_ignores_query_formatting():
+    """표기만 다른 검색어는 같은 캐시 키를 사용"""
+    digest = SearchResultCache._digest("Red Dress", "Female", 10)
+    assert SearchResultCache._digest("  red   DRESS ", "Female", 10) == digest
+    assert SearchResultCache._digest("ＲＥＤ　ＤＲＥＳＳ", "Female", 10) == digest
+
+
+def test_digest_separates_gender_and_limit():
+    digest = SearchResultCache._digest("red dress", "Female", 10)
+    assert SearchResultCache._digest("red dress", None, 10) != digest
+    assert SearchResultCache._digest("red dress", "Male", 10) != digest
+    assert SearchResultCache._digest("red dress", "Female", 20) != digest
@@ -0,0 +1,109 @@
+# backend-core/tests/test_vector_codec.py
+
+import importlib.util
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.utils.vector import VECTOR_DTYPES, VECTOR_MEDIA_TYPE, decode_vectors
+
+# AI 서비스 인코더 (서비스별 배포라 패키지를 공유하지 않으므로 파일 경로로 로드해 포맷 일치 확인)
+AI_CODEC_PATH = Path(__file__).resolve().parents[2] / "ai-service" / "src" / "core" / "vector_codec.py"
+
+
+@pytest.fixture(scope="module")
+def ai_codec():
+    if not AI_CODEC_PATH.exists():
+        pytest.skip("ai-service 소스가 없는 환경 (backend 단독 컨테이너)")
+    spec = importlib.util.spec_from_file_location("ai_service_vector_codec", AI_CODEC_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _vector(dim: int, seed: int) -> list:
+    # float32 로 표현 가능한 값만 사용 -> f32 왕복은 정확히 같아야 함
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32).tolist()
+
+
+def _round_trip(ai_codec, payload, encoding: str):
+    encoded = ai_codec.encode_vectors(payload, encoding)
+    # 실제 전송처럼 JSON 직렬화를 거침
+    return encoded, decode_vectors(json.loads(json.dumps(encoded)))
+
+
+def test_wire_format_matches_ai_service(ai_codec):
+    assert ai_codec.VECTOR_MEDIA_TYPE == VECTOR_MEDIA_TYPE
+    assert ai_codec.VECTOR_DTYPES == VECTOR_DTYPES
+
+
+def test_round_trip_f32_nested(ai_codec):
+    payload = {
+        "path": "INTERNAL",
+        "vectors": {"bert": _vector(768, 1), "clip": _vector(512, 2)},
+        "regions": [{"name": "upper", "vector": _vector(512, 3)}],
+        "bert": [_vector(768, 4), _vector(768, 5)],
+    }
+    encoded, decoded = _round_trip(ai_codec, payload, "f32")
+
+    assert set(encoded["vectors"]["bert"]) == {"$f32"}
+    assert set(encoded["regions"][0]["vector"]) == {"$f32"}
+    assert all(set(v) == {"$f32"} for v in encoded["bert"])
+    assert decoded == payload
+
+
+def test_round_trip_f16_within_tolerance(ai_codec):
+    payload = {"vectors": {"bert": _vector(768, 6), "clip": None}}
+    encoded, decoded = _round_trip(ai_codec, payload, "f16")
+
+    assert set(encoded["vectors"]["bert"]) == {"$f16"}
+    assert decoded["vectors"]["clip"] is None
+    assert isinstance(decoded["vectors"]["bert"], list)
+    np.testing.assert_allclose(decoded["vectors"]["bert"], payload["vectors"]["bert"], rtol=1e-3, atol=2e-3)
+
+
+def test_short_and_non_float_lists_untouched(ai_codec):
+    payload = {
+        "scores": [0.91, 0.85, 0.42],
+        "bbox": [10.0, 20.0, 110.0, 220.0],
+        "ids": list(range(100)),
+        "mixed": [0.5] * 63 + ["x"],
+        "empty": [],
+        "summary": "요약",
+    }
+    encoded, decoded = _round_trip(ai_codec, payload, "f32")
+    assert encoded == payload
+    assert decoded == payload
+
+
+def test_decode_leaves_plain_json_alone():
+    payload = {
+        "vector": [0.1, 0.2],
+        "meta": {"$f32": "AAAA", "other": 1},  # 키가 둘 이상이면 벡터 봉투가 아님
+        "unknown": {"$f64": "AAAAAAAAAAA="},
+        "not_string": {"$f32": 123},
+    }
+    assert decode_vectors(payload) == payload
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, None),
+        ("", None),
+        ("application/json", None),
+        ("*/*", None),
+        (VECTOR_MEDIA_TYPE, "f32"),
+        (f"{VECTOR_MEDIA_TYPE}; encoding=f16", "f16"),
+        (f'{VECTOR_MEDIA_TYPE}; encoding="F16"', "f16"),
+        (f"{VECTOR_MEDIA_TYPE.upper()};encoding=f32", "f32"),
+        (f"{VECTOR_MEDIA_TYPE}; encoding=f64", None),
+        (f"application/json;q=0.9, {VECTOR_MEDIA_TYPE}; q=1.0; encoding=f16", "f16"),
+        (f"{VECTOR_MEDIA_TYPE}; encoding=f16; q=0", None),
+        (f"{VECTOR_MEDIA_TYPE}; q=abc", None),
+    ],
+)
+def test_parse_accept(ai_codec, accept, expected):
+    assert ai_codec.parse_accept(accept) == expected
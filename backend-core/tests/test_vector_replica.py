@@ -0,0 +1,102 @@
+# backend-core/tests/test_vector_replica.py
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.models.product_embedding import VECTOR_DIMS
+from src.services.vector_replica import _VectorStore
+
+COLUMN = "embedding_clip"
+DIM = VECTOR_DIMS[COLUMN]
+
+
+def _vec(*values) -> np.ndarray:
+    vector = np.zeros(DIM, dtype=np.float32)
+    vector[:len(values)] = values
+    return vector
+
+
+def _row(product_id, gender=None, category=None, price=None, is_listed=True, vector="auto"):
+    # id 가 클수록 쿼리(_vec(1.0))와의 유사도가 낮아지도록 구성 -> 결과 순서 = id 오름차순
+    if vector == "auto":
+        vector = _vec(1.0, product_id * 0.1)
+    return SimpleNamespace(
+        product_id=product_id, is_listed=is_listed, gender=gender,
+        category=category, price=price, **{COLUMN: vector},
+    )
+
+
+def _search(store, limit=10, **filters):
+    params = dict(filter_gender=None, include_category=None, exclude_category=None,
+                  exclude_id=None, min_price=None, max_price=None)
+    params.update(filters)
+    return [product_id for product_id, _ in store.search(COLUMN, _vec(1.0), limit, **params)]
+
+
+@pytest.fixture
+def store():
+    store = _VectorStore([COLUMN], capacity=4)
+    for row in [
+        _row(1, gender="Male", category="Tops", price=10000),
+        _row(2, gender="Female", category="Tops", price=20000),
+        _row(3, gender="Unisex", category="Bottoms", price=30000),
+        _row(4, gender=None, category=None, price=None),
+        _row(5, gender="Male", category="Shoes", price=50000, is_listed=False),
+        _row(6, gender="Male", category="Tops", price=60000, vector=None),
+    ]:
+        store.upsert(row)
+    return store
+
+
+def test_orders_by_similarity_and_skips_unlisted_or_missing_vectors(store):
+    assert _search(store) == [1, 2, 3, 4]
+    assert _search(store, limit=2) == [1, 2]
+
+
+def test_distance_is_cosine_distance(store):
+    distances = dict(store.search(COLUMN, _vec(1.0), 10, None, None, None, None, None, None))
+    expected = 1.0 - 1.0 / np.sqrt(1.0 + 0.1 ** 2)
+    assert distances[1] == pytest.approx(expected, abs=1e-6)
+
+
+def test_gender_filter_includes_unisex_and_null(store):
+    assert _search(store, filter_gender="Male") == [1, 3, 4]
+    assert _search(store, filter_gender="Female") == [2, 3, 4]
+
+
+def test_include_category_drops_null_category(store):
+    assert _search(store, include_category=["Tops"]) == [1, 2]
+    assert _search(store, include_category=["Unknown"]) == []
+
+
+def test_exclude_category_drops_null_category(store):
+    # SQL 의 category NOT IN (...) 과 같이 NULL 카테고리도 제외
+    assert _search(store, exclude_category=["Tops"]) == [3]
+
+
+def test_price_range_drops_null_price(store):
+    assert _search(store, min_price=20000) == [2, 3]
+    assert _search(store, max_price=20000) == [1, 2]
+    assert _search(store, min_price=15000, max_price=25000) == [2]
+
+
+def test_exclude_id_ignores_unknown_ids(store):
+    assert _search(store, exclude_id=[1, 999]) == [2, 3, 4]
+
+
+def test_upsert_updates_in_place_and_remove_unlists(store):
+    store.upsert(_row(1, gender="Female", category="Tops", price=10000))
+    assert _search(store, filter_gender="Male") == [3, 4]
+
+    store.remove(2)
+    assert _search(store) == [1, 3, 4]
+
+
+def test_apply_grows_capacity_and_removes(store):
+    store.apply([_row(product_id) for product_id in range(7, 20)], removed_ids=[1, 3])
+    result = _search(store, limit=100)
+    assert result[:3] == [2, 4, 7]
+    assert 1 not in result and 3 not in result
+    assert len(result) == 2 + 13
@@ -14,6 +14,10 @@ interface UploadResult {
 type UploadMode = 'image' | 'csv';
 type UploadState = 'idle' | 'uploading' | 'paused' | 'completed';
 
+// CSV 작업 상태 폴링 간격 / 상태 갱신이 없을 때 포기하는 시간
+const CSV_POLL_INTERVAL_MS = 2000;
+const CSV_STALE_TIMEOUT_MS = 3 * 60 * 1000;
+
 export default function ProductUpload() {
   const [mode, setMode] = useState<UploadMode>('image');
   const [results, setResults] = useState<UploadResult[]>([]);
@@ -144,20 +148,45 @@ export default function ProductUpload() {
       const formData = new FormData();
       formData.append('file', file);
 
-      const response = await client.post('/products/upload/csv', formData, {
+      // 업로드 후 작업 ID 를 받고, 처리는 백그라운드에서 진행 -> 상태 폴링
+      const startResponse = await client.post('/products/upload/csv', formData, {
         headers: { 'Content-Type': 'multipart/form-data' },
         timeout: 120000,
       });
+      const jobId = startResponse.data.job_id;
+      addLog(`🚀 CSV 등록 작업 시작 (작업 ID: ${jobId})`);
+
+      let job = startResponse.data;
+      let lastProcessed = -1;
+      // 서버 상태 갱신(heartbeat)이 멈춘 작업은 더 기다리지 않음
+      let lastUpdatedAt = job.updated_at;
+      let lastUpdateSeen = Date.now();
+      while (job.status === 'queued' || job.status === 'running') {
+        if (Date.now() - lastUpdateSeen > CSV_STALE_TIMEOUT_MS) {
+          throw new Error('작업 상태가 갱신되지 않아 확인을 중단했습니다. 잠시 후 상품 목록을 확인해 주세요.');
+        }
+        await new Promise(resolve => setTimeout(resolve, CSV_POLL_INTERVAL_MS));
+        job = (await client.get(`/products/upload/csv/${jobId}`)).data;
+        if (job.updated_at !== lastUpdatedAt) {
+          lastUpdatedAt = job.updated_at;
+          lastUpdateSeen = Date.now();
+        }
+        if (job.processed !== lastProcessed) {
+          lastProcessed = job.processed;
+          setResults([{ fileName: file.name, status: 'uploading', message: `처리 중: ${job.processed}건` }]);
+          addLog(`📦 ${job.processed}건 처리 (성공: ${job.success}건, 실패: ${job.failed}건)`);
+        }
+      }
 
-      const { success, failed, errors } = response.data;
+      const { success, failed, errors } = job;
       
       setResults([{ 
         fileName: file.name, 
-        status: failed > 0 ? 'error' : 'success',
+        status: job.status === 'failed' || failed > 0 ? 'error' : 'success',
         message: `성공: ${success}건, 실패: ${failed}건`
       }]);
 
-      addLog(`✅ CSV 처리 완료 - 성공: ${success}건, 실패: ${failed}건`);
+      addLog(`${job.status === 'failed' ? '❌' : '✅'} CSV 처리 완료 - 성공: ${success}건, 실패: ${failed}건`);
       
       if (errors && errors.length > 0) {
         errors.slice(0, 5).forEach((err: string) => addLog(`⚠️ ${err}`));